@@ -6,11 +6,11 @@ Desc: The BoardModal of the project.
 '''
 from PyQt6.QtWidgets import QGraphicsView, QGraphicsScene, QGraphicsRectItem, QStyleOptionGraphicsItem
 from PyQt6.QtWidgets import QWidget
-from PyQt6.QtGui import QPixmap, QPainter, QColor, QFont, QPen, QColorConstants
+from PyQt6.QtGui import QPixmap, QPainter, QColor, QFont, QPen, QColorConstants, QImageReader
 from PyQt6.QtCore import QRectF, Qt, QEvent, QPointF, QObject
 from itertools import product
 from util import linearInterpolateColor
-from battleship import Board
+from battleship import Board, pointToStr, rowToLetters
 
 
 class BoardView(QGraphicsView):
@@ -49,12 +49,21 @@ class BoardScene(QGraphicsScene):
     highlightShotColor: QColor
         The color of a highlighted cell that's been shot
 
-    bgImage: QPixmap
-        The background of the scene
+    bgImage: QPixmap | None
+        The background of the scene, None until loaded
+
+    bgCache: QPixmap | None
+        The background scaled to the scene, None until drawn
+
+    bgScale: float
+        The fraction of the full resolution of the background to load
 
     cells: list[Cell]
         A list of Cells
 
+    cellSize: float
+        The width and height of every cell
+
     board: Board
         The modal of the view
 
@@ -64,11 +73,35 @@ class BoardScene(QGraphicsScene):
     lockedPos: int
         The index for the cell that was locked in
 
+    cellColors: list[QColor | None]
+        The color each playable cell is painted with
+
+    highlighted: int
+        The index of the cell whose row and col are highlighted, or -1
+
+    dirtyCells: set[int]
+        The cells that were shot since they were last painted
+
     Methods
     -------
+    loadBackground()
+        Loads the background image
+
+    layoutCells(rect)
+        Sizes and positions the cells to fill the rect
+
     getCellIndex(point): int
         Get the index of a cell that contains the point
 
+    cellColor(index): QColor
+        Gets the color a playable cell should be painted with
+
+    repaintCells(cells)
+        Repaints the cells whose color changed
+
+    lineCells(index): set[int]
+        Gets the indexes of every cell in the row and col of a cell
+
     highlightgrid(index)
         Highlights all cells in a row and col for the rectangle in the index
 
@@ -86,7 +119,10 @@ class BoardScene(QGraphicsScene):
     cornerColor = QColorConstants.Black
     highlightShotColor = linearInterpolateColor(highlightColor, shotColor, 0.4)
 
-    def __init__(self, board: Board, *args, **kwargs):
+    bgPath = 'QtResources/images/BoardBackground.jpg'
+
+    def __init__(self, board: Board, *args, lazyBackground: bool = False,
+                 backgroundScale: float = 1.0, **kwargs):
         '''
         Constructs all the necesarry attributes for the BoardScene object
 
@@ -94,15 +130,25 @@ class BoardScene(QGraphicsScene):
         ----------
         board: Board
             The board to serve as the modal
+
+        lazyBackground: bool
+            True to load the background when it is first drawn
+
+        backgroundScale: float
+            The fraction of the full resolution of the background to load
         '''
         super().__init__(*args, **kwargs)
-        self.bgImage = QPixmap('QtResources/images/BoardBackground.jpg')
+        self.bgImage = None
+        self.bgCache = None
+        self.bgScale = backgroundScale
+
+        if not lazyBackground:
+            self.loadBackground()
 
         # Setup game cells
-        sz = self.width() / 11
         coords = product(range(11), range(11))
-        rect = QRectF(0, 0, sz, sz)
-        self.cells = [Cell(x - 1, y - 1, x == 0 or y == 0, rect) for y, x in coords]
+        self.cells = [Cell(x - 1, y - 1, x == 0 or y == 0) for y, x in coords]
+        self.cellSize = 0
 
         # Set the properties of the cells
         for i, cell in enumerate(self.cells):
@@ -116,16 +162,23 @@ class BoardScene(QGraphicsScene):
                 cell.setBrush(self.cornerColor)
                 cell.setOpacity(1)
 
-            cell.setPos((i % 11) * sz, (i // 11) * sz)
-
             self.addItem(cell)
 
+        self.layoutCells(self.sceneRect())
+        self.sceneRectChanged.connect(self.layoutCells)
+        self.sceneRectChanged.connect(self.clearBackgroundCache)
+
         self.installEventFilter(self)
 
         self.board = board
         self.isLocked = False
         self.lockedPos = -1
 
+        self.cellColors = [None for cell in self.cells]
+        self.highlighted = -1
+        self.dirtyCells = set()
+        self.repaintCells(range(len(self.cells)))
+
     def drawBackground(self, painter: QPainter, rect: QRectF):
         '''
         Override for the drawBackground method
@@ -136,10 +189,60 @@ class BoardScene(QGraphicsScene):
             The painter for the background
 
         rect: QRectF
-            The rectangle for the scene
+            The exposed rectangle of the scene
+        '''
+        sceneRect = self.sceneRect()
+        ratio = painter.device().devicePixelRatioF()
+        size = (sceneRect.size() * ratio).toSize()
+
+        if self.bgCache is None or self.bgCache.size() != size:
+            if self.bgImage is None:
+                self.loadBackground()
+            self.bgCache = self.bgImage.scaled(size, Qt.AspectRatioMode.IgnoreAspectRatio,
+                                               Qt.TransformationMode.SmoothTransformation)
+            self.bgCache.setDevicePixelRatio(ratio)
+
+        exposed = rect.intersected(sceneRect)
+        source = exposed.translated(-sceneRect.topLeft())
+        source = QRectF(source.topLeft() * ratio, source.size() * ratio)
+        painter.drawPixmap(exposed, self.bgCache, source)
+
+    def loadBackground(self):
         '''
-        winSize = rect.size().toSize()
-        painter.drawPixmap(0, 0, winSize.width(), winSize.height(), self.bgImage)
+        Loads the background image
+
+        Only bgScale of the full resolution is decoded.
+        '''
+        reader = QImageReader(self.bgPath)
+
+        if self.bgScale != 1.0:
+            reader.setScaledSize(reader.size() * self.bgScale)
+
+        self.bgImage = QPixmap.fromImage(reader.read())
+
+    def clearBackgroundCache(self):
+        '''
+        Drops the scaled background so it is rebuilt for the new size
+        '''
+        self.bgCache = None
+
+    def layoutCells(self, rect: QRectF):
+        '''
+        Sizes and positions the cells to fill the rect
+
+        Parameters
+        ----------
+        rect: QRectF
+            The rectangle of the scene
+        '''
+        sz = rect.width() / 11
+        cellRect = QRectF(0, 0, sz, sz)
+
+        for i, cell in enumerate(self.cells):
+            cell.setRect(cellRect)
+            cell.setPos((i % 11) * sz, (i // 11) * sz)
+
+        self.cellSize = sz
 
     def getCellIndex(self, point: QPointF):
         '''
@@ -156,13 +259,14 @@ class BoardScene(QGraphicsScene):
         -------
         int: The index of the cell, or -1
         '''
-        for i, cell in enumerate(self.cells):
-            x = [cell.pos().x(), cell.pos().x() + cell.rect().width()]
-            y = [cell.pos().y(), cell.pos().y() + cell.rect().height()]
-            if x[0] <= point.x() <= x[1] and y[0] <= point.y() <= y[1] and not cell.border:
-                return i
+        sz = self.cellSize
+        x = point.x()
+        y = point.y()
 
-        return -1
+        if sz <= 0 or not (sz <= x <= 11 * sz and sz <= y <= 11 * sz):
+            return -1
+
+        return min(int(y // sz), 10) * 11 + min(int(x // sz), 10)
 
     def eventFilter(self, o: QObject, e: QEvent) -> bool:
         '''
@@ -189,19 +293,16 @@ class BoardScene(QGraphicsScene):
 
                 if i == -1 and not self.isLocked:
                     self.refreshCells()
-                    self.update()
                     return False
 
                 if not self.isLocked:
                     self.highlightGrid(i)
 
-                self.update()
                 return True
             case QEvent.Type.GraphicsSceneLeave:
                 if self.isLocked:
                     return True
                 self.refreshCells()
-                self.update()
                 return True
             case QEvent.Type.GraphicsSceneMousePress:
                 i = self.getCellIndex(e.scenePos())
@@ -211,48 +312,101 @@ class BoardScene(QGraphicsScene):
                 self.isLocked = True
                 self.lockedPos = i
                 self.highlightGrid(self.lockedPos)
-                self.update()
                 return True
 
         return False
 
+    def cellColor(self, index: int) -> QColor:
+        '''
+        Gets the color a playable cell should be painted with
+
+        Parameters
+        ----------
+        index: int
+            The index of the cell
+
+        Returns
+        -------
+        QColor: The color for the current highlight and shots
+        '''
+        cell = self.cells[index]
+        isShot = self.board.isShot((cell.col, cell.row))
+        highlighted = self.highlighted
+
+        if highlighted != -1 and (index % 11 == highlighted % 11 or index // 11 == highlighted // 11):
+            return self.highlightShotColor if isShot else self.highlightColor
+
+        return self.shotColor if isShot else self.idleColor
+
+    def repaintCells(self, cells):
+        '''
+        Repaints the cells whose color changed
+
+        Setting the brush schedules the repaint of that cell only, so cells
+        that keep their color are never repainted.
+
+        Parameters
+        ----------
+        cells: Iterable[int]
+            The indexes of the cells that may have changed
+        '''
+        for i in cells:
+            if self.cells[i].border:
+                continue
+
+            color = self.cellColor(i)
+            if color != self.cellColors[i]:
+                self.cellColors[i] = color
+                self.cells[i].setBrush(color)
+
+        self.dirtyCells.clear()
+
+    def lineCells(self, index: int) -> set[int]:
+        '''
+        Gets the indexes of every cell in the row and col of a cell
+
+        Parameters
+        ----------
+        index: int
+            The index of the cell, or -1 for none
+
+        Returns
+        -------
+        set[int]: The indexes in the row and col
+        '''
+        if index == -1:
+            return set()
+
+        row = index // 11 * 11
+        col = index % 11
+        return set(range(row, row + 11)) | set(range(col, 121, 11))
+
     def highlightGrid(self, index: int):
         '''
         Highlights all cells in a row and col for the rectangle in the index
 
+        Only the cells leaving or entering the highlight, and cells shot
+        since the last repaint, are repainted.
+
         Parameters
         ----------
         index: int
             The index of the cell to highlight
         '''
-        col = index % 11
-        row = index // 11
-        for i, rect in enumerate(self.cells):
-            if not rect.border:
-                if i % 11 == col or i // 11 == row:
-                    if self.board.grid[rect.row][rect.col] == 1:
-                        color = self.highlightShotColor
-                    else:
-                        color = self.highlightColor
-                elif self.board.grid[rect.row][rect.col] == 1:
-                    color = self.shotColor
-                else:
-                    color = self.idleColor
-                rect.setBrush(color)
-                rect.update()
+        if index == self.highlighted and not self.dirtyCells:
+            return
+
+        changed = (self.lineCells(self.highlighted) ^ self.lineCells(index)) | self.dirtyCells
+        self.highlighted = index
+        self.repaintCells(changed)
 
     def refreshCells(self):
         '''
         Redraw the cells
+
+        Clears the highlight, repainting only the cells that change color.
         '''
-        for i, rect in enumerate(self.cells):
-            if not rect.border:
-                if self.board.grid[rect.row][rect.col] == 1:
-                    color = self.shotColor
-                else:
-                    color = self.idleColor
-                rect.setBrush(color)
-                rect.update()
+        self.highlightGrid(-1)
 
     def shoot(self):
         '''
@@ -267,11 +421,10 @@ class BoardScene(QGraphicsScene):
             return
 
         self.board.shoot(pos)
-        self.cells[self.lockedPos].setBrush(self.shotColor)
+        self.dirtyCells.add(self.lockedPos)
         self.isLocked = False
         self.lockedPos = -1
         self.refreshCells()
-        self.update()
 
 
 class Cell(QGraphicsRectItem):
@@ -315,14 +468,12 @@ class Cell(QGraphicsRectItem):
         if self.border:
             if self.row == self.col:
                 return 'X'
-            elif self.col == 9:
-                return '10'
             elif self.row == -1:
-                return chr(self.col + ord('1'))
+                return str(self.col + 1)
             else:
-                return chr(self.row + ord('A'))
+                return rowToLetters(self.row)
         else:
-            return f'{chr(self.row + ord("A"))}{self.col + 1}'
+            return pointToStr((self.col, self.row))
 
     def paint(self, painter: QPainter, option: QStyleOptionGraphicsItem, widget: QWidget = None):
         '''
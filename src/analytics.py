@@ -0,0 +1,254 @@
+'''
+File: analytics.py
+Auth: Blake Wingard - bats23456789@gmail.com
+Date: 10/18/2026
+Desc: Statistics over game logs of any size.
+
+A log is split into chunks of records that run on a process pool. Each
+worker maps the log itself and reads its chunk a block at a time, so
+memory stays bounded however large the log is. Every statistic is a sum
+over single records (see gameLog.py), so the totals of the chunks are
+simply added together and games may be split between chunks.
+
+Results follow Board.shoot: a hit is a HIT or SUNK, and a SAME is a shot
+that missed.
+'''
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from gameLog import LogReader, PLACE, SHOT, RECORD_SIZE, RESULT_CODES, SHIP_TYPES
+
+# The number of records read from the map at a time
+BLOCK_RECORDS = 65536
+
+
+def emptyStats(size: int = 10) -> dict[str, np.ndarray]:
+    '''
+    Creates the totals of no records
+
+    Parameters
+    ----------
+    size: int
+        The number of rows and cols on the boards
+
+    Returns
+    -------
+    dict[str, np.ndarray]: The totals, with turns up to size * size
+    '''
+    types = len(SHIP_TYPES)
+    turns = size * size
+
+    return {
+        'firstShots': np.zeros((size, size), np.int64),
+        'sinkShots': np.zeros(types, np.int64),
+        'sunk': np.zeros(types, np.int64),
+        'turnShots': np.zeros(turns, np.int64),
+        'turnHits': np.zeros(turns, np.int64),
+        'placed': np.zeros(types, np.int64),
+        'placements': np.zeros((types, size, size), np.int64),
+    }
+
+
+def addRecords(stats: dict[str, np.ndarray], records: np.ndarray, size: int = 10):
+    '''
+    Adds records to the totals
+
+    Parameters
+    ----------
+    stats: dict[str, np.ndarray]
+        The totals to add to
+
+    records: np.ndarray
+        The records to add, as gameLog.RECORD_FIELDS
+
+    size: int
+        The number of rows and cols on the boards
+    '''
+    types = len(SHIP_TYPES)
+    cells = size * size
+    turns = len(stats['turnShots'])
+
+    shots = records[(records['kind'] == SHOT) & (records['b'] < size) & (records['c'] < size)]
+    turn = shots['a'].astype(np.int64) | shots['d'].astype(np.int64) << 16
+    cell = shots['c'].astype(np.int64) * size + shots['b']
+    result = shots['code']
+    ship = shots['ship'].astype(np.int64)
+
+    first = turn == 0
+    stats['firstShots'] += np.bincount(cell[first], minlength=cells).reshape(size, size)
+
+    sunk = (result == RESULT_CODES['SUNK']) & (ship < types)
+    stats['sinkShots'] += np.bincount(ship[sunk], turn[sunk] + 1, types).astype(np.int64)
+    stats['sunk'] += np.bincount(ship[sunk], minlength=types)
+
+    counted = turn < turns
+    hit = (result == RESULT_CODES['HIT']) | (result == RESULT_CODES['SUNK'])
+    stats['turnShots'] += np.bincount(turn[counted], minlength=turns)
+    stats['turnHits'] += np.bincount(turn[counted & hit], minlength=turns)
+
+    placed = records[(records['kind'] == PLACE) & (records['code'] < types)
+                     & (records['c'] < size) & (records['d'] < size)]
+    code = placed['code'].astype(np.int64)
+    x0 = placed['a'].astype(np.int64)
+    y0 = placed['b'].astype(np.int64)
+    dx = placed['c'] - x0
+    dy = placed['d'] - y0
+    length = dx + dy + 1
+    dx = np.sign(dx)
+    dy = np.sign(dy)
+
+    stats['placed'] += np.bincount(code, minlength=types)
+
+    for k in range(length.max(initial=0)):
+        covered = k < length
+        index = code * cells + (y0 + k * dy) * size + x0 + k * dx
+        stats['placements'] += np.bincount(index[covered], minlength=types * cells)\
+            .reshape(types, size, size)
+
+
+def mergeStats(stats: dict[str, np.ndarray], other: dict[str, np.ndarray]):
+    '''
+    Adds the totals of other to stats
+
+    Parameters
+    ----------
+    stats: dict[str, np.ndarray]
+        The totals to add to
+
+    other: dict[str, np.ndarray]
+        The totals to add
+    '''
+    for key, value in other.items():
+        stats[key] += value
+
+
+def analyzeChunk(path: str, start: int, stop: int, size: int = 10) -> dict[str, np.ndarray]:
+    '''
+    Totals a range of records of a log
+
+    Parameters
+    ----------
+    path: str
+        The path of the log
+
+    start: int
+        The number of the first record
+
+    stop: int
+        The number after the last record
+
+    size: int
+        The number of rows and cols on the boards
+
+    Returns
+    -------
+    dict[str, np.ndarray]: The totals of the records
+    '''
+    stats = emptyStats(size)
+
+    with LogReader(path) as reader:
+        for begin in range(start, stop, BLOCK_RECORDS):
+            addRecords(stats, reader.records[begin:min(begin + BLOCK_RECORDS, stop)], size)
+
+    return stats
+
+
+def analyze(path: str, size: int = 10, workers: int | None = None,
+            chunkRecords: int = 1 << 22) -> dict[str, np.ndarray | int | float]:
+    '''
+    Computes the statistics of a log
+
+    Parameters
+    ----------
+    path: str
+        The path of the log
+
+    size: int
+        The number of rows and cols on the boards, records of other sizes
+        that do not fit are skipped
+
+    workers: int | None
+        The number of worker processes, None for one per core and 1 to
+        read every chunk in this process
+
+    chunkRecords: int
+        The number of records given to a worker at a time
+
+    Returns
+    -------
+    dict[str, np.ndarray | int | float]: The totals, plus
+        firstShotRate: the share of first shots at each cell
+        shotsToSink: the average turn each ship type was sunk on, counting
+                     from 1
+        hitRate: the share of shots that hit at each turn
+        placementRate: the share of placements of each ship type covering
+                       each cell
+        records: the number of records read
+        recordsPerSecond: the speed of the analysis
+    '''
+    count = os.path.getsize(path) // RECORD_SIZE
+    chunks = [(start, min(start + chunkRecords, count)) for start in range(0, count, chunkRecords)]
+    stats = emptyStats(size)
+
+    begin = time.perf_counter()
+
+    if workers == 1:
+        for chunk in chunks:
+            mergeStats(stats, analyzeChunk(path, *chunk, size))
+    else:
+        with ProcessPoolExecutor(workers) as pool:
+            for result in pool.map(analyzeChunk, [path] * len(chunks), *zip(*chunks),
+                                   [size] * len(chunks)):
+                mergeStats(stats, result)
+
+    elapsed = time.perf_counter() - begin
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        stats['firstShotRate'] = np.nan_to_num(stats['firstShots'] / stats['firstShots'].sum())
+        stats['shotsToSink'] = np.nan_to_num(stats['sinkShots'] / stats['sunk'])
+        stats['hitRate'] = np.nan_to_num(stats['turnHits'] / stats['turnShots'])
+        stats['placementRate'] = np.nan_to_num(stats['placements']
+                                               / stats['placed'][:, None, None])
+
+    stats['records'] = count
+    stats['recordsPerSecond'] = count / elapsed if elapsed else 0
+
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compute statistics over a game log.')
+    parser.add_argument('log')
+    parser.add_argument('--size', type=int, default=10)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--chunk', type=int, default=1 << 22)
+    parser.add_argument('--out', help='save every statistic to this .npz file')
+    args = parser.parse_args()
+
+    stats = analyze(args.log, args.size, args.workers, args.chunk)
+
+    print(f'{stats["records"]} records at {stats["recordsPerSecond"]:.0f} records/s')
+
+    print('Average shots to sink:')
+    for name, shots, sunk in zip(SHIP_TYPES, stats['shotsToSink'], stats['sunk']):
+        print(f'  {name:>12}: {shots:6.2f} ({sunk} sunk)')
+
+    print('Hit rate by turn:')
+    for turn in range(0, len(stats['hitRate']), 10):
+        rates = ' '.join(f'{rate:4.0%}' for rate in stats['hitRate'][turn:turn + 10])
+        print(f'  {turn + 1:>4}: {rates}')
+
+    print('First shots (% of games):')
+    for row in stats['firstShotRate']:
+        print('  ' + ' '.join(f'{rate:4.1%}' for rate in row))
+
+    if args.out:
+        np.savez(args.out, **stats)
+
+    return 0
+
+
+if __name__ == '__main__':
+    main()
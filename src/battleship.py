@@ -4,6 +4,104 @@ Auth: Blake Wingard - bats23456789@gmail.com
 Date: 01/02/2024
 Desc: Game logic for battleship.
 '''
+from string import ascii_letters
+from zobrist import cellKeys, shipKey
+
+STANDARD_FLEET = (
+    ('Carrier', 5),
+    ('Battleship', 4),
+    ('Destroyer', 3),
+    ('Submarine', 3),
+    ('Patrol Boat', 2),
+)
+
+
+def rowToLetters(row: int) -> str:
+    '''
+    Converts a row into its letters (A-Z, then AA, AB, ...)
+
+    Parameters
+    ----------
+    row: int
+        The row starting at 0
+
+    Returns
+    -------
+    str: The letters of the row
+    '''
+    letters = ''
+    row += 1
+    while row:
+        row, rem = divmod(row - 1, 26)
+        letters = chr(rem + ord('A')) + letters
+    return letters
+
+
+def lettersToRow(letters: str) -> int:
+    '''
+    Converts the letters of a row (A-Z, then AA, AB, ...) into the row
+
+    Parameters
+    ----------
+    letters: str
+        The letters of the row
+
+    Returns
+    -------
+    int: The row starting at 0
+
+    Raises
+    ------
+    ValueError: The letters are empty or not A-Z
+    '''
+    if not letters:
+        raise ValueError('Missing row letters')
+
+    row = 0
+    for letter in letters.upper():
+        if not 'A' <= letter <= 'Z':
+            raise ValueError(f'{letter} is not a row letter')
+        row = row * 26 + ord(letter) - ord('A') + 1
+    return row - 1
+
+
+def strToPoint(s: str) -> tuple[int, int]:
+    '''
+    Converts the letter-number notation (e.g. B4 or AA12) into a position
+
+    Parameters
+    ----------
+    s: str
+        The position as a string
+
+    Returns
+    -------
+    tuple[int, int]: The position in (x, y)
+
+    Raises
+    ------
+    ValueError: The string is not in the letter-number notation
+    '''
+    split = len(s) - len(s.lstrip(ascii_letters))
+    row = lettersToRow(s[:split])
+    col = int(s[split:]) - 1
+    return (col, row)
+
+
+def pointToStr(pos: tuple[int, int]) -> str:
+    '''
+    Converts a position into the letter-number notation (e.g. B4 or AA12)
+
+    Parameters
+    ----------
+    pos: tuple[int, int]
+        The position in (x, y)
+
+    Returns
+    -------
+    str: The position as a string
+    '''
+    return f'{rowToLetters(pos[1])}{pos[0] + 1}'
 
 
 class OutOfBoundsException(Exception):
@@ -36,18 +134,38 @@ class Ship:
     stop: tuple[int, int]
         Stores the ships stop coordinates
 
+    length: int
+        The number of cells covered by the ship
+
+    hitMask: int
+        Bit i is set once the i-th cell from start has been hit
+
+    remaining: int
+        The number of cells not yet hit
+
+    hits: list[bool]
+        Whether each cell from start has been hit
+
     Methods
     -------
     shoot(shot): bool
         Attempts to shoot the ship
 
+    repair(shot)
+        Removes the hit at the position
+
     isSunk(): bool
         Checks if ship is sunk
 
     posOnShip: bool
         Checks if the position is on the ship
+
+    positions(): list[tuple[int, int]]
+        Gets every position covered by the ship
     '''
 
+    __slots__ = ('name', 'start', 'stop', 'length', 'hitMask', 'remaining')
+
     def __init__(self, name: str, start: tuple[int, int], stop: tuple[int, int]):
         '''
         Constructs all the necesarry attributes for the Ship object
@@ -71,22 +189,32 @@ class Ship:
         self.stop = stop
 
         if start[0] == stop[0]:
-            self.hits = [False for i in range(start[1], stop[1] + 1)]
+            self.length = len(range(start[1], stop[1] + 1))
         else:
-            self.hits = [False for i in range(start[0], stop[0] + 1)]
+            self.length = len(range(start[0], stop[0] + 1))
+
+        self.hitMask = 0
+        self.remaining = self.length
 
     def __repr__(self):
         '''
         Displays a string representation of the Ship Object
         '''
         return f'{self.name}: {self.start}-{self.stop}: '\
-            f'[{"".join("X" if shot else "O" for shot in self.hits)}]'
+            f'[{"".join("X" if self.hitMask >> i & 1 else "O" for i in range(self.length))}]'
 
     def __len__(self):
         '''
         Gives the length of the ship
         '''
-        return len(self.hits)
+        return self.length
+
+    @property
+    def hits(self) -> list[bool]:
+        '''
+        Whether each cell from start has been hit
+        '''
+        return [self.hitMask >> i & 1 == 1 for i in range(self.length)]
 
     def shoot(self, shot: tuple[int, int]) -> bool:
         '''
@@ -105,12 +233,28 @@ class Ship:
         bool: True if shot hit ship
         '''
         if self.posOnShip(shot):
-            key = shot[0] - self.start[0] + shot[1] - self.start[1]
-            self.hits[key] = True
+            bit = 1 << (shot[0] - self.start[0] + shot[1] - self.start[1])
+            if not self.hitMask & bit:
+                self.hitMask |= bit
+                self.remaining -= 1
             return True
         else:
             return False
 
+    def repair(self, shot: tuple[int, int]):
+        '''
+        Removes the hit at the position, undoing shoot
+
+        Parameters
+        ----------
+        shot: tuple[int, int]
+            The position of the shot, which must be on the ship
+        '''
+        bit = 1 << (shot[0] - self.start[0] + shot[1] - self.start[1])
+        if self.hitMask & bit:
+            self.hitMask ^= bit
+            self.remaining += 1
+
     def isSunk(self) -> bool:
         '''
         Checks if ship is sunk
@@ -122,7 +266,7 @@ class Ship:
         -------
         bool: True if all positions are hit
         '''
-        return all(self.hits)
+        return self.remaining == 0
 
     def posOnShip(self, pos: tuple[int, int]) -> bool:
         '''
@@ -140,6 +284,17 @@ class Ship:
         return self.start[0] <= pos[0] <= self.stop[0]\
             and self.start[1] <= pos[1] <= self.stop[1]
 
+    def positions(self) -> list[tuple[int, int]]:
+        '''
+        Gets every position covered by the ship
+
+        Returns
+        -------
+        list[tuple[int, int]]: The positions in (x, y) from start to stop
+        '''
+        return [(i, j) for i in range(self.start[0], self.stop[0] + 1)
+                for j in range(self.start[1], self.stop[1] + 1)]
+
 
 class Board:
     '''
@@ -147,12 +302,31 @@ class Board:
 
     Attributes
     ----------
+    size: int
+        The number of rows and cols on the board
+
     grid: list[list[int | str]]
         The grid on the board containing ships and shots
 
     ships: list[Ship]
         Stores the ships on the board
 
+    shipIndex: list[list[Ship | None]]
+        The ship covering each cell of the grid
+
+    fleetHealth: int
+        The number of unhit cells left on all ships
+
+    recorder: BoardRecorder | None
+        Told about every change to the board, see gameLog
+
+    hash: int
+        The Zobrist hash of the shots, hits and sunk ships, see zobrist
+
+    history: list[tuple[tuple[int, int], str]]
+        Every shot that changed the board and its result, oldest first,
+        except those at ships removed since
+
     Methods
     -------
     shipOverlap(ship): bool
@@ -167,26 +341,47 @@ class Board:
     removeShip(): bool
         Attempts to remove ship from the board
 
+    shipHash(ship): int
+        Gets the part of the hash made by the shots at a ship
+
     shoot(shot): str
         Shoots the specified location and reports hit, miss, or same
 
+    shootMany(shots): tuple[list[str], list[Ship]]
+        Shoots a salvo of locations at once
+
+    undo(): tuple[tuple[int, int], str] | None
+        Takes back the last shot that changed the board
+
     isGameOver(): bool
         Checks if game is over.
     '''
 
-    def __init__(self):
+    def __init__(self, size: int = 10):
         '''
         Constructs all the necesarry attributes for the Board object
+
+        Parameters
+        ----------
+        size: int
+            The number of rows and cols on the board
         '''
-        self.grid = [[0 for i in range(10)] for j in range(10)]
+        self.size = size
+        self.grid = [[0 for i in range(size)] for j in range(size)]
         self.ships = []
+        self.shipIndex = [[None for i in range(size)] for j in range(size)]
+        self.fleetHealth = 0
+        self.recorder = None
+        self.hash = 0
+        self.missKeys, self.hitKeys = cellKeys()
+        self.history = []
 
     def __repr__(self) -> str:
         '''
         Displays a string representation of the Board Object
         '''
-        return ' ' * 3 + ', '.join(str(i + 1) for i in range(0, 10)) + '\n'\
-            + '\n'.join(f'{chr(i + ord("A"))}: ' + ', '.join(map(str, row))
+        return ' ' * 3 + ', '.join(str(i + 1) for i in range(0, self.size)) + '\n'\
+            + '\n'.join(f'{rowToLetters(i)}: ' + ', '.join(map(str, row))
                         for i, row in enumerate(self.grid)) + '\n'\
             + '\n'.join(str(ship) for ship in self.ships)
 
@@ -222,7 +417,7 @@ class Board:
         -------
         bool: True if pos is out of bounds
         '''
-        return pos[0] < 0 or pos[0] >= 10 or pos[1] < 0 or pos[1] >= 10
+        return pos[0] < 0 or pos[0] >= self.size or pos[1] < 0 or pos[1] >= self.size
 
     def addShip(self, ship: Ship):
         '''
@@ -250,10 +445,15 @@ class Board:
             raise OverlapException
 
         self.ships.append(ship)
+        self.fleetHealth += ship.remaining
 
         for i in range(ship.start[0], ship.stop[0] + 1):
             for j in range(ship.start[1], ship.stop[1] + 1):
                 self.grid[j][i] = ship.name[0]
+                self.shipIndex[j][i] = ship
+
+        if self.recorder is not None:
+            self.recorder.place(self, ship)
 
     def removeShip(self, name: str) -> bool:
         '''
@@ -270,20 +470,50 @@ class Board:
         -------
         bool: True if the ship was removed
         '''
-        for ship in self.ships:
+        for k, ship in enumerate(self.ships):
             if name == ship.name:
                 for i in range(ship.start[0], ship.stop[0] + 1):
                     for j in range(ship.start[1], ship.stop[1] + 1):
                         self.grid[j][i] = 0
-                self.ships.remove(ship)
+                        self.shipIndex[j][i] = None
+                self.fleetHealth -= ship.remaining
+                self.hash ^= self.shipHash(ship)
+                del self.ships[k]
+                # Shots at the ship cannot be undone once it is gone
+                self.history = [entry for entry in self.history if not ship.posOnShip(entry[0])]
+                if self.recorder is not None:
+                    self.recorder.remove(self, k)
                 return True
 
         return False
 
+    def shipHash(self, ship: Ship) -> int:
+        '''
+        Gets the part of the hash made by the shots at a ship
+
+        A removed ship takes its shots with it, so removeShip takes this
+        out of the hash.
+
+        Parameters
+        ----------
+        ship: Ship
+            The ship on the board
+
+        Returns
+        -------
+        int: The XOR of the hit keys of its cells shot, and its ship key
+        if it is sunk
+        '''
+        value = shipKey(ship.name) if ship.isSunk() else 0
+
+        for (x, y), hit in zip(ship.positions(), ship.hits):
+            if hit:
+                value ^= self.hitKeys[y * self.size + x]
+
+        return value
+
     def strToPoint(self, s: str) -> tuple[int, int]:
-        row = ord(s[0]) - ord('A')
-        col = int(s[1:]) - 1
-        return (col, row)
+        return strToPoint(s)
 
     def shoot(self, shot: tuple[int, int] | str) -> str:
         '''
@@ -317,21 +547,134 @@ class Board:
         match(self.grid[shot[1]][shot[0]]):
             case 0:
                 didHit = 'MISS'
+                self.hash ^= self.missKeys[shot[1] * self.size + shot[0]]
+                self.history.append((shot, didHit))
             case 1:
                 didHit = 'SAME'
             case _:
-                for ship in self.ships:
-                    if ship.shoot(shot):
-                        if ship.isSunk():
-                            didHit = 'SUNK'
-                        else:
-                            didHit = 'HIT'
-                        break
+                ship = self.shipIndex[shot[1]][shot[0]]
+                ship.shoot(shot)
+                self.fleetHealth -= 1
+                self.hash ^= self.hitKeys[shot[1] * self.size + shot[0]]
+                if ship.remaining == 0:
+                    didHit = 'SUNK'
+                    self.hash ^= shipKey(ship.name)
+                else:
+                    didHit = 'HIT'
+                self.history.append((shot, didHit))
 
         self.grid[shot[1]][shot[0]] = 1
 
+        if self.recorder is not None:
+            self.recorder.shot(self, shot, didHit)
+
         return didHit
 
+    def shootMany(self, shots: list[tuple[int, int] | str]) -> tuple[list[str], list[Ship]]:
+        '''
+        Shoots a salvo of locations at once
+
+        Every shot is checked before any is fired, so a salvo with a shot
+        out of bounds changes nothing. A location repeated in the salvo is
+        SAME after its first shot.
+
+        Parameters
+        ----------
+        shots: list[tuple[int, int] | str]
+            The positions of the shots in (x, y) or as strings (e.g. B4)
+
+        Returns
+        -------
+        list[str]: The result of each shot, as returned by shoot
+        list[Ship]: The ships sunk by the salvo
+
+        Raises
+        ------
+        OutOfBoundsException: A shot is out of bounds of the board
+        '''
+        points = [self.strToPoint(shot) if isinstance(shot, str) else shot for shot in shots]
+
+        if any(self.isOutOfBounds(point) for point in points):
+            raise OutOfBoundsException
+
+        grid = self.grid
+        shipIndex = self.shipIndex
+        size = self.size
+        value = self.hash
+        results = []
+        sunk = []
+
+        for x, y in points:
+            cell = grid[y][x]
+            grid[y][x] = 1
+
+            if cell == 0:
+                results.append('MISS')
+                value ^= self.missKeys[y * size + x]
+            elif cell == 1:
+                results.append('SAME')
+            else:
+                ship = shipIndex[y][x]
+                ship.shoot((x, y))
+                self.fleetHealth -= 1
+                value ^= self.hitKeys[y * size + x]
+                if ship.remaining == 0:
+                    results.append('SUNK')
+                    sunk.append(ship)
+                    value ^= shipKey(ship.name)
+                else:
+                    results.append('HIT')
+
+        self.hash = value
+        self.history.extend((point, result) for point, result in zip(points, results)
+                            if result != 'SAME')
+
+        if self.recorder is not None:
+            for point, result in zip(points, results):
+                self.recorder.shot(self, point, result)
+
+        return results, sunk
+
+    def undo(self) -> tuple[tuple[int, int], str] | None:
+        '''
+        Takes back the last shot that changed the board
+
+        SAME shots change nothing, so they are not taken back. Shots that
+        were recorded cannot be undone, nor can hits on a ship that was
+        removed since, which removeShip drops from the history.
+
+        Returns
+        -------
+        tuple[tuple[int, int], str] | None: The position and result of the
+        shot taken back, None if no shot is left
+
+        Raises
+        ------
+        RuntimeError: The board has a recorder
+        '''
+        if self.recorder is not None:
+            raise RuntimeError('shots told to a recorder cannot be undone')
+
+        if not self.history:
+            return None
+
+        shot, result = self.history.pop()
+        x, y = shot
+
+        if result == 'MISS':
+            self.grid[y][x] = 0
+            self.hash ^= self.missKeys[y * self.size + x]
+        else:
+            ship = self.shipIndex[y][x]
+            ship.repair(shot)
+            self.fleetHealth += 1
+            self.grid[y][x] = ship.name[0]
+            self.hash ^= self.hitKeys[y * self.size + x]
+            if result == 'SUNK':
+                self.hash ^= shipKey(ship.name)
+
+        return shot, result
+
     def isGameOver(self) -> bool:
         '''
         Checks if game is over.
@@ -340,7 +683,7 @@ class Board:
         -------
         bool: True if all ships have been sunk
         '''
-        return all(map(Ship.isSunk, self.ships))
+        return self.fleetHealth == 0
 
     def getShipAtPos(self, pos: tuple[int, int] | str) -> Ship | None:
         '''
@@ -371,17 +714,7 @@ class Board:
         if self.isOutOfBounds(pos):
             raise OutOfBoundsException
 
-        if self.grid[pos[1]][pos[0]] == 0:
-            return None
-
-        foundShip = None
-
-        for ship in self.ships:
-            if ship.posOnShip(pos):
-                foundShip = ship
-                break
-
-        return foundShip
+        return self.shipIndex[pos[1]][pos[0]]
 
     def isShot(self, pos: tuple[int, int] | str) -> bool:
         '''
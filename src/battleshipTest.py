@@ -4,7 +4,202 @@ Auth: Blake Wingard - bats23456789@gmail.com
 Date: 01/02/2024
 Desc: A Test file for battleship.py
 '''
+import asyncio
+import random
 import battleship
+from bitBoard import BitBoard
+from boardState import BoardState
+from densityAI import DensityAI
+from placement import randomBoard
+from server import GameServer
+from sparseBoard import SparseBoard
+
+ENGINES = (battleship.Board, BitBoard, SparseBoard)
+
+
+def checkEngines(games: int = 50):
+    '''
+    Checks that every board engine plays the same as Board
+
+    The same ships and shots are given to every engine, and to a
+    BoardState, and each shot must give the same result, hash and
+    isGameOver. Half the games are fired as salvos with shootMany. Ships
+    are removed before and after the shots, a ship placed over misses
+    must be refused, and every game is then undone back to an empty
+    board.
+
+    Parameters
+    ----------
+    games: int
+        The number of random games checked
+    '''
+    for game in range(games):
+        rng = random.Random(game)
+        ships = randomBoard(random.Random(game)).ships
+        boards = [engine() for engine in ENGINES]
+
+        for board in boards:
+            for ship in ships:
+                board.addShip(battleship.Ship(ship.name, ship.start, ship.stop))
+
+        if game % 5 == 0:
+            name = rng.choice(ships).name
+            assert all(board.removeShip(name) for board in boards)
+
+        state = BoardState.fromBoard(boards[0])
+        shots = [(x, y) for x in range(10) for y in range(10)]
+        rng.shuffle(shots)
+        shots += shots[:5]
+
+        if game % 2:
+            for i in range(0, len(shots), 5):
+                salvo = shots[i:i + 5]
+                results = [board.shootMany(salvo)[0] for board in boards]
+                assert all(result == results[0] for result in results), salvo
+
+                for shot, result in zip(salvo, results[0]):
+                    state, stateResult = state.shoot(shot)
+                    assert stateResult == result, shot
+        else:
+            for shot in shots:
+                results = [board.shoot(shot) for board in boards]
+                assert all(result == results[0] for result in results), shot
+
+                state, stateResult = state.shoot(shot)
+                assert stateResult == results[0], shot
+
+                assert all(board.hash == state.hash for board in boards), shot
+                assert all(board.isGameOver() == state.isGameOver() for board in boards), shot
+
+        assert all(board.hash == state.hash for board in boards)
+        assert all(board.isGameOver() for board in boards)
+
+        # A ship over cells already shot could never be sunk, so Board refuses it
+        x, y = next((x, y) for x, y in shots if x < 9 and boards[0].getShipAtPos((x, y)) is None
+                    and boards[0].getShipAtPos((x + 1, y)) is None)
+        for board in boards:
+            try:
+                board.addShip(battleship.Ship('Patrol Boat', (x, y), (x + 1, y)))
+            except battleship.OverlapException:
+                continue
+            raise AssertionError(f'{type(board).__name__} placed a ship over shots at {(x, y)}')
+
+        if game % 3 == 0:
+            name = rng.choice(boards[0].ships).name
+            assert all(board.removeShip(name) for board in boards)
+
+        for shot in shots:
+            assert len({board.isShot(shot) for board in boards}) == 1, shot
+            found = [board.getShipAtPos(shot) for board in boards]
+            assert len({ship and ship.name for ship in found}) == 1, shot
+
+        while True:
+            undone = [board.undo() for board in boards]
+            assert all(shot == undone[0] for shot in undone)
+            assert len({board.hash for board in boards}) == 1
+            if undone[0] is None:
+                break
+
+        assert all(board.hash == 0 for board in boards)
+        assert not any(board.isShot(shot) for board in boards for shot in shots)
+
+    print(f'Engines agree: {games} games')
+
+
+def checkDensity(games: int = 200):
+    '''
+    Checks that DensityAI keeps firing at its open hits
+
+    Whenever a hit is not yet on a sunk ship, the shot picked must have a
+    placement through it, even after a wrong guess about which ship sank.
+    Games where such a guess once left the AI shooting at random must now
+    finish well before every cell is shot.
+
+    Parameters
+    ----------
+    games: int
+        The number of random games checked
+    '''
+    counts = []
+
+    for game in range(games):
+        rng = random.Random(game)
+        board = randomBoard(rng)
+        ai = DensityAI()
+
+        while not board.isGameOver():
+            shot = ai.nextShot(rng)
+            if ai.hits.any():
+                assert ai.density()[shot[1] * 10 + shot[0]] > 0, (game, shot)
+            ai.observe(shot, board.shoot(shot))
+
+        counts.append(len(board.history))
+
+    # These games took 94 to 100 shots while the AI shot at random
+    assert all(counts[game] < 80 for game in (8, 15, 38, 156, 168)), counts
+    assert max(counts) < 90 and sum(count >= 80 for count in counts) <= games // 100, counts
+
+    print(f'Density AI: {sum(counts) / games:.1f} shots, worst {max(counts)}')
+
+
+async def checkFullMatch():
+    '''
+    Checks over loopback that a client refused from a full match can not
+    play in it
+
+    A third client joins a match of two, then sends SHIP and READY and
+    disconnects. Its commands must be rejected, and the two players must
+    still be able to finish the match.
+    '''
+    server = GameServer()
+    port = await server.start()
+
+    async def connect(commands: list[str]) -> tuple:
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        replies = []
+        for command in commands:
+            writer.write(command.encode() + b'\n')
+            replies.append((await reader.readline()).decode().rstrip('\n'))
+        return reader, writer, replies
+
+    ships = ['SHIP A1 A2 Patrol Boat', 'READY']
+    first = await connect(['JOIN full'] + ships)
+    second = await connect(['JOIN full'])
+
+    reader, writer, replies = await connect(['JOIN full', 'SHIP C1 C2 Patrol Boat', 'READY'])
+    assert replies == ['ERROR FULL', 'ERROR JOIN', 'ERROR JOIN'], replies
+    # Hang up and wait for the server to close its side once it handled that
+    writer.write_eof()
+    assert await reader.read() == b''
+    writer.close()
+
+    game = server.matches['full']
+    assert not game.boards[1].ships
+    assert game.writers[1] is not None and not game.isOver
+
+    second[1].write(b'SHIP A1 A2 Patrol Boat\nREADY\n')
+    assert await second[0].readline() == b'OK\n'
+    assert await second[0].readline() == b'OK\n'
+    assert await second[0].readline() == b'WAIT\n'
+    assert await first[0].readline() == b'TURN\n'
+
+    for player, other, shot in ((first, second, 'A1'), (second, first, 'C5'), (first, second, 'A2')):
+        player[1].write(f'SHOT {shot}\n'.encode())
+        await player[0].readline()
+        await other[0].readline()
+        if shot != 'A2':
+            assert await other[0].readline() == b'TURN\n'
+
+    assert await first[0].readline() == b'WIN\n'
+    assert game.winner == 0
+
+    for reader, writer, replies in (first, second):
+        writer.write(b'QUIT\n')
+        await reader.read()
+        writer.close()
+    await server.close()
+
+    print('Full match refused a third client')
 
 
 def main():
@@ -67,6 +262,10 @@ def main():
 
     print(f'GameOver: {board.isGameOver()}')
 
+    checkEngines()
+    checkDensity()
+    asyncio.run(checkFullMatch())
+
     return 0
 
 
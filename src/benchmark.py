@@ -0,0 +1,535 @@
+'''
+File: benchmark.py
+Auth: Blake Wingard - bats23456789@gmail.com
+Date: 10/18/2026
+Desc: A benchmark suite for the game engine and the board UI.
+
+Every benchmark reports the best seconds per operation over several
+repeats. Results can be saved as JSON and compared with a saved baseline,
+failing when any benchmark is slower than the baseline by more than the
+tolerance.
+
+Run from src. The UI benchmarks use Qt in offscreen mode and are skipped
+when PyQt6 is not installed. The cold start of the headless modes must
+also stay within COLD_START_BUDGETS and never import PyQt6.
+
+    python benchmark.py --save baseline.json
+    python benchmark.py --baseline baseline.json
+'''
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from battleship import Board, Ship
+from bitBoard import BitBoard
+from boardState import BoardState
+from sparseBoard import SparseBoard
+from placement import randomBoard, randomFleet, randomFleets
+from simulator import playGame, gameSeed
+from strategies import STRATEGIES
+
+ENGINES = (Board, BitBoard, SparseBoard)
+UI_BENCHMARKS = ('BoardScene.getCellIndex', 'BoardScene.highlightGrid')
+
+# The most seconds a fresh interpreter may take to load each headless mode
+COLD_START_BUDGETS = {
+    'coldStart.console': 0.1,
+    'coldStart.server': 0.25,
+}
+
+
+def timeOps(run, prepare, ops: int, repeat: int = 5) -> float:
+    '''
+    Times an operation, leaving its preparation out of the timing
+
+    Parameters
+    ----------
+    run: Callable[[Any], None]
+        Runs the operation ops times on the prepared state
+
+    prepare: Callable[[], Any]
+        Creates a fresh state for each repeat
+
+    ops: int
+        The number of operations done by run
+
+    repeat: int
+        The number of times to repeat the timing
+
+    Returns
+    -------
+    float: The best seconds per operation
+    '''
+    best = float('inf')
+
+    for i in range(repeat):
+        state = prepare()
+        begin = time.perf_counter()
+        run(state)
+        best = min(best, time.perf_counter() - begin)
+
+    return best / ops
+
+
+def fleets(count: int) -> list[list[Ship]]:
+    '''
+    Creates random fleets, the same for every run
+
+    Parameters
+    ----------
+    count: int
+        The number of fleets
+
+    Returns
+    -------
+    list[list[Ship]]: The fleets
+    '''
+    rng = random.Random(0)
+    return [randomFleet(rng) for i in range(count)]
+
+
+def benchAddShip(engine: type[Board], scale: int) -> float:
+    '''
+    Times Board.addShip on empty boards, rejected placements included
+
+    Parameters
+    ----------
+    engine: type[Board]
+        The board engine
+
+    scale: int
+        The number of boards filled
+
+    Returns
+    -------
+    float: Seconds per addShip
+    '''
+    ships = [ship for fleet in fleets(scale) for ship in fleet]
+    overlap = Ship('Overlap', (0, 0), (9, 0))
+
+    def prepare():
+        return [engine() for i in range(scale)]
+
+    def run(boards):
+        for i, board in enumerate(boards):
+            for ship in ships[i * 5:i * 5 + 5]:
+                board.addShip(ship)
+            try:
+                board.addShip(overlap)
+            except Exception:
+                pass
+
+    return timeOps(run, prepare, scale * 6)
+
+
+def benchShoot(engine: type[Board], scale: int) -> float:
+    '''
+    Times Board.shoot until every cell of a board has been shot
+
+    Parameters
+    ----------
+    engine: type[Board]
+        The board engine
+
+    scale: int
+        The number of boards shot
+
+    Returns
+    -------
+    float: Seconds per shot
+    '''
+    rng = random.Random(0)
+    orders = [rng.sample([(x, y) for y in range(10) for x in range(10)], 100)
+              for i in range(scale)]
+
+    def prepare():
+        rng = random.Random(1)
+        return [randomBoard(rng, boardType=engine) for i in range(scale)]
+
+    def run(boards):
+        for board, order in zip(boards, orders):
+            for shot in order:
+                board.shoot(shot)
+
+    return timeOps(run, prepare, scale * 100)
+
+
+def benchUndo(engine: type[Board], scale: int) -> float:
+    '''
+    Times Board.shoot followed by Board.undo, as a lookahead tries a shot
+
+    Parameters
+    ----------
+    engine: type[Board]
+        The board engine
+
+    scale: int
+        The number of boards shot
+
+    Returns
+    -------
+    float: Seconds per shot and undo
+    '''
+    rng = random.Random(0)
+    orders = [rng.sample([(x, y) for y in range(10) for x in range(10)], 100)
+              for i in range(scale)]
+    boards = [randomBoard(random.Random(1), boardType=engine) for i in range(scale)]
+
+    def run(boards):
+        for board, order in zip(boards, orders):
+            shoot = board.shoot
+            undo = board.undo
+            for shot in order:
+                shoot(shot)
+                undo()
+
+    return timeOps(run, lambda: boards, scale * 100)
+
+
+def benchStateShoot(scale: int) -> float:
+    '''
+    Times BoardState.shoot from a single state, as a lookahead tries a shot
+
+    Parameters
+    ----------
+    scale: int
+        The number of states shot
+
+    Returns
+    -------
+    float: Seconds per shot
+    '''
+    rng = random.Random(0)
+    orders = [rng.sample([(x, y) for y in range(10) for x in range(10)], 100)
+              for i in range(scale)]
+    states = [BoardState.fromBoard(randomBoard(random.Random(1))) for i in range(scale)]
+
+    def run(states):
+        for state, order in zip(states, orders):
+            shoot = state.shoot
+            for shot in order:
+                shoot(shot)
+
+    return timeOps(run, lambda: states, scale * 100)
+
+
+def benchIsGameOver(engine: type[Board], scale: int) -> float:
+    '''
+    Times Board.isGameOver on a board with half its cells shot
+
+    Parameters
+    ----------
+    engine: type[Board]
+        The board engine
+
+    scale: int
+        Scales the number of calls
+
+    Returns
+    -------
+    float: Seconds per call
+    '''
+    board = randomBoard(random.Random(0), boardType=engine)
+    for i in range(0, 100, 2):
+        board.shoot((i % 10, i // 10))
+    calls = scale * 100
+
+    def run(board):
+        isGameOver = board.isGameOver
+        for i in range(calls):
+            isGameOver()
+
+    return timeOps(run, lambda: board, calls)
+
+
+def benchGetShipAtPos(engine: type[Board], scale: int) -> float:
+    '''
+    Times Board.getShipAtPos over every cell of a board
+
+    Parameters
+    ----------
+    engine: type[Board]
+        The board engine
+
+    scale: int
+        The number of passes over the board
+
+    Returns
+    -------
+    float: Seconds per call
+    '''
+    board = randomBoard(random.Random(0), boardType=engine)
+    cells = [(x, y) for y in range(10) for x in range(10)]
+
+    def run(board):
+        for i in range(scale):
+            for cell in cells:
+                board.getShipAtPos(cell)
+
+    return timeOps(run, lambda: board, scale * 100)
+
+
+def benchGame(strategy: str, scale: int) -> float:
+    '''
+    Times full random games between two copies of a strategy
+
+    Parameters
+    ----------
+    strategy: str
+        The name of the strategy in STRATEGIES
+
+    scale: int
+        Scales the number of games
+
+    Returns
+    -------
+    float: Seconds per game
+    '''
+    games = max(scale // 10, 1)
+
+    def run(state):
+        for game in range(games):
+            playGame(STRATEGIES[strategy], STRATEGIES[strategy], gameSeed(0, game))
+
+    return timeOps(run, lambda: None, games, repeat=3)
+
+
+def benchRandomFleet(scale: int) -> float:
+    '''
+    Times placement.randomFleet
+
+    Parameters
+    ----------
+    scale: int
+        The number of fleets
+
+    Returns
+    -------
+    float: Seconds per fleet
+    '''
+    def run(rng):
+        for i in range(scale):
+            randomFleet(rng)
+
+    return timeOps(run, lambda: random.Random(0), scale)
+
+
+def benchRandomFleets(scale: int) -> float:
+    '''
+    Times placement.randomFleets
+
+    Parameters
+    ----------
+    scale: int
+        Scales the number of fleets
+
+    Returns
+    -------
+    float: Seconds per fleet
+    '''
+    count = scale * 100
+    return timeOps(lambda state: randomFleets(count, seed=0), lambda: None, count)
+
+
+def benchColdStart(modules: str, repeat: int = 5) -> float:
+    '''
+    Times a fresh interpreter importing the modules of a headless mode
+
+    Parameters
+    ----------
+    modules: str
+        The modules imported, separated by commas
+
+    repeat: int
+        The number of interpreters started
+
+    Returns
+    -------
+    float: The best seconds from starting the interpreter to its exit
+
+    Raises
+    ------
+    RuntimeError: The modules imported PyQt6
+    '''
+    code = f'import sys, {modules}; sys.exit("PyQt6" in sys.modules)'
+    best = float('inf')
+
+    for i in range(repeat):
+        begin = time.perf_counter()
+        done = subprocess.run([sys.executable, '-c', code])
+        best = min(best, time.perf_counter() - begin)
+
+        if done.returncode != 0:
+            raise RuntimeError(f'importing {modules} loads PyQt6')
+
+    return best
+
+
+def uiBenchmarks(scale: int, only: str = '') -> dict[str, float]:
+    '''
+    Times the hot paths of BoardScene with Qt in offscreen mode
+
+    Parameters
+    ----------
+    scale: int
+        Scales the number of calls
+
+    only: str
+        Only run benchmarks whose name contains this
+
+    Returns
+    -------
+    dict[str, float]: Seconds per call of each benchmark, empty when
+    PyQt6 is not installed
+    '''
+    if not any(only in name for name in UI_BENCHMARKS):
+        return {}
+
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+    try:
+        from PyQt6.QtWidgets import QApplication
+        from PyQt6.QtCore import QPointF
+        from BoardModal import BoardScene
+    except ImportError:
+        return {}
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    scene = BoardScene(Board(), 0, 0, 550, 550, lazyBackground=True)
+    rng = random.Random(0)
+    points = [QPointF(rng.uniform(0, 550), rng.uniform(0, 550)) for i in range(scale * 10)]
+    indices = [scene.getCellIndex(point) for point in points]
+
+    def cellIndex(scene):
+        for point in points:
+            scene.getCellIndex(point)
+
+    def highlight(scene):
+        for index in indices:
+            scene.highlightGrid(index)
+
+    benchmarks = dict(zip(UI_BENCHMARKS, (cellIndex, highlight)))
+    results = {name: timeOps(bench, lambda: scene, len(points))
+               for name, bench in benchmarks.items() if only in name}
+
+    del app
+    return results
+
+
+def runBenchmarks(scale: int = 100, only: str = '') -> dict[str, float]:
+    '''
+    Runs every benchmark
+
+    Parameters
+    ----------
+    scale: int
+        Scales the work done by every benchmark
+
+    only: str
+        Only run benchmarks whose name contains this
+
+    Returns
+    -------
+    dict[str, float]: Seconds per operation of each benchmark
+    '''
+    benchmarks = {}
+
+    for engine in ENGINES:
+        name = engine.__name__
+        benchmarks[f'{name}.addShip'] = lambda engine=engine: benchAddShip(engine, scale)
+        benchmarks[f'{name}.shoot'] = lambda engine=engine: benchShoot(engine, scale)
+        benchmarks[f'{name}.undo'] = lambda engine=engine: benchUndo(engine, scale)
+        benchmarks[f'{name}.isGameOver'] = lambda engine=engine: benchIsGameOver(engine, scale)
+        benchmarks[f'{name}.getShipAtPos'] = lambda engine=engine: benchGetShipAtPos(engine, scale)
+
+    benchmarks['BoardState.shoot'] = lambda: benchStateShoot(scale)
+
+    for strategy in ('random', 'hunt'):
+        benchmarks[f'game.{strategy}'] = lambda strategy=strategy: benchGame(strategy, scale)
+
+    benchmarks['placement.randomFleet'] = lambda: benchRandomFleet(scale)
+    benchmarks['placement.randomFleets'] = lambda: benchRandomFleets(scale)
+    benchmarks['coldStart.console'] = lambda: benchColdStart('main')
+    benchmarks['coldStart.server'] = lambda: benchColdStart('main, server')
+
+    results = {name: bench() for name, bench in benchmarks.items() if only in name}
+
+    results.update(uiBenchmarks(scale, only))
+
+    return results
+
+
+def compare(baseline: dict[str, float], results: dict[str, float],
+            tolerance: float = 0.2) -> list[str]:
+    '''
+    Compares results with a baseline
+
+    Parameters
+    ----------
+    baseline: dict[str, float]
+        The saved seconds per operation of each benchmark
+
+    results: dict[str, float]
+        The new seconds per operation of each benchmark
+
+    tolerance: float
+        How much slower than the baseline a benchmark may be
+
+    Returns
+    -------
+    list[str]: The names of the benchmarks that regressed
+    '''
+    return [name for name, seconds in results.items()
+            if name in baseline and seconds > baseline[name] * (1 + tolerance)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the game engine and board UI.')
+    parser.add_argument('--scale', type=int, default=100)
+    parser.add_argument('--only', default='', help='only run benchmarks containing this')
+    parser.add_argument('--save', help='save the results to this JSON file')
+    parser.add_argument('--baseline', help='compare with results saved by --save')
+    parser.add_argument('--tolerance', type=float, default=0.2)
+    args = parser.parse_args()
+
+    results = runBenchmarks(args.scale, args.only)
+    baseline = {}
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)['results']
+
+    for name, seconds in results.items():
+        line = f'{name:>28}: {seconds * 1e6:10.3f}us'
+        if name in baseline:
+            line += f'  {seconds / baseline[name]:6.2f}x baseline'
+        print(line)
+
+    if args.save:
+        with open(args.save, 'w') as file:
+            json.dump({
+                'python': platform.python_version(),
+                'machine': platform.machine(),
+                'scale': args.scale,
+                'results': results,
+            }, file, indent=4)
+
+    regressions = compare(baseline, results, args.tolerance)
+    for name in regressions:
+        print(f'Regression: {name} is {results[name] / baseline[name]:.2f}x the baseline')
+
+    for name, budget in COLD_START_BUDGETS.items():
+        if results.get(name, 0) > budget:
+            regressions.append(name)
+            print(f'Over budget: {name} took {results[name] * 1e3:.0f}ms, '
+                  f'the budget is {budget * 1e3:.0f}ms')
+
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
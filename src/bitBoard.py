@@ -0,0 +1,514 @@
+'''
+File: bitBoard.py
+Auth: Blake Wingard - bats23456789@gmail.com
+Date: 10/18/2026
+Desc: A bitmask backed board engine for battleship.
+'''
+from battleship import Board, Ship
+from battleship import OutOfBoundsException, OverlapException
+from zobrist import cellKeys, shipKey
+
+
+class BitBoard(Board):
+    '''
+    A class to represent a Battleship Board stored as integer bitmasks.
+
+    Cell (x, y) is stored in bit y * size + x of every mask. The public
+    API matches Board, so the two can be swapped freely.
+
+    A single shot costs about the same as on Board, as a mask operation
+    is no cheaper than a list lookup in Python. The masks make the board
+    smaller and make whole board questions such as hits a single step.
+
+    Attributes
+    ----------
+    size: int
+        The number of rows and cols on the board
+
+    fleet: int
+        A mask of every cell covered by a ship
+
+    shots: int
+        A mask of every cell that has been shot
+
+    shipMasks: list[int]
+        The mask of each ship, in the same order as ships
+
+    shipIndex: list[Ship | None]
+        The ship covering each cell, as in Board
+
+    hits: int
+        A mask of every cell where a ship has been hit
+
+    fleetHealth: int
+        The number of ship cells not yet hit, as in Board
+
+    ships: list[Ship]
+        Stores the ships on the board
+
+    recorder: BoardRecorder | None
+        Told about every change to the board, see gameLog
+
+    hash: int
+        The Zobrist hash of the shots, hits and sunk ships, see zobrist
+
+    history: list[tuple[tuple[int, int], str]]
+        Every shot that changed the board and its result, oldest first,
+        except those at ships removed since
+
+    Methods
+    -------
+    posToBit(pos): int
+        Converts a position into its single bit mask
+
+    shipToMask(ship): int
+        Converts a ship into the mask of the cells it covers
+
+    indexShips()
+        Rebuilds shipIndex from shipMasks
+    '''
+
+    def __init__(self, size: int = 10):
+        '''
+        Constructs all the necesarry attributes for the BitBoard object
+
+        Parameters
+        ----------
+        size: int
+            The number of rows and cols on the board
+        '''
+        self.size = size
+        self.fleet = 0
+        self.shots = 0
+        self.shipMasks = []
+        self.ships = []
+        self.shipIndex = [None for i in range(self.size * self.size)]
+        self.fleetHealth = 0
+        self.recorder = None
+        self.hash = 0
+        self.missKeys, self.hitKeys = cellKeys()
+        self.history = []
+
+    @property
+    def hits(self) -> int:
+        '''
+        A mask of every cell where a ship has been hit
+        '''
+        return self.fleet & self.shots
+
+    @property
+    def grid(self) -> list[list[int | str]]:
+        '''
+        The grid representation used by Board
+
+        Built on demand for code that still reads the grid directly.
+        '''
+        size = self.size
+        grid = [[0 for i in range(size)] for j in range(size)]
+
+        for ship in self.ships:
+            for i in range(ship.start[0], ship.stop[0] + 1):
+                for j in range(ship.start[1], ship.stop[1] + 1):
+                    grid[j][i] = ship.name[0]
+
+        shots = self.shots
+        while shots:
+            low = shots & -shots
+            index = low.bit_length() - 1
+            grid[index // size][index % size] = 1
+            shots ^= low
+
+        return grid
+
+    def posToBit(self, pos: tuple[int, int]) -> int:
+        '''
+        Converts a position into its single bit mask
+
+        Parameters
+        ----------
+        pos: tuple[int, int]
+            The position in (x, y)
+
+        Returns
+        -------
+        int: The mask with only the bit for pos set
+        '''
+        return 1 << (pos[1] * self.size + pos[0])
+
+    def shipToMask(self, ship: Ship) -> int:
+        '''
+        Converts a ship into the mask of the cells it covers
+
+        Parameters
+        ----------
+        ship: Ship
+            The ship to convert
+
+        Returns
+        -------
+        int: The mask of the ship
+        '''
+        length = len(ship)
+        first = ship.start[1] * self.size + ship.start[0]
+
+        if ship.start[1] == ship.stop[1]:
+            return ((1 << length) - 1) << first
+
+        mask = 0
+        for i in range(length):
+            mask |= 1 << (first + i * self.size)
+        return mask
+
+    def indexShips(self):
+        '''
+        Rebuilds shipIndex from shipMasks
+        '''
+        self.shipIndex = [None for i in range(self.size * self.size)]
+        for ship, mask in zip(self.ships, self.shipMasks):
+            while mask:
+                low = mask & -mask
+                self.shipIndex[low.bit_length() - 1] = ship
+                mask ^= low
+
+    def shipOverlap(self, ship: Ship) -> bool:
+        '''
+        Checks if the ship will overlap any ships or shots on the board
+
+        A shot cell is taken, as in Board, since a ship under it could
+        never be sunk.
+
+        Parameters
+        ----------
+        ship: Ship
+            The ship to check
+
+        Returns
+        -------
+        bool: True if the ship overlaps
+        '''
+        return (self.fleet | self.shots) & self.shipToMask(ship) != 0
+
+    def addShip(self, ship: Ship):
+        '''
+        Attempts to add a ship to the board
+
+        Parameters
+        ----------
+        ship: Ship
+            The ship to add
+
+        Raises
+        ------
+        OutOfBoundsException: The ship is out of bounds of the board
+        OverlapException: The ship overlaps another ship or a shot
+        '''
+        if self.isOutOfBounds(ship.start) or self.isOutOfBounds(ship.stop):
+            raise OutOfBoundsException
+
+        mask = self.shipToMask(ship)
+
+        if (self.fleet | self.shots) & mask:
+            raise OverlapException
+
+        self.ships.append(ship)
+        self.shipMasks.append(mask)
+        self.fleet |= mask
+        self.fleetHealth += ship.remaining
+
+        while mask:
+            low = mask & -mask
+            self.shipIndex[low.bit_length() - 1] = ship
+            mask ^= low
+
+        if self.recorder is not None:
+            self.recorder.place(self, ship)
+
+    def removeShip(self, name: str) -> bool:
+        '''
+        Attempts to remove ship from the board
+
+        If a duplicate exists, the first occurance will be removed
+
+        Parameters
+        ----------
+        name: str
+            The name of the ship to remove
+
+        Returns
+        -------
+        bool: True if the ship was removed
+        '''
+        for i, ship in enumerate(self.ships):
+            if name == ship.name:
+                shipIndex = self.shipIndex
+                mask = self.shipMasks[i]
+                self.fleet &= ~mask
+                # Board forgets the shots at a removed ship
+                self.shots &= ~mask
+                self.fleetHealth -= ship.remaining
+                self.hash ^= self.shipHash(ship)
+                while mask:
+                    low = mask & -mask
+                    shipIndex[low.bit_length() - 1] = None
+                    mask ^= low
+
+                del self.ships[i]
+                del self.shipMasks[i]
+                # Shots at the ship cannot be undone once it is gone
+                self.history = [entry for entry in self.history if not ship.posOnShip(entry[0])]
+                if self.recorder is not None:
+                    self.recorder.remove(self, i)
+                return True
+
+        return False
+
+    def shoot(self, shot: tuple[int, int] | str) -> str:
+        '''
+        Shoots the specified location and reports miss, same, hit, or sunk
+
+        Parameters
+        ----------
+        shot: tuple[int, int]
+            The position of the shot in (x, y)
+        shot: str
+            The position of the shot as a string (e.g. B4)
+
+        Returns
+        -------
+        str: "MISS" if the shot did not hit a ship
+             "SAME" if the shot hit a previously shot position
+             "HIT" if the shot hit a ship
+             "SUNK" if the shot sank the ship
+
+        Raises
+        ------
+        OutOfBoundsException: The shot is out of bounds of the board
+        '''
+        if isinstance(shot, str):
+            shot = self.strToPoint(shot)
+
+        x, y = shot
+        size = self.size
+
+        if not (0 <= x < size and 0 <= y < size):
+            raise OutOfBoundsException
+
+        cell = y * size + x
+        bit = 1 << cell
+        shots = self.shots
+
+        if shots & bit:
+            result = 'SAME'
+        else:
+            self.shots = shots | bit
+            ship = self.shipIndex[cell]
+            if ship is None:
+                self.hash ^= self.missKeys[cell]
+                result = 'MISS'
+            else:
+                # As Ship.shoot, the cell is known to be on the ship and not hit yet
+                start = ship.start
+                ship.hitMask |= 1 << (x - start[0] + y - start[1])
+                ship.remaining -= 1
+                self.fleetHealth -= 1
+                self.hash ^= self.hitKeys[cell]
+                if ship.remaining:
+                    result = 'HIT'
+                else:
+                    result = 'SUNK'
+                    self.hash ^= shipKey(ship.name)
+            self.history.append((shot, result))
+
+        if self.recorder is not None:
+            self.recorder.shot(self, shot, result)
+
+        return result
+
+    def shootMany(self, shots: list[tuple[int, int] | str]) -> tuple[list[str], list[Ship]]:
+        '''
+        Shoots a salvo of locations at once
+
+        Every shot is checked before any is fired, so a salvo with a shot
+        out of bounds changes nothing. A location repeated in the salvo is
+        SAME after its first shot.
+
+        Parameters
+        ----------
+        shots: list[tuple[int, int] | str]
+            The positions of the shots in (x, y) or as strings (e.g. B4)
+
+        Returns
+        -------
+        list[str]: The result of each shot, as returned by shoot
+        list[Ship]: The ships sunk by the salvo
+
+        Raises
+        ------
+        OutOfBoundsException: A shot is out of bounds of the board
+        '''
+        points = [self.strToPoint(shot) if isinstance(shot, str) else shot for shot in shots]
+
+        if any(self.isOutOfBounds(point) for point in points):
+            raise OutOfBoundsException
+
+        size = self.size
+        shots = self.shots
+        shipIndex = self.shipIndex
+        value = self.hash
+        results = []
+        sunk = []
+
+        for x, y in points:
+            cell = y * size + x
+            bit = 1 << cell
+
+            if shots & bit:
+                results.append('SAME')
+                continue
+
+            shots |= bit
+            ship = shipIndex[cell]
+
+            if ship is None:
+                results.append('MISS')
+                value ^= self.missKeys[cell]
+            else:
+                start = ship.start
+                ship.hitMask |= 1 << (x - start[0] + y - start[1])
+                ship.remaining -= 1
+                self.fleetHealth -= 1
+                value ^= self.hitKeys[cell]
+                if ship.remaining == 0:
+                    results.append('SUNK')
+                    sunk.append(ship)
+                    value ^= shipKey(ship.name)
+                else:
+                    results.append('HIT')
+
+        self.shots = shots
+        self.hash = value
+        self.history.extend((point, result) for point, result in zip(points, results)
+                            if result != 'SAME')
+
+        if self.recorder is not None:
+            for point, result in zip(points, results):
+                self.recorder.shot(self, point, result)
+
+        return results, sunk
+
+    def undo(self) -> tuple[tuple[int, int], str] | None:
+        '''
+        Takes back the last shot that changed the board
+
+        SAME shots change nothing, so they are not taken back. Shots that
+        were recorded cannot be undone, nor can hits on a ship that was
+        removed since, which removeShip drops from the history.
+
+        Returns
+        -------
+        tuple[tuple[int, int], str] | None: The position and result of the
+        shot taken back, None if no shot is left
+
+        Raises
+        ------
+        RuntimeError: The board has a recorder
+        '''
+        if self.recorder is not None:
+            raise RuntimeError('shots told to a recorder cannot be undone')
+
+        if not self.history:
+            return None
+
+        shot, result = self.history.pop()
+        x, y = shot
+        cell = y * self.size + x
+        self.shots ^= 1 << cell
+
+        if result == 'MISS':
+            self.hash ^= self.missKeys[cell]
+        else:
+            # As Ship.repair, the cell is known to be a hit on the ship
+            ship = self.shipIndex[cell]
+            start = ship.start
+            ship.hitMask ^= 1 << (x - start[0] + y - start[1])
+            ship.remaining += 1
+            self.fleetHealth += 1
+            self.hash ^= self.hitKeys[cell]
+            if result == 'SUNK':
+                self.hash ^= shipKey(ship.name)
+
+        return shot, result
+
+    def isGameOver(self) -> bool:
+        '''
+        Checks if game is over.
+
+        Returns
+        -------
+        bool: True if all ships have been sunk
+        '''
+        return self.fleetHealth == 0
+
+    def getShipAtPos(self, pos: tuple[int, int] | str) -> Ship | None:
+        '''
+        Gets a ship at position (pos) if it exists
+
+        Parameters
+        ----------
+        pos: tuple[int, int]
+            The position of the ship to find in (x, y)
+
+        pos: str
+            The position of the ship to find as a string (e.g. B4)
+
+        Returns
+        -------
+        Ship: The ship found
+
+        None: The ship was not found
+
+        Exception
+        ----------
+        OutOfBoundsException: The shot is out of bounds of the board
+        '''
+        if isinstance(pos, str):
+            pos = self.strToPoint(pos)
+
+        x, y = pos
+        size = self.size
+
+        if not (0 <= x < size and 0 <= y < size):
+            raise OutOfBoundsException
+
+        return self.shipIndex[y * size + x]
+
+    def isShot(self, pos: tuple[int, int] | str) -> bool:
+        '''
+        Checks if cell has been shot
+
+        Parameters
+        ----------
+        pos: tuple[int, int]
+            The position of the cell to check in (x, y)
+
+        pos: str
+            The position of the cell to check as a string (e.g. B4)
+
+        Returns
+        -------
+        bool: True if the cell was shot
+
+        Exception
+        ----------
+        OutOfBoundsException: The shot is out of bounds of the board
+        '''
+        if isinstance(pos, str):
+            pos = self.strToPoint(pos)
+
+        x, y = pos
+        size = self.size
+
+        if not (0 <= x < size and 0 <= y < size):
+            raise OutOfBoundsException
+
+        return self.shots >> (y * size + x) & 1 == 1
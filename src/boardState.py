@@ -0,0 +1,319 @@
+'''
+File: boardState.py
+Auth: Blake Wingard - bats23456789@gmail.com
+Date: 10/18/2026
+Desc: Immutable board states for looking ahead.
+
+A BoardState is never changed. Shooting it gives a new state and leaves
+the old one as it was, so an AI can try a shot and simply drop the
+result, or keep every state of a search without copying boards.
+
+The ships of a board never move once play starts, so they are kept in a
+Layout shared by every state of the board. A state only holds the shot
+cells and the sunk ships as integer bitmasks and its Zobrist hash, and a
+shot costs one small object.
+'''
+from battleship import Board, Ship, strToPoint
+from battleship import OutOfBoundsException, OverlapException
+from zobrist import cellKeys, shipKey
+
+
+class Layout:
+    '''
+    A class to represent the ships of a board, shared by all its states.
+
+    Cell (x, y) is bit y * size + x of every mask, as in BitBoard.
+
+    Attributes
+    ----------
+    size: int
+        The number of rows and cols on the board
+
+    ships: tuple[Ship, ...]
+        The ships, never shot
+
+    shipMasks: tuple[int, ...]
+        The mask of each ship, in the same order as ships
+
+    fleet: int
+        A mask of every cell covered by a ship
+
+    shipIndex: tuple[int, ...]
+        The index into ships of the ship covering each cell, -1 if none
+
+    missKeys: CellKeys
+        The Zobrist miss key of each cell
+
+    hitKeys: CellKeys
+        The Zobrist hit key of each cell
+    '''
+
+    __slots__ = ('size', 'ships', 'shipMasks', 'fleet', 'shipIndex', 'missKeys', 'hitKeys')
+
+    def __init__(self, ships: list[Ship], size: int = 10):
+        '''
+        Constructs all the necesarry attributes for the Layout object
+
+        Parameters
+        ----------
+        ships: list[Ship]
+            The ships on the board
+
+        size: int
+            The number of rows and cols on the board
+
+        Raises
+        ------
+        OutOfBoundsException: A ship is out of bounds of the board
+        OverlapException: Two ships overlap
+        '''
+        self.size = size
+        self.ships = tuple(Ship(ship.name, ship.start, ship.stop) for ship in ships)
+        self.missKeys, self.hitKeys = cellKeys()
+
+        masks = []
+        fleet = 0
+        shipIndex = [-1] * (size * size)
+
+        for i, ship in enumerate(self.ships):
+            mask = 0
+            for x, y in ship.positions():
+                if not (0 <= x < size and 0 <= y < size):
+                    raise OutOfBoundsException
+                mask |= 1 << (y * size + x)
+                shipIndex[y * size + x] = i
+
+            if fleet & mask:
+                raise OverlapException
+
+            masks.append(mask)
+            fleet |= mask
+
+        self.shipMasks = tuple(masks)
+        self.fleet = fleet
+        self.shipIndex = tuple(shipIndex)
+
+
+class BoardState:
+    '''
+    A class to represent the state of a board at one point of a game.
+
+    States are never changed, shoot returns a new one.
+
+    Attributes
+    ----------
+    layout: Layout
+        The ships of the board
+
+    shots: int
+        A mask of every cell that has been shot
+
+    sunk: int
+        Bit i is set once ship i of the layout is sunk
+
+    hash: int
+        The Zobrist hash of the shots, hits and sunk ships, the same as
+        Board.hash after the same shots
+
+    Methods
+    -------
+    fromBoard(board): BoardState
+        Takes the current state of a board
+
+    shoot(shot): tuple[BoardState, str]
+        Shoots the specified location and reports the new state and result
+
+    isShot(pos): bool
+        Checks if the position has been shot
+
+    isGameOver(): bool
+        Checks if every ship is sunk
+
+    sunkShips(): list[Ship]
+        Gets the ships that are sunk
+
+    toBoard(boardType): Board
+        Builds a board in this state
+    '''
+
+    __slots__ = ('layout', 'shots', 'sunk', 'hash')
+
+    def __init__(self, layout: Layout, shots: int = 0, sunk: int = 0, hash: int = 0):
+        '''
+        Constructs all the necesarry attributes for the BoardState object
+
+        Parameters
+        ----------
+        layout: Layout
+            The ships of the board
+
+        shots: int
+            A mask of every cell that has been shot
+
+        sunk: int
+            Bit i is set once ship i of the layout is sunk
+
+        hash: int
+            The Zobrist hash of the state
+        '''
+        self.layout = layout
+        self.shots = shots
+        self.sunk = sunk
+        self.hash = hash
+
+    def __repr__(self) -> str:
+        '''
+        Displays a string representation of the BoardState Object
+        '''
+        return f'{self.layout.size}x{self.layout.size} state, {self.shots.bit_count()} shots, '\
+            f'{self.sunk.bit_count()} of {len(self.layout.ships)} ships sunk'
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, BoardState) and self.shots == other.shots\
+            and self.layout.shipMasks == other.layout.shipMasks
+
+    def __hash__(self) -> int:
+        return self.hash
+
+    @classmethod
+    def fromBoard(cls, board: Board) -> 'BoardState':
+        '''
+        Takes the current state of a board
+
+        Parameters
+        ----------
+        board: Board
+            The board, of any engine
+
+        Returns
+        -------
+        BoardState: A state with the ships and shots of the board
+        '''
+        layout = Layout(board.ships, board.size)
+        size = board.size
+        shots = 0
+        sunk = 0
+
+        for y in range(size):
+            for x in range(size):
+                if board.isShot((x, y)):
+                    shots |= 1 << (y * size + x)
+
+        for i, ship in enumerate(board.ships):
+            if ship.isSunk():
+                sunk |= 1 << i
+
+        return cls(layout, shots, sunk, board.hash)
+
+    def shoot(self, shot: tuple[int, int] | str) -> tuple['BoardState', str]:
+        '''
+        Shoots the specified location and reports the new state and result
+
+        Parameters
+        ----------
+        shot: tuple[int, int]
+            The position of the shot in (x, y)
+        shot: str
+            The position of the shot as a string (e.g. B4)
+
+        Returns
+        -------
+        BoardState: The state after the shot, this state if it was SAME
+        str: The result, as returned by Board.shoot
+
+        Raises
+        ------
+        OutOfBoundsException: The shot is out of bounds of the board
+        '''
+        if isinstance(shot, str):
+            shot = strToPoint(shot)
+
+        layout = self.layout
+        size = layout.size
+
+        if not (0 <= shot[0] < size and 0 <= shot[1] < size):
+            raise OutOfBoundsException
+
+        cell = shot[1] * size + shot[0]
+        bit = 1 << cell
+
+        if self.shots & bit:
+            return self, 'SAME'
+
+        shots = self.shots | bit
+
+        if not layout.fleet & bit:
+            return BoardState(layout, shots, self.sunk, self.hash ^ layout.missKeys[cell]), 'MISS'
+
+        i = layout.shipIndex[cell]
+        value = self.hash ^ layout.hitKeys[cell]
+
+        if layout.shipMasks[i] & ~shots:
+            return BoardState(layout, shots, self.sunk, value), 'HIT'
+
+        value ^= shipKey(layout.ships[i].name)
+        return BoardState(layout, shots, self.sunk | 1 << i, value), 'SUNK'
+
+    def isShot(self, pos: tuple[int, int]) -> bool:
+        '''
+        Checks if the position has been shot
+
+        Parameters
+        ----------
+        pos: tuple[int, int]
+            The position in (x, y)
+
+        Returns
+        -------
+        bool: True if the position has been shot
+        '''
+        return self.shots >> (pos[1] * self.layout.size + pos[0]) & 1 == 1
+
+    def isGameOver(self) -> bool:
+        '''
+        Checks if every ship is sunk
+
+        Returns
+        -------
+        bool: True if the game is over
+        '''
+        return not self.layout.fleet & ~self.shots
+
+    def sunkShips(self) -> list[Ship]:
+        '''
+        Gets the ships that are sunk
+
+        Returns
+        -------
+        list[Ship]: The sunk ships of the layout, which are never shot
+        '''
+        return [ship for i, ship in enumerate(self.layout.ships) if self.sunk >> i & 1]
+
+    def toBoard(self, boardType: type[Board] = Board) -> Board:
+        '''
+        Builds a board in this state
+
+        Parameters
+        ----------
+        boardType: type[Board]
+            The board engine to build
+
+        Returns
+        -------
+        Board: A new board with the ships and shots of the state
+        '''
+        layout = self.layout
+        size = layout.size
+        board = boardType(size)
+
+        for ship in layout.ships:
+            board.addShip(Ship(ship.name, ship.start, ship.stop))
+
+        shots = self.shots
+        while shots:
+            low = shots & -shots
+            cell = low.bit_length() - 1
+            board.shoot((cell % size, cell // size))
+            shots ^= low
+
+        return board
@@ -0,0 +1,73 @@
+'''
+File: cellIndexBench.py
+Auth: Blake Wingard - bats23456789@gmail.com
+Date: 10/18/2026
+Desc: Compares BoardScene.getCellIndex with the scan over every cell it replaced.
+
+Run from src. Set QT_QPA_PLATFORM=offscreen to run without a display.
+'''
+import random
+import sys
+import timeit
+from PyQt6.QtWidgets import QApplication
+from PyQt6.QtCore import QPointF
+from BoardModal import BoardScene
+from battleship import Board
+
+
+def scanCellIndex(scene: BoardScene, point: QPointF) -> int:
+    '''
+    Get the index of a cell that contains the point by checking every cell
+
+    This is the original implementation of BoardScene.getCellIndex.
+
+    Parameters
+    ----------
+    scene: BoardScene
+        The scene holding the cells
+
+    point: QPointF
+        The point used for finding the cell
+
+    Returns
+    -------
+    int: The index of the cell, or -1
+    '''
+    for i, cell in enumerate(scene.cells):
+        x = [cell.pos().x(), cell.pos().x() + cell.rect().width()]
+        y = [cell.pos().y(), cell.pos().y() + cell.rect().height()]
+        if x[0] <= point.x() <= x[1] and y[0] <= point.y() <= y[1] and not cell.border:
+            return i
+
+    return -1
+
+
+def main():
+    app = QApplication(sys.argv)
+
+    for size in (550, 2200):
+        scene = BoardScene(Board(), 0, 0, size, size)
+        rng = random.Random(0)
+        points = [QPointF(rng.uniform(-10, size + 10), rng.uniform(-10, size + 10))
+                  for i in range(1000)]
+
+        # The two could only differ on the exact edge shared by two cells, which
+        # random points never land on, so they must agree on every point
+        for point in points:
+            assert scanCellIndex(scene, point) == scene.getCellIndex(point)
+
+        scan = min(timeit.repeat(lambda: [scanCellIndex(scene, p) for p in points],
+                                 number=5, repeat=3)) / 5000
+        direct = min(timeit.repeat(lambda: [scene.getCellIndex(p) for p in points],
+                                   number=5, repeat=3)) / 5000
+
+        print(f'{size}px  scan: {scan * 1e6:.2f}us  direct: {direct * 1e6:.2f}us  '
+              f'({scan / direct:.0f}x)')
+
+    del app
+
+    return 0
+
+
+if __name__ == '__main__':
+    main()
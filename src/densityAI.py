@@ -0,0 +1,368 @@
+'''
+File: densityAI.py
+Auth: Blake Wingard - bats23456789@gmail.com
+Date: 10/18/2026
+Desc: A probability density targeting computer opponent.
+
+Every turn the AI counts the placements of each ship still afloat that
+agree with the misses, hits and sunk ships seen so far and fires at the
+cell covered by the most placements. All placements of every length are
+precomputed as rows of a single matrix so a turn is a few matrix products.
+
+The AI keeps a Zobrist hash of what it knows, and the densities are kept
+in DENSITY_CACHE by that hash. Opening turns reach the same states in
+game after game, so they are looked up instead of counted again.
+'''
+import random
+from collections.abc import Generator
+from functools import lru_cache
+import numpy as np
+from battleship import STANDARD_FLEET
+from zobrist import TranspositionCache, cellKeys, shipKey
+
+# How much more a placement counts for each unresolved hit it covers
+HIT_WEIGHT = 50.0
+
+# The densities of recently seen states, shared by every DensityAI
+DENSITY_CACHE = TranspositionCache(4096)
+
+
+@lru_cache
+def placementMasks(length: int) -> np.ndarray:
+    '''
+    Gets every placement of a ship on the board
+
+    Parameters
+    ----------
+    length: int
+        The length of the ship
+
+    Returns
+    -------
+    np.ndarray: A (placements, 100) array with a 1 for every covered cell
+    '''
+    masks = []
+
+    for y in range(10):
+        for x in range(10 - length + 1):
+            mask = np.zeros(100, np.float32)
+            mask[y * 10 + x:y * 10 + x + length] = 1
+            masks.append(mask)
+
+    for y in range(10 - length + 1):
+        for x in range(10):
+            mask = np.zeros(100, np.float32)
+            mask[y * 10 + x:(y + length) * 10 + x:10] = 1
+            masks.append(mask)
+
+    masks = np.array(masks)
+    masks.flags.writeable = False
+    return masks
+
+
+def fleetKey(lengths: list[int]) -> int:
+    '''
+    Gets the Zobrist key of the ships still afloat
+
+    Parameters
+    ----------
+    lengths: list[int]
+        The lengths of the ships still afloat
+
+    Returns
+    -------
+    int: The 64 bit key
+    '''
+    key = 0
+
+    for i, length in enumerate(sorted(lengths)):
+        key ^= shipKey(f'{i}:{length}')
+
+    return key
+
+
+class DensityAI:
+    '''
+    A class to represent a probability density targeting opponent.
+
+    Attributes
+    ----------
+    remaining: list[int]
+        The lengths of the ships still afloat
+
+    shot: np.ndarray
+        True for every cell that has been shot
+
+    misses: np.ndarray
+        True for every cell that was a miss
+
+    hits: np.ndarray
+        True for every hit cell not yet known to be on a sunk ship
+
+    sunk: np.ndarray
+        True for every cell taken to be on a sunk ship
+
+    fleet: list[int]
+        The lengths of the opposing fleet
+
+    sinks: list[int]
+        The cell of every shot that sank a ship
+
+    hash: int
+        The Zobrist hash of the cells and the ships still afloat. A cell
+        on a sunk ship has both its hit key and its miss key, as it blocks
+        placements like a miss
+
+    Methods
+    -------
+    observe(shot, result)
+        Records the result of a shot
+
+    density(): np.ndarray
+        Counts the placements covering each cell
+
+    nextShot(rng): tuple[int, int]
+        Picks the cell most likely to hold a ship
+    '''
+
+    def __init__(self, lengths: list[int] | None = None):
+        '''
+        Constructs all the necesarry attributes for the DensityAI object
+
+        Parameters
+        ----------
+        lengths: list[int] | None
+            The lengths of the opposing fleet, the standard fleet if None
+        '''
+        if lengths is None:
+            lengths = [length for name, length in STANDARD_FLEET]
+
+        self.remaining = sorted(lengths, reverse=True)
+        self.shot = np.zeros(100, bool)
+        self.misses = np.zeros(100, bool)
+        self.hits = np.zeros(100, bool)
+        self.sunk = np.zeros(100, bool)
+        self.fleet = sorted(lengths, reverse=True)
+        self.sinks = []
+        self.hash = fleetKey(self.remaining)
+        self.missKeys, self.hitKeys = cellKeys()
+
+        self.masks = np.concatenate([placementMasks(length) for length in set(lengths)])
+        self.lengths = np.concatenate([np.full(len(placementMasks(length)), length)
+                                       for length in set(lengths)])
+
+    def observe(self, shot: tuple[int, int], result: str):
+        '''
+        Records the result of a shot
+
+        Parameters
+        ----------
+        shot: tuple[int, int]
+            The position of the shot in (x, y)
+
+        result: str
+            The result returned by Board.shoot
+        '''
+        cell = shot[1] * 10 + shot[0]
+        self.shot[cell] = True
+
+        match(result):
+            case 'MISS':
+                self.misses[cell] = True
+                self.hash ^= self.missKeys[cell]
+            case 'HIT':
+                self.hits[cell] = True
+                self.hash ^= self.hitKeys[cell]
+            case 'SUNK':
+                self.hits[cell] = True
+                self.hash ^= self.hitKeys[cell]
+                self.resolveSunk(cell)
+
+    def resolveSunk(self, cell: int):
+        '''
+        Works out which ship was sunk by the shot at cell
+
+        The ships sunk so far are worked out again with the new one, as a
+        guess made for an earlier ship may no longer fit.
+
+        Parameters
+        ----------
+        cell: int
+            The cell of the shot that sank a ship
+        '''
+        self.sinks.append(cell)
+        self.resolve()
+
+    def resolve(self):
+        '''
+        Works out which ship was sunk by each shot that sank one
+
+        A sunk ship is placed over hits through the cell of its shot,
+        trying the longest ships first. The first placement of every sunk
+        ship that still explains the unresolved hits is kept, so a guess
+        that stops fitting is replaced by the next one.
+        '''
+        self.hits = self.shot & ~self.misses
+        self.sunk = np.zeros(100, bool)
+        self.remaining = list(self.fleet)
+
+        # A sunk ship lies only on hits and through the cell of its shot
+        onHits = np.flatnonzero(self.masks @ self.hits == self.lengths)
+        onHits = onHits[np.argsort(-self.lengths[onHits], kind='stable')]
+        candidates = [onHits[self.masks[onHits, cell] > 0] for cell in self.sinks]
+
+        placed = next(self.place(candidates, 0), None)
+
+        if placed is None:
+            # Nothing fits, so only the shot cells are known to be sunk
+            self.sunk[self.sinks] = True
+            self.remaining = self.fleet[:len(self.fleet) - len(self.sinks)]
+        else:
+            self.sunk, self.remaining = placed
+
+        self.hits &= ~self.sunk
+
+        self.hash = fleetKey(self.remaining)
+        for i in np.flatnonzero(self.misses | self.sunk):
+            self.hash ^= self.missKeys[i]
+        for i in np.flatnonzero(self.shot & ~self.misses):
+            self.hash ^= self.hitKeys[i]
+
+    def place(self, candidates: list[np.ndarray],
+              sink: int) -> Generator[tuple[np.ndarray, list[int]], None, None]:
+        '''
+        Places the ship sunk by each shot from sinks[sink] on in every way,
+        longest ships first
+
+        Parameters
+        ----------
+        candidates: list[np.ndarray]
+            The placements that could be the ship sunk by each of sinks
+
+        sink: int
+            The index in sinks of the first ship not yet placed
+
+        Yields
+        ------
+        tuple[np.ndarray, list[int]]: The sunk cells and the lengths still
+        afloat of every placement that explains the unresolved hits
+        '''
+        if sink == len(self.sinks):
+            if self.explains():
+                yield self.sunk.copy(), list(self.remaining)
+            return
+
+        for candidate in candidates[sink]:
+            length = int(self.lengths[candidate])
+            placed = self.masks[candidate] > 0
+            if length not in self.remaining or (self.sunk & placed).any():
+                continue
+
+            self.hits &= ~placed
+            self.sunk |= placed
+            self.remaining.remove(length)
+
+            yield from self.place(candidates, sink + 1)
+
+            self.remaining.append(length)
+            self.remaining.sort(reverse=True)
+            self.sunk &= ~placed
+            self.hits |= placed
+
+    def explains(self) -> bool:
+        '''
+        Checks that the ships still afloat can cover every unresolved hit
+
+        Returns
+        -------
+        bool: True if each unresolved hit has a placement of a ship still
+        afloat through it that misses every miss and sunk ship
+        '''
+        if not self.hits.any():
+            return True
+
+        counts = np.bincount(self.remaining, minlength=self.lengths.max() + 1)
+
+        blocked = (self.misses | self.sunk).astype(np.float32)
+        valid = ((self.masks @ blocked) == 0) * counts[self.lengths].astype(np.float32)
+
+        return bool((valid @ self.masks[:, self.hits]).all())
+
+    def density(self) -> np.ndarray:
+        '''
+        Counts the placements covering each cell
+
+        Placements over a miss or a sunk ship are ruled out, and placements
+        through unresolved hits are weighted by HIT_WEIGHT per hit.
+
+        Returns
+        -------
+        np.ndarray: The weighted count for each of the 100 cells, shared
+        with DENSITY_CACHE so it cannot be written to
+        '''
+        density = DENSITY_CACHE.get(self.hash)
+        if density is not None:
+            return density
+
+        counts = np.bincount(self.remaining, minlength=self.lengths.max() + 1)
+
+        blocked = (self.misses | self.sunk).astype(np.float32)
+        hits = self.hits.astype(np.float32)
+
+        valid = (self.masks @ blocked) == 0
+        weights = valid * counts[self.lengths] * (1 + HIT_WEIGHT * (self.masks @ hits))
+
+        density = weights.astype(np.float32) @ self.masks
+        density[self.shot] = 0
+        density.flags.writeable = False
+
+        DENSITY_CACHE.put(self.hash, density)
+        return density
+
+    def nextShot(self, rng: random.Random) -> tuple[int, int]:
+        '''
+        Picks the cell most likely to hold a ship
+
+        Parameters
+        ----------
+        rng: random.Random
+            Breaks ties between equally likely cells
+
+        Returns
+        -------
+        tuple[int, int]: The position to shoot in (x, y)
+        '''
+        # A guess about a sunk ship that no longer fits is made again, so the
+        # unresolved hits are never left for a random shot
+        if self.hits.any() and not self.explains():
+            self.resolve()
+
+        density = self.density()
+        best = np.flatnonzero(density == density.max())
+
+        if density.max() == 0:
+            best = np.flatnonzero(~self.shot)
+
+        cell = int(best[rng.randrange(len(best))])
+        return (cell % 10, cell // 10)
+
+
+def densityStrategy(rng: random.Random) -> Generator[tuple[int, int], str, None]:
+    '''
+    Shoots using a DensityAI
+
+    Parameters
+    ----------
+    rng: random.Random
+        The source of randomness
+
+    Yields
+    ------
+    tuple[int, int]: The next shot in (x, y)
+    '''
+    ai = DensityAI()
+
+    while not ai.shot.all():
+        shot = ai.nextShot(rng)
+        result = yield shot
+        ai.observe(shot, result)
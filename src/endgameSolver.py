@@ -0,0 +1,525 @@
+'''
+File: endgameSolver.py
+Auth: Blake Wingard - bats23456789@gmail.com
+Date: 10/18/2026
+Desc: An exact solver for the last shots of a game.
+
+Once only a ship or two is afloat, every way the hidden ships could lie
+can be listed. The solver takes that list, each entry equally likely,
+and finds the shot that minimizes the expected number of shots left to
+sink every ship. A fleet listed more than once, as FleetSampler does for
+each way of explaining the SUNKs, is that much more likely.
+
+A state is the fleets still possible, as a bitmask over the list, and
+the cells shot among them. Shooting a cell splits the fleets by the
+result they would give: MISS, HIT or SUNK. When the opponent names the
+ship it sank, SUNK also tells which ship went down, so it splits the
+fleets by the length of that ship as well. The expected shots of every
+state are memoized, so states reached by different orders of shots are
+only solved once.
+
+The search is branch and bound. Every unshot cell of a fleet still has
+to be shot, and the shots before the next hit can only hit as many
+fleets as the most covered cells, which bounds a state from below. A
+result of a shot is only solved as far as it could still make the shot
+the best, and a state cut off early is memoized with its bound.
+'''
+
+# Only ships still afloat are listed, and only when there are this few
+ENDGAME_SHIPS = 2
+
+# The most fleets the solver is used for, beyond this the AI samples. The
+# search grows quickly with the fleets, 12 keeps a move within MOVE_BUDGET
+ENDGAME_THRESHOLD = 12
+
+
+class EndgameSolver:
+    '''
+    A class to represent the exact solver of an endgame.
+
+    Cell (x, y) is bit y * 10 + x of every mask.
+
+    Attributes
+    ----------
+    fleets: list[tuple[tuple[int, ...], tuple[int, ...]]]
+        Every fleet still possible, as the lengths and masks of its ships,
+        each listed once
+
+    weights: list[int]
+        The number of times each fleet was listed
+
+    uniform: bool
+        True if every fleet was listed once
+
+    index: dict[tuple[tuple[int, ...], tuple[int, ...]], int]
+        The index of each fleet in fleets
+
+    shots: int
+        A mask of every cell shot when the solver was made
+
+    named: bool
+        True if a SUNK tells the length of the ship sunk
+
+    fleetMasks: list[int]
+        The cells covered by each fleet
+
+    cover: list[int]
+        For each cell, the fleets covering it as a bitmask over fleets
+
+    shipCover: list[int]
+        For each cell, the ships covering it, bit i * width + j for ship j
+        of fleet i
+
+    width: int
+        The most ships in a fleet
+
+    shipBits: int
+        A mask of the width ship bits of one fleet
+
+    memo: dict[tuple[int, int], tuple[float, bool]]
+        The expected shots of every state solved, by fleets and shots, and
+        False if only a lower bound was found
+
+    Methods
+    -------
+    fits(fleets): bool
+        Checks if a list of fleets can be solved by the solver
+
+    weigh(fleets): int
+        Counts the fleets, each as many times as it was listed
+
+    outcomes(fleets, shots, cell): dict[str | int, int]
+        Splits the fleets by the result of a shot
+
+    expected(fleets, shots, cap): float
+        Solves the expected shots left from a state
+
+    measure(fleets, shots): tuple[int, int, int]
+        Measures the fleets of a state
+
+    missBound(fleets, shots, union, count): float
+        Bounds the expected misses before the next hit from below
+
+    lowerBound(fleets, shots): float
+        Bounds the expected shots left from a state from below
+
+    bestShot(fleets, shots, union, bound, count, cap): tuple[float, int]
+        Finds the shot with the fewest expected shots left from a state
+
+    solve(fleets, shots): tuple[float, tuple[int, int]]
+        Finds the best shot of a state
+    '''
+
+    def __init__(self, fleets: list[tuple[tuple[int, ...], tuple[int, ...]]], shots: int,
+                 named: bool = False):
+        '''
+        Constructs all the necesarry attributes for the EndgameSolver object
+
+        Parameters
+        ----------
+        fleets: list[tuple[tuple[int, ...], tuple[int, ...]]]
+            Every fleet still possible, as the lengths and masks of its
+            ships still afloat, listed once for each way it can happen
+
+        shots: int
+            A mask of every cell shot
+
+        named: bool
+            True if a SUNK tells the length of the ship sunk
+        '''
+        self.index = {}
+        self.fleets = []
+        self.weights = []
+
+        for fleet in fleets:
+            if fleet in self.index:
+                self.weights[self.index[fleet]] += 1
+            else:
+                self.index[fleet] = len(self.fleets)
+                self.fleets.append(fleet)
+                self.weights.append(1)
+
+        self.uniform = len(self.fleets) == len(fleets)
+        self.shots = shots
+        self.named = named
+        self.memo = {}
+        self.fleetMasks = []
+        self.cover = [0] * 100
+        self.shipCover = [0] * 100
+        self.width = max(len(masks) for lengths, masks in self.fleets)
+        self.shipBits = (1 << self.width) - 1
+
+        for i, (lengths, masks) in enumerate(self.fleets):
+            fleetMask = 0
+            for j, mask in enumerate(masks):
+                fleetMask |= mask
+                shipBit = 1 << (i * self.width + j)
+                cells = mask & ~shots
+                while cells:
+                    low = cells & -cells
+                    self.shipCover[low.bit_length() - 1] |= shipBit
+                    cells ^= low
+            self.fleetMasks.append(fleetMask)
+
+            bit = 1 << i
+            cells = fleetMask & ~shots
+            while cells:
+                low = cells & -cells
+                self.cover[low.bit_length() - 1] |= bit
+                cells ^= low
+
+    def fits(self, fleets: list[tuple[tuple[int, ...], tuple[int, ...]]]) -> bool:
+        '''
+        Checks if a list of fleets can be solved by the solver
+
+        Parameters
+        ----------
+        fleets: list[tuple[tuple[int, ...], tuple[int, ...]]]
+            The fleets still possible, as given to the constructor
+
+        Returns
+        -------
+        bool: True if every fleet is listed by the solver, as many times
+        '''
+        counts = {}
+        for fleet in fleets:
+            counts[fleet] = counts.get(fleet, 0) + 1
+
+        return all(fleet in self.index and self.weights[self.index[fleet]] == count
+                   for fleet, count in counts.items())
+
+    def weigh(self, fleets: int) -> int:
+        '''
+        Counts the fleets, each as many times as it was listed
+
+        Parameters
+        ----------
+        fleets: int
+            The fleets, as a bitmask over the list
+
+        Returns
+        -------
+        int: The total weight of the fleets
+        '''
+        if self.uniform:
+            return fleets.bit_count()
+
+        total = 0
+        while fleets:
+            low = fleets & -fleets
+            total += self.weights[low.bit_length() - 1]
+            fleets ^= low
+
+        return total
+
+    def outcomes(self, fleets: int, shots: int, cell: int) -> dict[str | int, int]:
+        '''
+        Splits the fleets by the result of a shot
+
+        Parameters
+        ----------
+        fleets: int
+            The fleets still possible, as a bitmask over the list
+
+        shots: int
+            A mask of every cell shot
+
+        cell: int
+            The cell shot, not yet in shots
+
+        Returns
+        -------
+        dict[str | int, int]: The fleets giving each result. SUNK is keyed
+        by the length of the ship sunk when ships are named
+        '''
+        bit = 1 << cell
+        covered = fleets & self.cover[cell]
+        results = {}
+
+        if fleets & ~covered:
+            results['MISS'] = fleets & ~covered
+
+        shots |= bit
+        rest = covered
+        while rest:
+            low = rest & -rest
+            i = low.bit_length() - 1
+            rest ^= low
+
+            lengths, masks = self.fleets[i]
+            for length, mask in zip(lengths, masks):
+                if mask & bit:
+                    if mask & ~shots:
+                        key = 'HIT'
+                    else:
+                        key = length if self.named else 'SUNK'
+                    results[key] = results.get(key, 0) | low
+                    break
+
+        return results
+
+    def expected(self, fleets: int, shots: int, cap: float = float('inf')) -> float:
+        '''
+        Solves the expected shots left from a state
+
+        Only answers below cap are needed. When the state cannot do better
+        than cap, the search stops early and a lower bound of at least cap
+        is returned and memoized as a bound instead.
+
+        Parameters
+        ----------
+        fleets: int
+            The fleets still possible, as a bitmask over the list
+
+        shots: int
+            A mask of every cell shot
+
+        cap: float
+            The answer only matters if it is below this
+
+        Returns
+        -------
+        float: The fewest expected shots to sink every ship, or a lower
+        bound of it that is at least cap
+        '''
+        union, left, count = self.measure(fleets, shots)
+
+        if left == 0:
+            return 0.0
+
+        key = (fleets, shots & union)
+        if key in self.memo:
+            value, exact = self.memo[key]
+            if exact or value >= cap:
+                return value
+
+        bound = left / count
+        value = bound + self.missBound(fleets, shots, union, count)
+
+        if value < cap:
+            value = self.bestShot(fleets, shots, union, bound, count, cap)[0]
+
+        self.memo[key] = (value, value < cap)
+        return value
+
+    def measure(self, fleets: int, shots: int) -> tuple[int, int, int]:
+        '''
+        Measures the fleets of a state
+
+        Parameters
+        ----------
+        fleets: int
+            The fleets still possible, as a bitmask over the list
+
+        shots: int
+            A mask of every cell shot
+
+        Returns
+        -------
+        int: The cells covered by any of the fleets
+        int: The unshot cells of the fleets, summed over the fleets
+        int: The weight of the fleets
+        '''
+        union = 0
+        left = 0
+        count = 0
+
+        while fleets:
+            low = fleets & -fleets
+            i = low.bit_length() - 1
+            union |= self.fleetMasks[i]
+            left += (self.fleetMasks[i] & ~shots).bit_count() * self.weights[i]
+            fleets ^= low
+            count += self.weights[i]
+
+        return union, left, count
+
+    def missBound(self, fleets: int, shots: int, union: int, count: int) -> float:
+        '''
+        Bounds the expected misses before the next hit from below
+
+        The first k shots can hit at most the fleets covering the k most
+        covered cells, so they all miss at least as often as the rest.
+
+        Parameters
+        ----------
+        fleets: int
+            The fleets still possible, as a bitmask over the list
+
+        shots: int
+            A mask of every cell shot
+
+        union: int
+            The cells covered by any of the fleets
+
+        count: int
+            The weight of the fleets, see weigh
+
+        Returns
+        -------
+        float: The lower bound on the expected misses
+        '''
+        covers = []
+        cells = union & ~shots
+        while cells:
+            low = cells & -cells
+            covers.append(self.weigh(fleets & self.cover[low.bit_length() - 1]))
+            cells ^= low
+
+        covers.sort(reverse=True)
+        misses = 0.0
+        hit = 0
+
+        for covered in covers:
+            hit += covered
+            if hit >= count:
+                break
+            misses += 1 - hit / count
+
+        return misses
+
+    def lowerBound(self, fleets: int, shots: int) -> float:
+        '''
+        Bounds the expected shots left from a state from below
+
+        Every fleet must still have each of its unshot cells shot, as well
+        as the misses before the next hit.
+
+        Parameters
+        ----------
+        fleets: int
+            The fleets still possible, as a bitmask over the list
+
+        shots: int
+            A mask of every cell shot
+
+        Returns
+        -------
+        float: The lower bound on the expected shots left
+        '''
+        union, left, count = self.measure(fleets, shots)
+
+        if left == 0:
+            return 0.0
+
+        return left / count + self.missBound(fleets, shots, union, count)
+
+    def bestShot(self, fleets: int, shots: int, union: int, bound: float, count: int,
+                 cap: float = float('inf')) -> tuple[float, int]:
+        '''
+        Finds the shot with the fewest expected shots left from a state
+
+        Shots are tried from the most likely hit down. A shot hitting with
+        probability p lowers the bound by at most p, so once that cannot
+        beat the best found the rest are skipped. The results of a shot
+        are solved most likely first, each only as far as it can still
+        make the shot the best.
+
+        Parameters
+        ----------
+        fleets: int
+            The fleets still possible, as a bitmask over the list
+
+        shots: int
+            A mask of every cell shot
+
+        union: int
+            The cells covered by any of the fleets
+
+        bound: float
+            The average number of unshot cells of the fleets
+
+        count: int
+            The weight of the fleets, see weigh
+
+        cap: float
+            The answer only matters if it is below this
+
+        Returns
+        -------
+        float: The expected shots left after taking the best shot, or cap
+        if no shot does better
+        int: The cell of the best shot
+        '''
+        # Cells on the same ship of every fleet can be swapped, so one is tried
+        spread = 0
+        rest = fleets
+        while rest:
+            low = rest & -rest
+            spread |= self.shipBits << (self.width * (low.bit_length() - 1))
+            rest ^= low
+
+        options = {}
+        cells = union & ~shots
+        while cells:
+            low = cells & -cells
+            cell = low.bit_length() - 1
+            cells ^= low
+            options.setdefault(self.shipCover[cell] & spread, (fleets & self.cover[cell], cell))
+
+        order = sorted(((self.weigh(covered), cell) for covered, cell in options.values()),
+                       reverse=True)
+
+        best = cap
+        bestCell = order[0][1]
+
+        for covered, cell in order:
+            if 1 + bound - covered / count >= best:
+                break
+
+            after = shots | 1 << cell
+            splits = sorted(((self.weigh(split) / count, split)
+                             for split in self.outcomes(fleets, shots, cell).values()),
+                            reverse=True)
+            bounds = [weight * self.lowerBound(split, after) for weight, split in splits]
+            value = 1 + sum(bounds)
+
+            for (weight, split), splitBound in zip(splits, bounds):
+                if value >= best:
+                    break
+                solved = self.expected(split, after, (best - value + splitBound) / weight)
+                value += weight * solved - splitBound
+
+            if value < best:
+                best = value
+                bestCell = cell
+
+        return best, bestCell
+
+    def solve(self, fleets: list[tuple[tuple[int, ...], tuple[int, ...]]] | None = None,
+              shots: int | None = None) -> tuple[float, tuple[int, int]]:
+        '''
+        Finds the best shot of a state
+
+        States are memoized across calls, so after a shot every result of
+        it is already solved and the next shot comes from the memo.
+
+        Parameters
+        ----------
+        fleets: list[tuple[tuple[int, ...], tuple[int, ...]]] | None
+            The fleets still possible, all of them in the list, or every
+            fleet if None
+
+        shots: int | None
+            A mask of every cell shot, or the shots the solver was made
+            with if None
+
+        Returns
+        -------
+        float: The expected shots left, the best shot included
+        tuple[int, int]: The best shot in (x, y)
+        '''
+        if fleets is None:
+            state = (1 << len(self.fleets)) - 1
+        else:
+            state = 0
+            for fleet in fleets:
+                state |= 1 << self.index[fleet]
+
+        if shots is None:
+            shots = self.shots
+
+        union, left, count = self.measure(state, shots)
+
+        value, cell = self.bestShot(state, shots, union, left / count, count)
+        return value, (cell % 10, cell // 10)
@@ -0,0 +1,514 @@
+'''
+File: gameLog.py
+Auth: Blake Wingard - bats23456789@gmail.com
+Date: 10/18/2026
+Desc: An append-only binary log of battleship games.
+
+Every placement, removal and shot on a board is written as one fixed
+width 16 byte record (little endian):
+
+    game   uint32   The id of the game
+    kind   uint8    PLACE, REMOVE, SHOT or NAME
+    board  uint8    The board written to (the player who owns it)
+    code   uint8    PLACE: the ship type, SHOT: the result
+    ship   uint8    SHOT: the type of the ship at the position, NO_SHIP
+                    if none, otherwise: the low byte of the index of the
+                    ship in Board.ships
+    a-d    uint16   PLACE: x0, y0, x1, y1
+                    SHOT: the low 16 bits of the turn, x, y, the high
+                    16 bits of the turn
+                    REMOVE: the rest of the index, bits 8-23 and 24-39, 0, 0
+
+Ship types are the index of the name in STANDARD_FLEET. Any other name is
+written as CUSTOM_SHIP, after NAME records holding the name 8 bytes at a
+time in a-d. The turn of a shot counts the shots fired at its board, so
+turn 0 is the first shot of its player. It starts over from 0 after 2^32
+shots. Every shot record can be used on its own, without the records
+before it (see analytics.py).
+
+Positions are uint16, so only boards of at most MAX_SIZE rows and cols
+can be recorded. This is checked when the recorder is created, so a shot
+is never stopped by the log.
+
+A PLACE always adds the last ship of its board, and its NAME records come
+right before it, so the low byte is enough to tell them apart. Only a
+REMOVE needs the whole index.
+
+Game ids go up from the highest id already in the log, so a log appended
+to by several runs of the server keeps every game apart.
+
+A log is read back by memory-mapping it as a numpy structured array, so
+only the records of the games that are replayed become Python objects.
+'''
+import mmap
+import struct
+from battleship import Board, Ship, STANDARD_FLEET
+
+PLACE = 1
+REMOVE = 2
+SHOT = 3
+NAME = 4
+
+RESULTS = ('MISS', 'HIT', 'SUNK', 'SAME')
+RESULT_CODES = {result: code for code, result in enumerate(RESULTS)}
+
+SHIP_TYPES = tuple(name for name, length in STANDARD_FLEET)
+SHIP_CODES = {name: code for code, name in enumerate(SHIP_TYPES)}
+CUSTOM_SHIP = 255
+NO_SHIP = 254
+
+# The largest board whose positions fit in a record
+MAX_SIZE = 1 << 16
+
+RECORD = struct.Struct('<IBBBBHHHH')
+RECORD_SIZE = RECORD.size
+# The numpy dtype of a record. numpy is only imported to read a log, so
+# starting a new one does not slow down the start of the server.
+RECORD_FIELDS = [('game', '<u4'), ('kind', 'u1'), ('board', 'u1'),
+                 ('code', 'u1'), ('ship', 'u1'), ('a', '<u2'),
+                 ('b', '<u2'), ('c', '<u2'), ('d', '<u2')]
+
+
+class GameLog:
+    '''
+    A class to represent an append-only log being written.
+
+    Records are packed into a buffer and appended to the file whenever the
+    buffer fills, so the file only ever holds whole records.
+
+    Attributes
+    ----------
+    path: str
+        The path of the log file
+
+    file: BinaryIO
+        The log file, opened for appending
+
+    buffer: bytearray
+        The records waiting to be written
+
+    count: int
+        The number of records in the buffer
+
+    nextGame: int
+        One more than the highest game id in the log when it was opened
+
+    Methods
+    -------
+    write(game, kind, board, code, ship, a, b, c, d)
+        Appends a single record
+
+    recorder(game, board, size): BoardRecorder
+        Creates a recorder writing the moves of a board to the log
+
+    flush()
+        Writes the buffered records to the file
+
+    close()
+        Flushes and closes the log
+    '''
+
+    def __init__(self, path: str, bufferRecords: int = 4096):
+        '''
+        Constructs all the necesarry attributes for the GameLog object
+
+        Parameters
+        ----------
+        path: str
+            The path of the log file, created if it does not exist
+
+        bufferRecords: int
+            The number of records buffered before writing to the file
+        '''
+        self.path = path
+        self.file = open(path, 'ab')
+        self.buffer = bytearray(bufferRecords * RECORD_SIZE)
+        self.count = 0
+        self.nextGame = 0
+
+        if self.file.tell() >= RECORD_SIZE:
+            with LogReader(path) as reader:
+                self.nextGame = int(reader.records['game'].max()) + 1
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def write(self, game: int, kind: int, board: int, code: int, ship: int,
+              a: int = 0, b: int = 0, c: int = 0, d: int = 0):
+        '''
+        Appends a single record
+
+        Parameters
+        ----------
+        game: int
+            The id of the game
+
+        kind: int
+            PLACE, REMOVE, SHOT or NAME
+
+        board: int
+            The board written to
+
+        code: int
+            The ship type or result
+
+        ship: int
+            The index of the ship
+
+        a, b, c, d: int
+            The positions of the record
+        '''
+        RECORD.pack_into(self.buffer, self.count * RECORD_SIZE,
+                         game, kind, board, code, ship, a, b, c, d)
+        self.count += 1
+
+        if self.count * RECORD_SIZE == len(self.buffer):
+            self.flush()
+
+    def recorder(self, game: int, board: int, size: int = 10) -> 'BoardRecorder':
+        '''
+        Creates a recorder writing the moves of a board to the log
+
+        Parameters
+        ----------
+        game: int
+            The id of the game
+
+        board: int
+            The number of the board in the game
+
+        size: int
+            The number of rows and cols on the board
+
+        Returns
+        -------
+        BoardRecorder: The recorder to set as Board.recorder
+
+        Raises
+        ------
+        ValueError: The positions of the board do not fit in a record
+        '''
+        if not 0 < size <= MAX_SIZE:
+            raise ValueError(f'a log only records boards of 1 to {MAX_SIZE} rows and cols')
+
+        return BoardRecorder(self, game, board)
+
+    def flush(self):
+        '''
+        Writes the buffered records to the file
+        '''
+        if self.count:
+            self.file.write(memoryview(self.buffer)[:self.count * RECORD_SIZE])
+            self.count = 0
+        self.file.flush()
+
+    def close(self):
+        '''
+        Flushes and closes the log
+        '''
+        if not self.file.closed:
+            self.flush()
+            self.file.close()
+
+
+class BoardRecorder:
+    '''
+    A class to represent the recorder of a single board.
+
+    Boards call the recorder set as their recorder attribute after every
+    successful addShip, removeShip and shot.
+
+    Attributes
+    ----------
+    log: GameLog
+        The log written to
+
+    game: int
+        The id of the game
+
+    board: int
+        The number of the board in the game
+
+    turn: int
+        The number of shots fired at the board
+
+    Methods
+    -------
+    place(board, ship)
+        Records a ship added to the board
+
+    remove(board, index)
+        Records a ship removed from the board
+
+    shot(board, pos, result)
+        Records a shot at the board
+    '''
+
+    def __init__(self, log: GameLog, game: int, board: int):
+        '''
+        Constructs all the necesarry attributes for the BoardRecorder object
+
+        Parameters
+        ----------
+        log: GameLog
+            The log written to
+
+        game: int
+            The id of the game
+
+        board: int
+            The number of the board in the game
+        '''
+        self.log = log
+        self.game = game
+        self.board = board
+        self.turn = 0
+
+    def place(self, board: Board, ship: Ship):
+        '''
+        Records a ship added to the board
+
+        Parameters
+        ----------
+        board: Board
+            The board the ship was added to
+
+        ship: Ship
+            The ship added, which is the last ship of the board
+        '''
+        index = (len(board.ships) - 1) & 0xFF
+        code = SHIP_CODES.get(ship.name, CUSTOM_SHIP)
+
+        if code == CUSTOM_SHIP:
+            name = ship.name.encode()
+            for i in range(0, len(name), 8):
+                chunk = name[i:i + 8].ljust(8, b'\0')
+                self.log.write(self.game, NAME, self.board, 0, index,
+                               *struct.unpack('<4H', chunk))
+
+        self.log.write(self.game, PLACE, self.board, code, index,
+                       *ship.start, *ship.stop)
+
+    def remove(self, board: Board, index: int):
+        '''
+        Records a ship removed from the board
+
+        Parameters
+        ----------
+        board: Board
+            The board the ship was removed from
+
+        index: int
+            The index the ship had in Board.ships
+        '''
+        self.log.write(self.game, REMOVE, self.board, 0, index & 0xFF,
+                       index >> 8 & 0xFFFF, index >> 24 & 0xFFFF)
+
+    def shot(self, board: Board, pos: tuple[int, int], result: str):
+        '''
+        Records a shot at the board
+
+        Parameters
+        ----------
+        board: Board
+            The board shot
+
+        pos: tuple[int, int]
+            The position of the shot in (x, y)
+
+        result: str
+            The result of the shot
+        '''
+        ship = board.getShipAtPos(pos)
+        code = NO_SHIP if ship is None else SHIP_CODES.get(ship.name, CUSTOM_SHIP)
+
+        self.log.write(self.game, SHOT, self.board, RESULT_CODES[result], code,
+                       self.turn & 0xFFFF, pos[0], pos[1], self.turn >> 16)
+        self.turn = (self.turn + 1) & 0xFFFFFFFF
+
+
+class RecorderGroup:
+    '''
+    A class to represent several recorders set on one board.
+
+    Attributes
+    ----------
+    recorders: list
+        The recorders told about every change, in order
+    '''
+
+    def __init__(self, *recorders):
+        '''
+        Constructs all the necesarry attributes for the RecorderGroup object
+
+        Parameters
+        ----------
+        *recorders
+            The recorders told about every change
+        '''
+        self.recorders = list(recorders)
+
+    def place(self, board: Board, ship: Ship):
+        for recorder in self.recorders:
+            recorder.place(board, ship)
+
+    def remove(self, board: Board, index: int):
+        for recorder in self.recorders:
+            recorder.remove(board, index)
+
+    def shot(self, board: Board, pos: tuple[int, int], result: str):
+        for recorder in self.recorders:
+            recorder.shot(board, pos, result)
+
+
+class LogReader:
+    '''
+    A class to represent a memory-mapped game log.
+
+    Attributes
+    ----------
+    path: str
+        The path of the log file
+
+    dtype: np.dtype
+        The numpy dtype of a record
+
+    records: np.ndarray
+        Every whole record in the log, as a dtype array backed by
+        the mapped file
+
+    Methods
+    -------
+    games(): np.ndarray
+        Gets the id of every game in the log
+
+    gameRecords(game): np.ndarray
+        Gets the records of a single game
+
+    replay(game, turn, boardType, size): list[Board]
+        Rebuilds the boards of a game
+    '''
+
+    def __init__(self, path: str):
+        '''
+        Constructs all the necesarry attributes for the LogReader object
+
+        Parameters
+        ----------
+        path: str
+            The path of the log file
+        '''
+        import numpy as np
+
+        self.path = path
+        self.map = None
+        self.dtype = np.dtype(RECORD_FIELDS)
+
+        with open(path, 'rb') as file:
+            size = file.seek(0, 2)
+            if size >= RECORD_SIZE:
+                self.map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self.map is None:
+            self.records = np.empty(0, self.dtype)
+        else:
+            self.records = np.frombuffer(self.map, self.dtype, size // RECORD_SIZE)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self):
+        return len(self.records)
+
+    def close(self):
+        '''
+        Releases the mapped file
+        '''
+        self.records = self.records[:0].copy()
+        if self.map is not None:
+            self.map.close()
+            self.map = None
+
+    def games(self) -> 'np.ndarray':
+        '''
+        Gets the id of every game in the log
+
+        Returns
+        -------
+        np.ndarray: The sorted ids
+        '''
+        import numpy as np
+
+        return np.unique(self.records['game'])
+
+    def gameRecords(self, game: int) -> 'np.ndarray':
+        '''
+        Gets the records of a single game
+
+        Parameters
+        ----------
+        game: int
+            The id of the game
+
+        Returns
+        -------
+        np.ndarray: The records of the game in the order they were written
+        '''
+        return self.records[self.records['game'] == game]
+
+    def replay(self, game: int, turn: int | None = None, boardType: type[Board] = Board,
+               size: int = 10) -> list[Board]:
+        '''
+        Rebuilds the boards of a game
+
+        Parameters
+        ----------
+        game: int
+            The id of the game
+
+        turn: int | None
+            Only shots before this turn of each board are replayed, every
+            shot if None
+
+        boardType: type[Board]
+            The board engine to rebuild
+
+        size: int
+            The number of rows and cols on the boards
+
+        Returns
+        -------
+        list[Board]: The boards of the game, indexed by board number
+        '''
+        boards = []
+        names = {}
+
+        for record in self.gameRecords(game).tolist():
+            kind, number, code, ship, a, b, c, d = record[1:]
+
+            while len(boards) <= number:
+                boards.append(boardType(size))
+            board = boards[number]
+
+            if kind == SHOT:
+                if turn is None or a | d << 16 < turn:
+                    board.shoot((b, c))
+            elif kind == PLACE:
+                if code == CUSTOM_SHIP:
+                    name = names.pop((number, ship)).rstrip(b'\0').decode()
+                else:
+                    name = SHIP_TYPES[code]
+                board.addShip(Ship(name, (a, b), (c, d)))
+            elif kind == REMOVE:
+                board.removeShip(board.ships[ship | a << 8 | b << 24].name)
+            elif kind == NAME:
+                names[number, ship] = names.get((number, ship), b'')\
+                    + struct.pack('<4H', a, b, c, d)
+
+        return boards
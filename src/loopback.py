@@ -0,0 +1,277 @@
+'''
+File: loopback.py
+Auth: Blake Wingard - bats23456789@gmail.com
+Date: 10/18/2026
+Desc: A loopback harness measuring the throughput and latency of server.py.
+'''
+import argparse
+import asyncio
+import random
+import time
+import protocol
+from server import GameServer
+
+FLEET = [
+    ('A1', 'A5', 'Carrier'),
+    ('C1', 'C4', 'Battleship'),
+    ('E1', 'E3', 'Destroyer'),
+    ('G1', 'G3', 'Submarine'),
+    ('I1', 'I2', 'Patrol Boat'),
+]
+
+
+class LoopbackClient:
+    '''
+    A class to represent a scripted client playing one side of a match.
+
+    Attributes
+    ----------
+    latencies: list[float]
+        The round trip time of every shot in seconds
+
+    Methods
+    -------
+    play(port, matchId, seed)
+        Plays a full match against the server
+    '''
+
+    def __init__(self, binary: bool = False):
+        '''
+        Constructs all the necesarry attributes for the LoopbackClient object
+
+        Parameters
+        ----------
+        binary: bool
+            True to shoot using the binary protocol
+        '''
+        self.binary = binary
+        self.latencies = []
+        self.reader = None
+        self.writer = None
+
+    async def send(self, line: str) -> str:
+        '''
+        Sends a command and waits for the first line of the reply
+
+        Parameters
+        ----------
+        line: str
+            The command to send
+
+        Returns
+        -------
+        str: The first line of the reply
+        '''
+        self.writer.write(line.encode() + b'\n')
+        return await self.receive()
+
+    async def receive(self) -> str:
+        '''
+        Waits for the next line from the server
+
+        Returns
+        -------
+        str: The line received without the line ending
+        '''
+        return (await self.reader.readline()).decode().rstrip('\n')
+
+    async def play(self, port: int, matchId: str, seed: int):
+        '''
+        Plays a full match against the server
+
+        Parameters
+        ----------
+        port: int
+            The port of the server on the loopback interface
+
+        matchId: str
+            The match to join
+
+        seed: int
+            The seed for the order of the shots
+        '''
+        self.reader, self.writer = await asyncio.open_connection('127.0.0.1', port)
+
+        await self.send(f'JOIN {matchId}')
+        for start, stop, name in FLEET:
+            await self.send(f'SHIP {start} {stop} {name}')
+        await self.send('READY')
+
+        shots = list(range(100))
+        random.Random(seed).shuffle(shots)
+
+        if self.binary:
+            await self.playBinary(shots)
+        else:
+            await self.playText(shots)
+
+        self.writer.close()
+
+    async def playText(self, shots: list[int]):
+        '''
+        Shoots using the line protocol until the match is over
+
+        Parameters
+        ----------
+        shots: list[int]
+            The cells to shoot, last first
+        '''
+        sunk = 0
+        while (line := await self.receive()) not in ('', 'LOSE', 'LEFT'):
+            if line != 'TURN':
+                continue
+
+            start = time.perf_counter()
+            result = await self.send(f'SHOT {protocol.cellToText(shots.pop())}')
+            self.latencies.append(time.perf_counter() - start)
+
+            if result.startswith('SUNK'):
+                sunk += 1
+
+            # Every client uses the same fleet, so the last sink is followed by WIN
+            if sunk == len(FLEET):
+                await self.receive()
+                break
+
+        self.writer.write(b'QUIT\n')
+        await self.writer.drain()
+
+    async def playBinary(self, shots: list[int]):
+        '''
+        Switches to the binary protocol and shoots until the match is over
+
+        Parameters
+        ----------
+        shots: list[int]
+            The cells to shoot, last first
+        '''
+        self.writer.write(b'BINARY\n')
+
+        isTurn = False
+        while (line := await self.receive()) != 'OK':
+            isTurn = isTurn or line == 'TURN'
+
+        frame = bytearray(protocol.OPPONENT_SIZE)
+        view = memoryview(frame)
+        sunk = 0
+
+        while True:
+            if not isTurn:
+                header = await self.reader.readexactly(1)
+                view[0] = header[0]
+                view[1:view[0] + 1] = await self.reader.readexactly(view[0])
+                msgType = protocol.frameType(view, 0)
+                if msgType == protocol.STATUS:
+                    status = protocol.STATUSES[protocol.decodeStatus(view, 0)]
+                    if status in ('LOSE', 'LEFT'):
+                        break
+                    isTurn = status == 'TURN'
+                continue
+
+            start = time.perf_counter()
+            self.writer.write(frame[:protocol.encodeShot(view, 0, shots.pop())])
+            result = await self.reader.readexactly(protocol.RESULT_SIZE)
+            self.latencies.append(time.perf_counter() - start)
+
+            isTurn = False
+            if protocol.decodeResult(result, 0)[0] == protocol.RESULT_CODES['SUNK']:
+                sunk += 1
+
+            # Every client uses the same fleet, so the last sink is followed by WIN
+            if sunk == len(FLEET):
+                await self.reader.readexactly(protocol.STATUS_SIZE)
+                break
+
+
+def percentile(values: list[float], p: float) -> float:
+    '''
+    Gets a percentile of values
+
+    Parameters
+    ----------
+    values: list[float]
+        The sorted values
+
+    p: float
+        The percentile between 0 and 100
+
+    Returns
+    -------
+    float: The value at the percentile
+    '''
+    return values[min(len(values) - 1, int(len(values) * p / 100))]
+
+
+async def run(matches: int, seed: int, binary: bool = False,
+              port: int | None = None) -> dict[str, float]:
+    '''
+    Runs many matches at once against a server on the loopback interface
+
+    Parameters
+    ----------
+    matches: int
+        The number of concurrent matches
+
+    seed: int
+        The seed for the order of the shots
+
+    binary: bool
+        True to shoot using the binary protocol
+
+    port: int | None
+        The port of a server already running on the loopback interface,
+        None to start a GameServer in this process
+
+    Returns
+    -------
+    dict[str, float]: The throughput and latency of the run
+    '''
+    server = None
+    if port is None:
+        server = GameServer()
+        port = await server.start()
+
+    clients = [LoopbackClient(binary) for i in range(matches * 2)]
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client.play(port, f'match{i // 2}', seed + i)
+                           for i, client in enumerate(clients)))
+    elapsed = time.perf_counter() - start
+
+    if server is not None:
+        await server.close()
+
+    latencies = sorted(latency for client in clients for latency in client.latencies)
+
+    return {
+        'matches': matches,
+        'shots': len(latencies),
+        'seconds': elapsed,
+        'shotsPerSecond': len(latencies) / elapsed,
+        'p50': percentile(latencies, 50),
+        'p99': percentile(latencies, 99),
+        'p999': percentile(latencies, 99.9),
+        'max': latencies[-1],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure the match server over loopback.')
+    parser.add_argument('--matches', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--binary', action='store_true', help='shoot using the binary protocol')
+    parser.add_argument('--port', type=int, help='play against a server already running on this port')
+    args = parser.parse_args()
+
+    stats = asyncio.run(run(args.matches, args.seed, args.binary, args.port))
+
+    print(f'{stats["matches"]} matches, {stats["shots"]} shots in {stats["seconds"]:.2f}s')
+    print(f'{stats["shotsPerSecond"]:.0f} shots/s')
+    for key in ('p50', 'p99', 'p999', 'max'):
+        print(f'{key}: {stats[key] * 1000:.2f}ms')
+
+    return 0
+
+
+if __name__ == '__main__':
+    main()
@@ -6,26 +6,27 @@ Desc: The main entry point for the project.
 '''
 from battleship import Board
 from battleship import Ship
+from battleship import rowToLetters
+import argparse
 import battleship
-from gameView import GameView
 import sys
-from PyQt6.QtWidgets import QApplication
 
 
-def parseInput():
+def parseInput(size: int = 10):
     done = False
     while not done:
-        data = input()
-        if (len(data) != 2 and len(data) != 3):
-            print('Please enter in the letter-number format. Ex. B4')
-        elif not data[0].isalpha() or not data[1:].isnumeric():
+        data = input().strip()
+        try:
+            pos = battleship.strToPoint(data)
+        except ValueError:
             print('Please enter in the letter-number format. Ex. B4')
-        elif 'A' > data[0] or data[0] > 'J':
-            print('Letter is out of range. Can only be between "A" and "J"')
-        elif int(data[1:]) < 0 or int(data[1:]) > 10:
-            print('Number is out of range. Can only be between "1" and "10"')
+            continue
+
+        if pos[1] >= size:
+            print(f'Letter is out of range. Can only be between "A" and "{rowToLetters(size - 1)}"')
+        elif not 0 <= pos[0] < size:
+            print(f'Number is out of range. Can only be between "1" and "{size}"')
         else:
-            pos = (int(data[1:] - 1, ord(data[0].upper()) - ord('A')))
             done = True
 
     return pos
@@ -141,41 +142,62 @@ class Grid:
         self.h = 100
 
 
-def main():
-    # player1 = setupPlayer('Player 1')
+def playConsole(quick: bool = False) -> int:
+    '''
+    Plays a game between two players at the console
+
+    Parameters
+    ----------
+    quick: bool
+        True to give both players the quickSetup fleet
+
+    Returns
+    -------
+    int: The exit code
+    '''
+    player1 = quickSetup() if quick else setupPlayer('Player 1')
+    player2 = quickSetup() if quick else setupPlayer('Player 2')
+    gameOver = False
+    turnPlayer = 1
+
+    while not gameOver:
+        if turnPlayer == 1:
+            print('Player 1\'s turn')
+            attemptShot(player2)
+            turnPlayer = 2
+        else:
+            print('Player 2\'s turn')
+            attemptShot(player1)
+            turnPlayer = 1
+        print()
+
+        gameOver = player1.isGameOver() or player2.isGameOver()
+
+    if player1.isGameOver():
+        print('Player 2 Wins!')
+    else:
+        print('Player 1 Wins!')
+
+    return 0
+
+
+def playGui() -> int:
+    '''
+    Shows the board of a player in the GUI
+
+    Qt is imported here, so the console and server never load it.
+
+    Returns
+    -------
+    int: The exit code
+    '''
+    from PyQt6.QtWidgets import QApplication
+    from gameView import GameView
+
     player1 = quickSetup()
-    # player2 = setupPlayer('Player 2')
-    # gameOver = False
-    # turnPlayer = 1
-    #
+
     print('Player 1:')
     print(player1)
-    #
-    # print()
-    #
-    # print('Player 2:')
-    # print(player2)
-    #
-    # print()
-    #
-    # while not gameOver:
-    #
-    #     if turnPlayer == 1:
-    #         print('Player 1\'s turn')
-    #         attemptShot(player2)
-    #         turnPlayer = 2
-    #     else:
-    #         print('Player 2\'s turn')
-    #         attemptShot(player1)
-    #         turnPlayer = 1
-    #     print()
-    #
-    #     gameOver = player1.isGameOver() or player2.isGameOver()
-    #
-    # if player1.isGameOver():
-    #     print('Player 2 Wins!')
-    # else:
-    #     print('Player 1 Wins!')
 
     app = QApplication(sys.argv)
 
@@ -187,5 +209,31 @@ def main():
     return 0
 
 
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description='Play battleship.')
+    modes = parser.add_subparsers(dest='mode', metavar='{gui,console,server,shards}')
+    modes.add_parser('gui', help='show the board in a window (the default)')
+    console = modes.add_parser('console', help='play two players at the console')
+    console.add_argument('--quick', action='store_true', help='skip placing ships')
+    modes.add_parser('server', add_help=False, help='host matches, see server.py --help')
+    modes.add_parser('shards', add_help=False,
+                     help='host matches on every core, see shardServer.py --help')
+    args, rest = parser.parse_known_args(argv)
+
+    match(args.mode):
+        case 'server':
+            import server
+            return server.main(rest)
+        case 'shards':
+            import shardServer
+            return shardServer.main(rest)
+        case 'console' if not rest:
+            return playConsole(args.quick)
+        case 'gui' | None if not rest:
+            return playGui()
+
+    parser.error(f'unrecognized arguments: {" ".join(rest)}')
+
+
 if __name__ == '__main__':
-    main()
+    sys.exit(main())
@@ -0,0 +1,579 @@
+'''
+File: matchStore.py
+Auth: Blake Wingard - bats23456789@gmail.com
+Date: 10/18/2026
+Desc: A SQLite store of matches, fleets and shots.
+
+The database is opened in WAL mode. Writes are queued by the recorders
+set on the boards and a background thread commits them in batches, one
+transaction per batch, so a shot only costs putting a tuple on a queue.
+Reads use their own connection, which WAL lets run alongside the writer.
+
+A batch that fails is rolled back and its statements are written again
+one at a time, so one bad write only loses itself. The error is raised
+by the next flush.
+
+Match ids are given by SQLite when the writer inserts the match, so
+stores in several processes sharing a database never give out the same
+id. A match that was still being played when the process stopped can be
+rebuilt from its id with loadBoard, see unfinished.
+'''
+import queue
+import sqlite3
+import threading
+import time
+from itertools import groupby
+from battleship import Board, Ship
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS matches (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    salvo INTEGER NOT NULL,
+    created REAL NOT NULL,
+    winner INTEGER
+);
+CREATE INDEX IF NOT EXISTS matchNames ON matches (name, id);
+CREATE TABLE IF NOT EXISTS ships (
+    match INTEGER NOT NULL,
+    player INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    x0 INTEGER NOT NULL,
+    y0 INTEGER NOT NULL,
+    x1 INTEGER NOT NULL,
+    y1 INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS shipBoards ON ships (match, player);
+CREATE TABLE IF NOT EXISTS shots (
+    match INTEGER NOT NULL,
+    player INTEGER NOT NULL,
+    turn INTEGER NOT NULL,
+    x INTEGER NOT NULL,
+    y INTEGER NOT NULL,
+    result TEXT NOT NULL,
+    PRIMARY KEY (match, player, turn)
+) WITHOUT ROWID;
+'''
+
+INSERT_MATCH = 'INSERT INTO matches VALUES (NULL, ?, ?, ?, ?, NULL)'
+END_MATCH = 'UPDATE matches SET winner = ? WHERE id = ?'
+INSERT_SHIP = 'INSERT INTO ships VALUES (?, ?, ?, ?, ?, ?, ?)'
+DELETE_SHIP = '''DELETE FROM ships WHERE rowid = (
+    SELECT rowid FROM ships WHERE match = ? AND player = ? ORDER BY rowid LIMIT 1 OFFSET ?)'''
+INSERT_SHOT = 'INSERT INTO shots VALUES (?, ?, ?, ?, ?, ?)'
+
+# Written as the winner of a match that ended because a player left
+NO_WINNER = -1
+
+
+def connect(path: str) -> sqlite3.Connection:
+    '''
+    Opens the database in WAL mode, creating the tables if needed
+
+    Parameters
+    ----------
+    path: str
+        The path of the database
+
+    Returns
+    -------
+    sqlite3.Connection: The connection
+    '''
+    connection = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+    connection.execute('PRAGMA journal_mode=WAL')
+    connection.execute('PRAGMA synchronous=NORMAL')
+    connection.executescript(SCHEMA)
+    return connection
+
+
+class MatchStore:
+    '''
+    A class to represent a SQLite store of matches.
+
+    Attributes
+    ----------
+    path: str
+        The path of the database
+
+    reader: sqlite3.Connection
+        The connection used for reads
+
+    writes: queue.SimpleQueue
+        The statements waiting to be written, as (sql, params), with None
+        to stop the writer, a threading.Event to be set once everything
+        before it is committed or an Insert that needs its rowid back
+
+    batchSize: int
+        The most statements committed in one transaction
+
+    writer: threading.Thread
+        The thread committing the writes
+
+    error: sqlite3.Error | None
+        The last write that failed, until flush raises it
+
+    Methods
+    -------
+    newMatch(name, size, salvo): int
+        Saves a new match
+
+    endMatch(match, winner)
+        Saves the winner of a match
+
+    recorder(match, player): StoreRecorder
+        Creates a recorder saving the moves of a board
+
+    flush()
+        Waits until every queued write is committed, raising any error
+
+    loadBoard(match, player, boardType): Board
+        Rebuilds the board of a player in a saved match
+
+    unfinished(): list[tuple[int, str]]
+        Gets every match without a winner
+
+    close()
+        Commits every queued write and closes the store
+    '''
+
+    def __init__(self, path: str, batchSize: int = 4096):
+        '''
+        Constructs all the necesarry attributes for the MatchStore object
+
+        Parameters
+        ----------
+        path: str
+            The path of the database, created if it does not exist
+
+        batchSize: int
+            The most statements committed in one transaction
+        '''
+        self.path = path
+        self.reader = connect(path)
+        self.writes = queue.SimpleQueue()
+        self.batchSize = batchSize
+        self.error = None
+        self.writer = threading.Thread(target=self.writeBatches, name='MatchStore', daemon=True)
+        self.writer.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def writeBatches(self):
+        '''
+        Commits the queued writes in batches until the store is closed
+
+        Runs on the writer thread. It blocks for the first write of a batch,
+        then takes whatever else is already queued, up to batchSize.
+        Everything queued before an Insert or an Event is committed before
+        it is run or set.
+        '''
+        connection = connect(self.path)
+        running = True
+
+        while running:
+            batch = [self.writes.get()]
+            while len(batch) < self.batchSize:
+                try:
+                    batch.append(self.writes.get_nowait())
+                except queue.Empty:
+                    break
+
+            running = None not in batch
+            statements = []
+
+            for item in batch:
+                if isinstance(item, tuple):
+                    statements.append(item)
+                    continue
+
+                self.commit(connection, statements)
+                statements = []
+
+                if isinstance(item, Insert):
+                    item.run(connection)
+                elif isinstance(item, threading.Event):
+                    item.set()
+
+            self.commit(connection, statements)
+
+        connection.close()
+
+    def commit(self, connection: sqlite3.Connection, statements: list[tuple[str, tuple]]):
+        '''
+        Writes statements in a single transaction
+
+        Runs on the writer thread. If the transaction fails it is rolled
+        back and every statement is written again on its own.
+
+        Parameters
+        ----------
+        connection: sqlite3.Connection
+            The connection of the writer
+
+        statements: list[tuple[str, tuple]]
+            The statements to write, as (sql, params)
+        '''
+        if not statements:
+            return
+
+        # Runs of the same statement are written with one executemany
+        try:
+            connection.execute('BEGIN')
+            for sql, run in groupby(statements, key=lambda item: item[0]):
+                connection.executemany(sql, [params for sql, params in run])
+            connection.execute('COMMIT')
+        except sqlite3.Error:
+            if connection.in_transaction:
+                connection.execute('ROLLBACK')
+
+            # The batch holds writes of unrelated matches, so each is tried on its own
+            for sql, params in statements:
+                try:
+                    connection.execute(sql, params)
+                except sqlite3.Error as e:
+                    self.error = e
+
+    def newMatch(self, name: str, size: int = 10, salvo: bool = False) -> int:
+        '''
+        Saves a new match
+
+        The match is inserted by the writer, after every write already
+        queued, and SQLite gives it its id. This waits for the writer.
+
+        Parameters
+        ----------
+        name: str
+            The id players joined the match with
+
+        size: int
+            The number of rows and cols on the boards
+
+        salvo: bool
+            True if the match is played in salvo mode
+
+        Returns
+        -------
+        int: The id of the match in the store
+
+        Raises
+        ------
+        sqlite3.Error: The match could not be inserted
+        '''
+        insert = Insert(INSERT_MATCH, (name, size, int(salvo), time.time()))
+        self.writes.put(insert)
+        return insert.wait()
+
+    def endMatch(self, match: int, winner: int | None):
+        '''
+        Saves the winner of a match
+
+        Parameters
+        ----------
+        match: int
+            The id of the match in the store
+
+        winner: int | None
+            The player that won, None if a player left
+        '''
+        self.writes.put((END_MATCH, (NO_WINNER if winner is None else winner, match)))
+
+    def recorder(self, match: int, player: int) -> 'StoreRecorder':
+        '''
+        Creates a recorder saving the moves of a board
+
+        The turns of its shots follow the shots already saved for the
+        board, so a board rebuilt with loadBoard keeps its saved shots.
+        Shots still queued are not counted, flush first if the board was
+        recorded by another recorder of this store.
+
+        Parameters
+        ----------
+        match: int
+            The id of the match in the store
+
+        player: int
+            The player owning the board
+
+        Returns
+        -------
+        StoreRecorder: The recorder to set as Board.recorder
+        '''
+        turn = self.reader.execute(
+            'SELECT COALESCE(MAX(turn), -1) + 1 FROM shots WHERE match = ? AND player = ?',
+            (match, player)).fetchone()[0]
+        return StoreRecorder(self, match, player, turn)
+
+    def flush(self):
+        '''
+        Waits until every queued write is committed
+
+        Raises
+        ------
+        sqlite3.Error: A write failed since the last flush, every other
+        write was still committed
+        '''
+        done = threading.Event()
+        self.writes.put(done)
+        done.wait()
+
+        if self.error is not None:
+            error, self.error = self.error, None
+            raise error
+
+    def loadBoard(self, match: int, player: int, boardType: type[Board] = Board) -> Board:
+        '''
+        Rebuilds the board of a player in a saved match
+
+        Parameters
+        ----------
+        match: int
+            The id of the match in the store, as given by newMatch or
+            unfinished
+
+        player: int
+            The player owning the board
+
+        boardType: type[Board]
+            The board engine to rebuild
+
+        Returns
+        -------
+        Board: The board with every saved ship and shot
+
+        Raises
+        ------
+        KeyError: No match has the id
+        '''
+        self.flush()
+
+        row = self.reader.execute('SELECT size FROM matches WHERE id = ?', (match,)).fetchone()
+        if row is None:
+            raise KeyError(match)
+
+        board = boardType(row[0])
+
+        for shipName, x0, y0, x1, y1 in self.reader.execute(
+                'SELECT name, x0, y0, x1, y1 FROM ships WHERE match = ? AND player = ? '
+                'ORDER BY rowid', (match, player)):
+            board.addShip(Ship(shipName, (x0, y0), (x1, y1)))
+
+        for x, y in self.reader.execute(
+                'SELECT x, y FROM shots WHERE match = ? AND player = ? ORDER BY turn',
+                (match, player)):
+            board.shoot((x, y))
+
+        return board
+
+    def unfinished(self) -> list[tuple[int, str]]:
+        '''
+        Gets every match without a winner
+
+        Returns
+        -------
+        list[tuple[int, str]]: The id and name of each match
+        '''
+        self.flush()
+        return self.reader.execute('SELECT id, name FROM matches WHERE winner IS NULL').fetchall()
+
+    def close(self):
+        '''
+        Commits every queued write and closes the store
+        '''
+        if self.writer.is_alive():
+            self.writes.put(None)
+            self.writer.join()
+        self.reader.close()
+
+
+class Insert:
+    '''
+    A class to represent an insert whose rowid is needed back from the writer.
+
+    Attributes
+    ----------
+    sql: str
+        The statement to run
+
+    params: tuple
+        The parameters of the statement
+
+    done: threading.Event
+        Set once the insert was run
+
+    rowid: int | None
+        The rowid given by SQLite, None until the insert is run
+
+    error: sqlite3.Error | None
+        The error of the insert, if it failed
+
+    Methods
+    -------
+    run(connection)
+        Runs the insert and wakes the waiting thread
+
+    wait(): int
+        Waits for the insert to be run
+    '''
+
+    def __init__(self, sql: str, params: tuple):
+        '''
+        Constructs all the necesarry attributes for the Insert object
+
+        Parameters
+        ----------
+        sql: str
+            The statement to run
+
+        params: tuple
+            The parameters of the statement
+        '''
+        self.sql = sql
+        self.params = params
+        self.done = threading.Event()
+        self.rowid = None
+        self.error = None
+
+    def run(self, connection: sqlite3.Connection):
+        '''
+        Runs the insert in its own transaction and wakes the waiting thread
+
+        Parameters
+        ----------
+        connection: sqlite3.Connection
+            The connection of the writer
+        '''
+        try:
+            self.rowid = connection.execute(self.sql, self.params).lastrowid
+        except sqlite3.Error as e:
+            self.error = e
+
+        self.done.set()
+
+    def wait(self) -> int:
+        '''
+        Waits for the insert to be run
+
+        Returns
+        -------
+        int: The rowid given by SQLite
+
+        Raises
+        ------
+        sqlite3.Error: The insert failed
+        '''
+        self.done.wait()
+
+        if self.error is not None:
+            raise self.error
+
+        return self.rowid
+
+
+class StoreRecorder:
+    '''
+    A class to represent the recorder saving a single board to a store.
+
+    Boards call the recorder set as their recorder attribute after every
+    successful addShip, removeShip and shot.
+
+    Attributes
+    ----------
+    store: MatchStore
+        The store written to
+
+    match: int
+        The id of the match in the store
+
+    player: int
+        The player owning the board
+
+    turn: int
+        The number of shots fired at the board
+
+    Methods
+    -------
+    place(board, ship)
+        Saves a ship added to the board
+
+    remove(board, index)
+        Deletes a ship removed from the board
+
+    shot(board, pos, result)
+        Saves a shot at the board
+    '''
+
+    def __init__(self, store: MatchStore, match: int, player: int, turn: int = 0):
+        '''
+        Constructs all the necesarry attributes for the StoreRecorder object
+
+        Parameters
+        ----------
+        store: MatchStore
+            The store written to
+
+        match: int
+            The id of the match in the store
+
+        player: int
+            The player owning the board
+
+        turn: int
+            The turn of the next shot, the number of shots already saved
+        '''
+        self.store = store
+        self.match = match
+        self.player = player
+        self.turn = turn
+
+    def place(self, board: Board, ship: Ship):
+        '''
+        Saves a ship added to the board
+
+        Parameters
+        ----------
+        board: Board
+            The board the ship was added to
+
+        ship: Ship
+            The ship added
+        '''
+        self.store.writes.put((INSERT_SHIP, (self.match, self.player, ship.name,
+                                             *ship.start, *ship.stop)))
+
+    def remove(self, board: Board, index: int):
+        '''
+        Deletes a ship removed from the board
+
+        Parameters
+        ----------
+        board: Board
+            The board the ship was removed from
+
+        index: int
+            The index the ship had in Board.ships
+        '''
+        self.store.writes.put((DELETE_SHIP, (self.match, self.player, index)))
+
+    def shot(self, board: Board, pos: tuple[int, int], result: str):
+        '''
+        Saves a shot at the board
+
+        Parameters
+        ----------
+        board: Board
+            The board shot
+
+        pos: tuple[int, int]
+            The position of the shot in (x, y)
+
+        result: str
+            The result of the shot
+        '''
+        self.store.writes.put((INSERT_SHOT, (self.match, self.player, self.turn,
+                                             pos[0], pos[1], result)))
+        self.turn += 1
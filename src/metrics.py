@@ -0,0 +1,529 @@
+'''
+File: metrics.py
+Auth: Blake Wingard - bats23456789@gmail.com
+Date: 10/18/2026
+Desc: Counters and latency histograms for the hot paths of the game.
+
+Nothing is measured until enable() is called. It wraps the instrumented
+methods in place, and disable() puts the originals back, so a disabled
+registry costs nothing at all.
+
+The instrumented methods are:
+    shoot and shootMany of every board engine, counted by result and
+    timed per shot
+    addShip of every board engine, and Ship, counting rejected placements
+    by exception
+    BoardScene.eventFilter, BoardScene.repaintCells and Cell.paint, timed,
+    when BoardModal has been imported before enable()
+
+Snapshots are exported as JSON or in the Prometheus text format.
+'''
+import json
+import os
+import sys
+import time
+from bisect import bisect_left
+from functools import wraps
+from battleship import Board, Ship
+from battleship import OutOfBoundsException, OverlapException, InvalidPlacementException
+from bitBoard import BitBoard
+from sparseBoard import SparseBoard
+
+ENGINES = (Board, BitBoard, SparseBoard)
+
+# The upper bounds of the latency buckets in seconds
+LATENCY_BUCKETS = (1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4,
+                   5e-4, 1e-3, 2.5e-3, 5e-3, 1e-2, 2.5e-2, 5e-2, 0.1)
+
+
+class Counter:
+    '''
+    A class to represent a count that only goes up.
+
+    Attributes
+    ----------
+    value: int
+        The count
+    '''
+    __slots__ = ('value',)
+
+    def __init__(self):
+        '''
+        Constructs all the necesarry attributes for the Counter object
+        '''
+        self.value = 0
+
+    def inc(self, amount: int = 1):
+        '''
+        Adds to the count
+
+        Parameters
+        ----------
+        amount: int
+            The amount to add
+        '''
+        self.value += amount
+
+
+class Histogram:
+    '''
+    A class to represent a distribution of observed values.
+
+    Attributes
+    ----------
+    buckets: tuple[float, ...]
+        The upper bound of every bucket, in increasing order
+
+    counts: list[int]
+        The observations in each bucket, plus the ones above every bound
+
+    sum: float
+        The total of every observation
+
+    count: int
+        The number of observations
+    '''
+    __slots__ = ('buckets', 'counts', 'sum', 'count')
+
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS):
+        '''
+        Constructs all the necesarry attributes for the Histogram object
+
+        Parameters
+        ----------
+        buckets: tuple[float, ...]
+            The upper bound of every bucket, in increasing order
+        '''
+        self.buckets = buckets
+        self.counts = [0 for i in range(len(buckets) + 1)]
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        '''
+        Adds an observation
+
+        Parameters
+        ----------
+        value: float
+            The value observed
+        '''
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> list[tuple[float, int]]:
+        '''
+        Gets the number of observations up to each bound
+
+        Returns
+        -------
+        list[tuple[float, int]]: Every bound, ending with infinity, and the
+        observations at or below it
+        '''
+        total = 0
+        result = []
+
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            total += count
+            result.append((bound, total))
+
+        return result
+
+
+class Registry:
+    '''
+    A class to represent a set of named metrics.
+
+    A metric is identified by its name and labels, so one name can hold a
+    metric for each value of a label (e.g. one counter per result).
+
+    Attributes
+    ----------
+    metrics: dict[tuple[str, tuple[tuple[str, str], ...]], Counter | Histogram]
+        Every metric, keyed by name and sorted labels
+
+    help: dict[str, str]
+        The description of each name
+
+    Methods
+    -------
+    counter(name, help, **labels): Counter
+        Gets or creates a counter
+
+    histogram(name, help, buckets, **labels): Histogram
+        Gets or creates a histogram
+
+    snapshot(): dict
+        Gets the value of every metric
+
+    toJson(): str
+        Exports every metric as JSON
+
+    toPrometheus(): str
+        Exports every metric in the Prometheus text format
+    '''
+
+    def __init__(self):
+        '''
+        Constructs all the necesarry attributes for the Registry object
+        '''
+        self.metrics = {}
+        self.help = {}
+
+    def get(self, kind: type, name: str, help: str, labels: dict[str, str], *args):
+        '''
+        Gets or creates a metric
+
+        Parameters
+        ----------
+        kind: type
+            Counter or Histogram
+
+        name: str
+            The name of the metric
+
+        help: str
+            The description of the name
+
+        labels: dict[str, str]
+            The labels of the metric
+
+        args: Any
+            Passed to kind when the metric is created
+
+        Returns
+        -------
+        Counter | Histogram: The metric
+        '''
+        key = (name, tuple(sorted(labels.items())))
+        metric = self.metrics.get(key)
+
+        if metric is None:
+            metric = self.metrics[key] = kind(*args)
+            self.help.setdefault(name, help)
+
+        return metric
+
+    def counter(self, name: str, help: str = '', **labels: str) -> Counter:
+        '''
+        Gets or creates a counter
+
+        Parameters
+        ----------
+        name: str
+            The name of the counter
+
+        help: str
+            The description of the name
+
+        labels: str
+            The labels of the counter
+
+        Returns
+        -------
+        Counter: The counter
+        '''
+        return self.get(Counter, name, help, labels)
+
+    def histogram(self, name: str, help: str = '', buckets: tuple[float, ...] = LATENCY_BUCKETS,
+                  **labels: str) -> Histogram:
+        '''
+        Gets or creates a histogram
+
+        Parameters
+        ----------
+        name: str
+            The name of the histogram
+
+        help: str
+            The description of the name
+
+        buckets: tuple[float, ...]
+            The upper bound of every bucket, used when it is created
+
+        labels: str
+            The labels of the histogram
+
+        Returns
+        -------
+        Histogram: The histogram
+        '''
+        return self.get(Histogram, name, help, labels, buckets)
+
+    def clear(self):
+        '''
+        Removes every metric
+        '''
+        self.metrics.clear()
+        self.help.clear()
+
+    def snapshot(self) -> dict[str, list[dict]]:
+        '''
+        Gets the value of every metric
+
+        Returns
+        -------
+        dict[str, list[dict]]: The counters and histograms, each with its
+        name and labels
+        '''
+        counters = []
+        histograms = []
+
+        for (name, labels), metric in sorted(self.metrics.items(), key=lambda item: item[0]):
+            if isinstance(metric, Counter):
+                counters.append({'name': name, 'labels': dict(labels), 'value': metric.value})
+            else:
+                histograms.append({
+                    'name': name,
+                    'labels': dict(labels),
+                    'buckets': [[bound if bound != float('inf') else '+Inf', count]
+                                for bound, count in metric.cumulative()],
+                    'sum': metric.sum,
+                    'count': metric.count,
+                })
+
+        return {'counters': counters, 'histograms': histograms}
+
+    def toJson(self) -> str:
+        '''
+        Exports every metric as JSON
+
+        Returns
+        -------
+        str: The snapshot as JSON
+        '''
+        return json.dumps(self.snapshot(), indent=4)
+
+    def toPrometheus(self) -> str:
+        '''
+        Exports every metric in the Prometheus text format
+
+        Returns
+        -------
+        str: The metrics, one sample per line
+        '''
+        lines = []
+        described = set()
+
+        for (name, labels), metric in sorted(self.metrics.items(), key=lambda item: item[0]):
+            if name not in described:
+                described.add(name)
+                lines.append(f'# HELP {name} {self.help[name]}')
+                kind = 'counter' if isinstance(metric, Counter) else 'histogram'
+                lines.append(f'# TYPE {name} {kind}')
+
+            if isinstance(metric, Counter):
+                lines.append(f'{name}{formatLabels(labels)} {metric.value}')
+                continue
+
+            for bound, count in metric.cumulative():
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                lines.append(f'{name}_bucket{formatLabels(labels + (("le", le),))} {count}')
+            lines.append(f'{name}_sum{formatLabels(labels)} {metric.sum!r}')
+            lines.append(f'{name}_count{formatLabels(labels)} {metric.count}')
+
+        return '\n'.join(lines) + '\n'
+
+
+def formatLabels(labels: tuple[tuple[str, str], ...]) -> str:
+    '''
+    Formats labels for the Prometheus text format
+
+    Parameters
+    ----------
+    labels: tuple[tuple[str, str], ...]
+        The name and value of each label
+
+    Returns
+    -------
+    str: The labels in braces, empty if there are none
+    '''
+    if not labels:
+        return ''
+
+    return '{' + ','.join(f'{name}="{escapeLabel(value)}"' for name, value in labels) + '}'
+
+
+def escapeLabel(value: str) -> str:
+    '''
+    Escapes the value of a label for the Prometheus text format
+
+    Parameters
+    ----------
+    value: str
+        The value of the label
+
+    Returns
+    -------
+    str: The value with backslashes, quotes and newlines escaped
+    '''
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+REGISTRY = Registry()
+
+# The methods replaced by enable, as (class, name, original)
+originals = []
+
+
+def isEnabled() -> bool:
+    '''
+    Checks if the hot paths are instrumented
+
+    Returns
+    -------
+    bool: True between enable() and disable()
+    '''
+    return bool(originals)
+
+
+def patch(cls: type, name: str, wrapper):
+    '''
+    Replaces a method of a class with a wrapper around it
+
+    Parameters
+    ----------
+    cls: type
+        The class defining the method
+
+    name: str
+        The name of the method
+
+    wrapper: Callable
+        Creates the replacement from the original
+    '''
+    original = cls.__dict__[name]
+    originals.append((cls, name, original))
+    setattr(cls, name, wraps(original)(wrapper(original)))
+
+
+def timed(histogram: Histogram):
+    '''
+    Creates a wrapper observing the seconds spent in a method
+
+    Parameters
+    ----------
+    histogram: Histogram
+        The histogram observing the time
+
+    Returns
+    -------
+    Callable: The wrapper for patch
+    '''
+    perfCounter = time.perf_counter
+    observe = histogram.observe
+
+    def wrapper(original):
+        def timedMethod(*args, **kwargs):
+            begin = perfCounter()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                observe(perfCounter() - begin)
+        return timedMethod
+
+    return wrapper
+
+
+def enable(registry: Registry = REGISTRY):
+    '''
+    Instruments the hot paths, recording into the registry
+
+    Parameters
+    ----------
+    registry: Registry
+        The registry the metrics are recorded in
+    '''
+    if isEnabled():
+        return
+
+    perfCounter = time.perf_counter
+    shootSeconds = registry.histogram('battleship_shoot_seconds', 'Time spent in Board.shoot')
+    results = {result: registry.counter('battleship_shots_total', 'Shots by result', result=result)
+               for result in ('MISS', 'HIT', 'SUNK', 'SAME')}
+    rejections = {exception: registry.counter('battleship_placement_rejections_total',
+                                              'Rejected ship placements by exception',
+                                              exception=exception.__name__)
+                  for exception in (OverlapException, OutOfBoundsException,
+                                    InvalidPlacementException)}
+
+    def shootWrapper(original):
+        def shoot(self, shot):
+            begin = perfCounter()
+            result = original(self, shot)
+            shootSeconds.observe(perfCounter() - begin)
+            results[result].inc()
+            return result
+        return shoot
+
+    def shootManyWrapper(original):
+        def shootMany(self, shots):
+            begin = perfCounter()
+            salvo, sunk = original(self, shots)
+            if salvo:
+                elapsed = (perfCounter() - begin) / len(salvo)
+                for result in salvo:
+                    shootSeconds.observe(elapsed)
+                    results[result].inc()
+            return salvo, sunk
+        return shootMany
+
+    def rejectWrapper(original):
+        def rejected(*args, **kwargs):
+            try:
+                return original(*args, **kwargs)
+            except (OverlapException, OutOfBoundsException, InvalidPlacementException) as e:
+                rejections[type(e)].inc()
+                raise
+        return rejected
+
+    for engine in ENGINES:
+        patch(engine, 'shoot', shootWrapper)
+        patch(engine, 'shootMany', shootManyWrapper)
+        patch(engine, 'addShip', rejectWrapper)
+
+    patch(Ship, '__init__', rejectWrapper)
+
+    # The GUI is only instrumented when it is already loaded, so servers
+    # never import Qt
+    boardModal = sys.modules.get('BoardModal')
+    if boardModal is not None:
+        for cls, name, stage in ((boardModal.BoardScene, 'eventFilter', 'eventFilter'),
+                                 (boardModal.BoardScene, 'repaintCells', 'repaintCells'),
+                                 (boardModal.Cell, 'paint', 'paint')):
+            patch(cls, name, timed(registry.histogram('battleship_gui_seconds',
+                                                      'Time spent in the board UI',
+                                                      stage=stage)))
+
+
+def disable():
+    '''
+    Removes the instrumentation, keeping what was recorded
+    '''
+    while originals:
+        cls, name, original = originals.pop()
+        setattr(cls, name, original)
+
+
+def writeSnapshot(path: str, registry: Registry = REGISTRY):
+    '''
+    Writes the metrics to a file, as JSON if the path ends in .json and
+    in the Prometheus text format otherwise
+
+    The file is replaced in one step, so readers never see half of it.
+
+    Parameters
+    ----------
+    path: str
+        The path of the file
+
+    registry: Registry
+        The registry to export
+    '''
+    text = registry.toJson() if path.endswith('.json') else registry.toPrometheus()
+
+    with open(path + '.tmp', 'w') as file:
+        file.write(text)
+
+    os.replace(path + '.tmp', path)
@@ -0,0 +1,708 @@
+'''
+File: monteCarloAI.py
+Auth: Blake Wingard - bats23456789@gmail.com
+Date: 10/18/2026
+Desc: A Monte Carlo computer opponent that samples whole hidden fleets.
+
+Every turn the AI draws complete fleets that agree with every result seen
+so far and fires at the unshot cell covered most often across them.
+
+A fleet agrees with the results when no ship is on a miss, every hit is
+on a ship, and a ship has every cell shot exactly when it was reported
+sunk, by the shot at its last cell. Before sampling, the placements that
+cannot fit are pruned once: placements over misses, placements with every
+cell shot for ships still afloat, and, for every SUNK, the placements made
+only of hits that the sinking shot could have finished. The ways to
+explain the SUNKs together are then worked out, and each sample picks one
+and places the ships still afloat over the hits left, checking ahead that
+every hit can still be covered.
+
+Sampling runs until a per-move time budget or a number of samples runs
+out, split over worker processes when the AI has more than one.
+
+Once few enough fleets are left to list them all, see endgameSolver, the
+AI stops sampling and takes the shot that minimizes the expected number
+of shots left.
+'''
+import random
+import time
+from collections import Counter
+from collections.abc import Generator
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+import numpy as np
+from battleship import STANDARD_FLEET
+from densityAI import DensityAI
+from endgameSolver import EndgameSolver, ENDGAME_SHIPS, ENDGAME_THRESHOLD
+
+# The seconds each move may spend sampling
+MOVE_BUDGET = 0.1
+
+# The most fleets sampled for a move
+MAX_SAMPLES = 500
+
+# The most ways to explain the SUNKs kept, beyond this some are left out
+MAX_SUNK_ASSIGNMENTS = 1024
+
+# Each sample gives up after this many dead ends
+MAX_ATTEMPTS = 20
+
+
+@lru_cache
+def placementMasks(length: int) -> tuple[int, ...]:
+    '''
+    Gets every placement of a ship on the board as a bitmask
+
+    Parameters
+    ----------
+    length: int
+        The length of the ship
+
+    Returns
+    -------
+    tuple[int, ...]: The mask of each placement, bit y * 10 + x per cell
+    '''
+    row = (1 << length) - 1
+    col = sum(1 << (10 * i) for i in range(length))
+
+    masks = [row << (y * 10 + x) for y in range(10) for x in range(10 - length + 1)]
+    masks += [col << (y * 10 + x) for y in range(10 - length + 1) for x in range(10)]
+    return tuple(masks)
+
+
+def maskToCells(mask: int) -> np.ndarray:
+    '''
+    Converts a mask into a bool for each cell
+
+    Parameters
+    ----------
+    mask: int
+        The mask, bit y * 10 + x per cell
+
+    Returns
+    -------
+    np.ndarray: 100 bools
+    '''
+    data = np.frombuffer(mask.to_bytes(13, 'little'), np.uint8)
+    return np.unpackbits(data, bitorder='little')[:100].astype(bool)
+
+
+def maskCells(mask: int) -> list[int]:
+    '''
+    Gets the cells set in a mask
+
+    Parameters
+    ----------
+    mask: int
+        The mask
+
+    Returns
+    -------
+    list[int]: The cells from lowest to highest
+    '''
+    cells = []
+
+    while mask:
+        low = mask & -mask
+        cells.append(low.bit_length() - 1)
+        mask ^= low
+
+    return cells
+
+
+class FleetSampler:
+    '''
+    A class to represent the fleets that agree with a set of results.
+
+    Attributes
+    ----------
+    afloat: dict[int, list[int]]
+        The placements left for a ship of each length still afloat
+
+    assignments: list[tuple[int, tuple[int, ...]]]
+        Every way to explain the SUNKs found, as the mask of the sunk
+        ships and the lengths left afloat
+
+    hits: int
+        A mask of every hit cell, sunk ships included
+
+    shots: int
+        A mask of every cell shot
+
+    Methods
+    -------
+    sample(rng): tuple[int, float] | None
+        Draws a fleet that agrees with the results
+
+    sampleMany(rng, count, deadline): list[tuple[int, float]]
+        Draws fleets until there are enough or the time is up
+
+    listFleets(limit): list[tuple[tuple[int, ...], tuple[int, ...]]] | None
+        Lists every way the ships still afloat could lie
+    '''
+
+    def __init__(self, lengths: list[int], misses: int, hits: int,
+                 sunk: list[tuple[int, int | None]], turns: dict[int, int]):
+        '''
+        Constructs all the necesarry attributes for the FleetSampler object
+
+        Parameters
+        ----------
+        lengths: list[int]
+            The lengths of the whole opposing fleet
+
+        misses: int
+            A mask of every miss
+
+        hits: int
+            A mask of every hit, sunk ships included
+
+        sunk: list[tuple[int, int | None]]
+            The cell of every shot that sank a ship and the length of the
+            ship, None if the opponent did not name it
+
+        turns: dict[int, int]
+            The turn each hit cell was shot on
+        '''
+        shots = misses | hits
+        self.hits = hits
+        self.assignments = []
+
+        sunkMask = 0
+        for cell, named in sunk:
+            sunkMask |= 1 << cell
+
+        # A ship sunk by the shot at cell is only hits, shot no later than cell
+        candidates = []
+        for cell, named in sunk:
+            bit = 1 << cell
+            options = []
+            for length in set(lengths) if named is None else {named}:
+                for mask in placementMasks(length):
+                    if mask & bit and not mask & ~hits and not mask & sunkMask & ~bit \
+                            and all(turns[i] <= turns[cell] for i in maskCells(mask)):
+                        options.append((length, mask))
+            candidates.append(options)
+
+        self.explainSunk(candidates, 0, Counter(lengths), 0)
+
+        # Cells sunk in every explanation cannot hold a ship still afloat
+        certain = -1
+        for mask, afloat in self.assignments:
+            certain &= mask
+        if not self.assignments:
+            certain = 0
+
+        self.afloat = {length: [mask for mask in placementMasks(length)
+                                if not mask & (misses | certain) and mask & ~shots]
+                       for length in set(lengths)}
+        self.shots = shots
+
+    def explainSunk(self, candidates: list[list[tuple[int, int]]], index: int,
+                    left: Counter, used: int):
+        '''
+        Finds every way to explain the SUNKs from index on
+
+        Parameters
+        ----------
+        candidates: list[list[tuple[int, int]]]
+            The length and mask of every ship each SUNK could have sunk
+
+        index: int
+            The SUNK to explain next
+
+        left: Counter
+            The number of ships of each length not yet used
+
+        used: int
+            A mask of the ships already used
+        '''
+        if len(self.assignments) >= MAX_SUNK_ASSIGNMENTS:
+            return
+
+        if index == len(candidates):
+            afloat = tuple(sorted(left.elements(), reverse=True))
+            self.assignments.append((used, afloat))
+            return
+
+        for length, mask in candidates[index]:
+            if left[length] and not mask & used:
+                left[length] -= 1
+                self.explainSunk(candidates, index + 1, left, used | mask)
+                left[length] += 1
+
+    def sample(self, rng: random.Random) -> tuple[int, float] | None:
+        '''
+        Draws a fleet that agrees with the results
+
+        Ships are first placed over the hits not on a sunk ship, choosing
+        among every placement of every ship left that covers the lowest
+        uncovered hit. The ships left after that are placed anywhere free.
+
+        Choosing one ship at a time favours fleets whose choices had few
+        options, so each fleet is weighted by the number of options of
+        every choice made for it. Weighted, the fleets count as if drawn
+        evenly from every fleet agreeing with the results.
+
+        Parameters
+        ----------
+        rng: random.Random
+            The source of randomness
+
+        Returns
+        -------
+        tuple[int, float] | None: The mask of the fleet and its weight,
+        None if every attempt reached a dead end
+        '''
+        if not self.assignments:
+            return None
+
+        for attempt in range(MAX_ATTEMPTS):
+            used, afloat = self.assignments[rng.randrange(len(self.assignments))]
+            left = list(afloat)
+            uncovered = self.hits & ~used
+            weight = 1.0
+
+            while uncovered:
+                low = uncovered & -uncovered
+                options = [(i, mask) for i, length in enumerate(left)
+                           for mask in self.afloat[length] if mask & low and not mask & used]
+                if not options:
+                    break
+
+                i, mask = options[rng.randrange(len(options))]
+                weight *= len(options)
+                used |= mask
+                uncovered &= ~mask
+                del left[i]
+
+            if uncovered:
+                continue
+
+            for length in left:
+                free = [mask for mask in self.afloat[length] if not mask & used]
+                if not free:
+                    break
+                weight *= len(free)
+                used |= free[rng.randrange(len(free))]
+            else:
+                return used, weight
+
+        return None
+
+    def listFleets(self, limit: int) -> list[tuple[tuple[int, ...], tuple[int, ...]]] | None:
+        '''
+        Lists every way the ships still afloat could lie
+
+        Each way of explaining the SUNKs is listed on its own, so a fleet
+        afloat that fits several is listed once for each, as it is that
+        much more likely.
+
+        Parameters
+        ----------
+        limit: int
+            The most fleets listed
+
+        Returns
+        -------
+        list[tuple[tuple[int, ...], tuple[int, ...]]] | None: The lengths
+        and masks of the ships afloat in each fleet, None if there are
+        more than limit
+        '''
+        fleets = []
+
+        for used, afloat in self.assignments:
+            if not self.placeAfloat(afloat, (), used, self.hits & ~used, fleets, limit):
+                return None
+
+        return fleets
+
+    def placeAfloat(self, lengths: tuple[int, ...], masks: tuple[int, ...], used: int,
+                    uncovered: int, fleets: list, limit: int) -> bool:
+        '''
+        Lists every placement of the ships after masks that covers the hits
+
+        Ships of the same length are placed in increasing mask order, so
+        each fleet is listed once.
+
+        Parameters
+        ----------
+        lengths: tuple[int, ...]
+            The lengths of the ships afloat
+
+        masks: tuple[int, ...]
+            The masks of the ships already placed
+
+        used: int
+            A mask of every cell taken by a ship
+
+        uncovered: int
+            A mask of the hits not yet on a ship
+
+        fleets: list
+            The fleets listed so far, added to
+
+        limit: int
+            The most fleets listed
+
+        Returns
+        -------
+        bool: False if there are more than limit fleets
+        '''
+        i = len(masks)
+
+        if i == len(lengths):
+            if not uncovered:
+                fleets.append((lengths, masks))
+            return len(fleets) <= limit
+
+        if sum(lengths[i:]) < uncovered.bit_count():
+            return True
+
+        length = lengths[i]
+        after = masks[-1] if i and lengths[i - 1] == length else -1
+
+        for mask in self.afloat[length]:
+            if mask > after and not mask & used:
+                if not self.placeAfloat(lengths, masks + (mask,), used | mask,
+                                        uncovered & ~mask, fleets, limit):
+                    return False
+
+        return True
+
+    def sampleMany(self, rng: random.Random, count: int,
+                   deadline: float) -> list[tuple[int, float]]:
+        '''
+        Draws fleets until there are enough or the time is up
+
+        Parameters
+        ----------
+        rng: random.Random
+            The source of randomness
+
+        count: int
+            The most fleets to draw
+
+        deadline: float
+            The time.monotonic() to stop at
+
+        Returns
+        -------
+        list[tuple[int, float]]: The mask and weight of every fleet drawn
+        '''
+        fleets = []
+
+        for i in range(count):
+            fleet = self.sample(rng)
+            if fleet is not None:
+                fleets.append(fleet)
+            if time.monotonic() > deadline:
+                break
+
+        return fleets
+
+
+def countSamples(lengths: list[int], misses: int, hits: int, sunk: list[tuple[int, int | None]],
+                 turns: dict[int, int], seed: int, count: int,
+                 deadline: float) -> tuple[np.ndarray, int]:
+    '''
+    Samples fleets and counts how often each cell holds a ship
+
+    Defined at module level so it can run in a worker process.
+
+    Parameters
+    ----------
+    lengths, misses, hits, sunk, turns
+        The results seen so far, see FleetSampler
+
+    seed: int
+        The seed of the samples
+
+    count: int
+        The most fleets to draw
+
+    deadline: float
+        The time.monotonic() to stop at
+
+    Returns
+    -------
+    np.ndarray: The weighted number of fleets covering each of the 100 cells
+    int: The number of fleets drawn
+    '''
+    sampler = FleetSampler(lengths, misses, hits, sunk, turns)
+    fleets = sampler.sampleMany(random.Random(seed), count, deadline)
+
+    counts = np.zeros(100)
+    for fleet, weight in fleets:
+        counts += weight * maskToCells(fleet)
+
+    return counts, len(fleets)
+
+
+class MonteCarloAI:
+    '''
+    A class to represent an opponent that samples hidden fleets.
+
+    Attributes
+    ----------
+    lengths: list[int]
+        The lengths of the opposing fleet
+
+    misses: int
+        A mask of every miss
+
+    hits: int
+        A mask of every hit, sunk ships included
+
+    sunk: list[tuple[int, int | None]]
+        The cell of every shot that sank a ship, in order, and the length
+        of the ship if the opponent named it
+
+    turns: dict[int, int]
+        The turn each hit cell was shot on
+
+    turn: int
+        The number of shots observed
+
+    budget: float
+        The seconds each move may spend sampling
+
+    samples: int
+        The most fleets sampled for a move
+
+    workers: int
+        The number of processes sampling, 1 to sample in this process
+
+    pool: ProcessPoolExecutor | None
+        The worker processes, started by the first move that needs them
+
+    endgame: int
+        The most fleets left for the endgame solver to take over
+
+    named: bool
+        True if the opponent names every ship it reports sunk
+
+    solver: EndgameSolver | None
+        The endgame solver, kept from move to move for its memo
+
+    fallback: DensityAI
+        Picks the shot when no fleet could be sampled
+
+    Methods
+    -------
+    observe(shot, result)
+        Records the result of a shot
+
+    counts(rng): tuple[np.ndarray, int]
+        Samples fleets and counts how often each cell holds a ship
+
+    endgameShot(): tuple[int, int] | None
+        Solves the best shot exactly once few enough fleets are left
+
+    nextShot(rng): tuple[int, int]
+        Picks the cell most often holding a ship
+
+    close()
+        Stops the worker processes
+    '''
+
+    def __init__(self, lengths: list[int] | None = None, budget: float = MOVE_BUDGET,
+                 samples: int = MAX_SAMPLES, workers: int = 1,
+                 endgame: int = ENDGAME_THRESHOLD, named: bool = False):
+        '''
+        Constructs all the necesarry attributes for the MonteCarloAI object
+
+        Parameters
+        ----------
+        lengths: list[int] | None
+            The lengths of the opposing fleet, the standard fleet if None
+
+        budget: float
+            The seconds each move may spend sampling
+
+        samples: int
+            The most fleets sampled for a move
+
+        workers: int
+            The number of processes sampling, 1 to sample in this process
+
+        endgame: int
+            The most fleets left for the endgame solver to take over, 0
+            to always sample
+
+        named: bool
+            True if the opponent names every ship it reports sunk
+        '''
+        if lengths is None:
+            lengths = [length for name, length in STANDARD_FLEET]
+
+        self.lengths = list(lengths)
+        self.misses = 0
+        self.hits = 0
+        self.sunk = []
+        self.turns = {}
+        self.turn = 0
+        self.budget = budget
+        self.samples = samples
+        self.workers = workers
+        self.pool = None
+        self.endgame = endgame
+        self.named = named
+        self.solver = None
+        self.fallback = DensityAI(lengths)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def observe(self, shot: tuple[int, int], result: str, length: int | None = None):
+        '''
+        Records the result of a shot
+
+        Parameters
+        ----------
+        shot: tuple[int, int]
+            The position of the shot in (x, y)
+
+        result: str
+            The result returned by Board.shoot
+
+        length: int | None
+            The length of the ship sunk, when the opponent names it
+        '''
+        cell = shot[1] * 10 + shot[0]
+
+        if result == 'MISS':
+            self.misses |= 1 << cell
+        elif result in ('HIT', 'SUNK'):
+            self.hits |= 1 << cell
+            self.turns[cell] = self.turn
+            if result == 'SUNK':
+                self.sunk.append((cell, length))
+
+        self.turn += 1
+        self.fallback.observe(shot, result)
+
+    def counts(self, rng: random.Random) -> tuple[np.ndarray, int]:
+        '''
+        Samples fleets and counts how often each cell holds a ship
+
+        Parameters
+        ----------
+        rng: random.Random
+            Seeds the samples
+
+        Returns
+        -------
+        np.ndarray: The weighted number of fleets covering each of the 100 cells
+        int: The number of fleets drawn
+        '''
+        deadline = time.monotonic() + self.budget
+        results = (self.lengths, self.misses, self.hits, self.sunk, self.turns)
+
+        if self.workers == 1:
+            return countSamples(*results, rng.getrandbits(64), self.samples, deadline)
+
+        if self.pool is None:
+            self.pool = ProcessPoolExecutor(self.workers)
+
+        share = -(-self.samples // self.workers)
+        futures = [self.pool.submit(countSamples, *results, rng.getrandbits(64), share, deadline)
+                   for i in range(self.workers)]
+
+        counts = np.zeros(100)
+        total = 0
+        for future in futures:
+            workerCounts, drawn = future.result()
+            counts += workerCounts
+            total += drawn
+
+        return counts, total
+
+    def endgameShot(self) -> tuple[int, int] | None:
+        '''
+        Solves the best shot exactly once few enough fleets are left
+
+        Returns
+        -------
+        tuple[int, int] | None: The position to shoot in (x, y), None if
+        more than ENDGAME_SHIPS ships or more than endgame fleets are left
+        '''
+        if not self.endgame or len(self.lengths) - len(self.sunk) > ENDGAME_SHIPS:
+            return None
+
+        sampler = FleetSampler(self.lengths, self.misses, self.hits, self.sunk, self.turns)
+        if any(len(afloat) > ENDGAME_SHIPS for used, afloat in sampler.assignments):
+            return None
+
+        fleets = sampler.listFleets(self.endgame)
+        if not fleets:
+            return None
+
+        # Fleets only drop out as results come in, so one solver lasts until a ship sinks
+        solver = self.solver
+        if solver is None or not solver.fits(fleets):
+            solver = self.solver = EndgameSolver(fleets, sampler.shots, self.named)
+
+        return solver.solve(fleets, sampler.shots)[1]
+
+    def nextShot(self, rng: random.Random) -> tuple[int, int]:
+        '''
+        Picks the cell most often holding a ship, or the endgame shot
+
+        Parameters
+        ----------
+        rng: random.Random
+            Seeds the samples and breaks ties between cells
+
+        Returns
+        -------
+        tuple[int, int]: The position to shoot in (x, y)
+        '''
+        shot = self.endgameShot()
+        if shot is not None:
+            return shot
+
+        counts, drawn = self.counts(rng)
+        counts[self.fallback.shot] = 0
+
+        if drawn == 0 or counts.max() == 0:
+            return self.fallback.nextShot(rng)
+
+        best = np.flatnonzero(counts == counts.max())
+        cell = int(best[rng.randrange(len(best))])
+        return (cell % 10, cell // 10)
+
+    def close(self):
+        '''
+        Stops the worker processes
+        '''
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
+
+
+def monteCarloStrategy(rng: random.Random) -> Generator[tuple[int, int], str, None]:
+    '''
+    Shoots using a MonteCarloAI sampling in this process
+
+    The simulator already plays games in parallel, so the AI does not
+    start workers of its own.
+
+    Parameters
+    ----------
+    rng: random.Random
+        The source of randomness
+
+    Yields
+    ------
+    tuple[int, int]: The next shot in (x, y)
+    '''
+    ai = MonteCarloAI()
+
+    while not ai.fallback.shot.all():
+        shot = ai.nextShot(rng)
+        result = yield shot
+        ai.observe(shot, result)
@@ -0,0 +1,324 @@
+'''
+File: placement.py
+Auth: Blake Wingard - bats23456789@gmail.com
+Date: 10/18/2026
+Desc: Fast generation of random fleets.
+
+Every placement of a ship of each length is precomputed as a bitmask
+(bit y * size + x, as in BitBoard). A fleet is drawn by picking one
+placement per ship and starting over whenever two masks overlap. Starting
+the whole fleet over, rather than only the ship that overlapped, keeps
+every legal fleet equally likely.
+
+Boards larger than TABLE_SIZE are too big to tabulate, so their
+placements are computed from their index and checked against a set of
+occupied cells instead.
+'''
+import random
+from functools import lru_cache
+import numpy as np
+from battleship import Board, Ship, STANDARD_FLEET
+from sparseBoard import makeBoard
+
+# Boards with more rows and cols than this do not use placement tables
+TABLE_SIZE = 32
+
+
+def placementCount(length: int, size: int = 10) -> int:
+    '''
+    Counts the placements of a ship on the board
+
+    Parameters
+    ----------
+    length: int
+        The length of the ship
+
+    size: int
+        The number of rows and cols on the board
+
+    Returns
+    -------
+    int: The number of placements
+    '''
+    return 2 * size * max(size - length + 1, 0)
+
+
+def placementAt(length: int, index: int, size: int = 10) -> tuple[tuple[int, int], tuple[int, int]]:
+    '''
+    Gets a single placement of a ship on the board
+
+    Horizontal placements come first, then vertical ones, each in row
+    order. This is the same order as densityAI.placementMasks.
+
+    Parameters
+    ----------
+    length: int
+        The length of the ship
+
+    index: int
+        The number of the placement, below placementCount(length, size)
+
+    size: int
+        The number of rows and cols on the board
+
+    Returns
+    -------
+    tuple[tuple[int, int], tuple[int, int]]: The start and stop of the ship
+    '''
+    span = size - length + 1
+
+    if index < size * span:
+        y, x = divmod(index, span)
+        return (x, y), (x + length - 1, y)
+
+    y, x = divmod(index - size * span, size)
+    return (x, y), (x, y + length - 1)
+
+
+@lru_cache
+def placementTable(length: int, size: int = 10) -> tuple[tuple[int, tuple[int, int], tuple[int, int]], ...]:
+    '''
+    Gets every placement of a ship on the board
+
+    Parameters
+    ----------
+    length: int
+        The length of the ship
+
+    size: int
+        The number of rows and cols on the board
+
+    Returns
+    -------
+    tuple: The mask, start and stop of every placement, in placementAt order
+    '''
+    table = []
+
+    for index in range(placementCount(length, size)):
+        start, stop = placementAt(length, index, size)
+        step = 1 if start[1] == stop[1] else size
+        first = start[1] * size + start[0]
+        mask = sum(1 << (first + i * step) for i in range(length))
+        table.append((mask, start, stop))
+
+    return tuple(table)
+
+
+@lru_cache
+def placementWords(length: int, size: int = 10) -> np.ndarray:
+    '''
+    Gets every placement mask split into 64 bit words
+
+    Parameters
+    ----------
+    length: int
+        The length of the ship
+
+    size: int
+        The number of rows and cols on the board
+
+    Returns
+    -------
+    np.ndarray: A (words, placements) uint64 array, lowest word first
+    '''
+    words = (size * size + 63) // 64
+    masks = [mask for mask, start, stop in placementTable(length, size)]
+    return np.array([[(mask >> (64 * i)) & (2 ** 64 - 1) for mask in masks]
+                     for i in range(words)], np.uint64)
+
+
+def randomPlacements(rng: random.Random, fleet=STANDARD_FLEET, size: int = 10) -> list[int]:
+    '''
+    Picks a random legal placement for every ship
+
+    Parameters
+    ----------
+    rng: random.Random
+        The source of randomness
+
+    fleet: Iterable[tuple[str, int]]
+        The name and length of every ship
+
+    size: int
+        The number of rows and cols on the board
+
+    Returns
+    -------
+    list[int]: The placementAt index of each ship
+    '''
+    if size > TABLE_SIZE:
+        return randomSparsePlacements(rng, fleet, size)
+
+    tables = [placementTable(length, size) for name, length in fleet]
+
+    while True:
+        occupied = 0
+        indices = []
+
+        for table in tables:
+            i = rng.randrange(len(table))
+            mask = table[i][0]
+            if occupied & mask:
+                break
+            occupied |= mask
+            indices.append(i)
+        else:
+            return indices
+
+
+def randomSparsePlacements(rng: random.Random, fleet=STANDARD_FLEET, size: int = 10) -> list[int]:
+    '''
+    Picks a random legal placement for every ship without placement tables
+
+    Parameters
+    ----------
+    rng: random.Random
+        The source of randomness
+
+    fleet: Iterable[tuple[str, int]]
+        The name and length of every ship
+
+    size: int
+        The number of rows and cols on the board
+
+    Returns
+    -------
+    list[int]: The placementAt index of each ship
+    '''
+    fleet = list(fleet)
+
+    while True:
+        occupied = set()
+        indices = []
+
+        for name, length in fleet:
+            i = rng.randrange(placementCount(length, size))
+            start, stop = placementAt(length, i, size)
+            cells = Ship(name, start, stop).positions()
+            if not occupied.isdisjoint(cells):
+                break
+            occupied.update(cells)
+            indices.append(i)
+        else:
+            return indices
+
+
+def randomFleet(rng: random.Random | None = None, fleet=STANDARD_FLEET,
+                size: int = 10) -> list[Ship]:
+    '''
+    Creates the ships of a random legal fleet
+
+    Parameters
+    ----------
+    rng: random.Random | None
+        The source of randomness, the random module if None
+
+    fleet: Iterable[tuple[str, int]]
+        The name and length of every ship
+
+    size: int
+        The number of rows and cols on the board
+
+    Returns
+    -------
+    list[Ship]: The ships of the fleet
+    '''
+    if rng is None:
+        rng = random.Random()
+
+    return [Ship(name, *placementAt(length, i, size))
+            for (name, length), i in zip(fleet, randomPlacements(rng, fleet, size))]
+
+
+def randomBoard(rng: random.Random | None = None, fleet=STANDARD_FLEET,
+                boardType: type[Board] | None = None, size: int = 10) -> Board:
+    '''
+    Creates a board holding a random legal fleet
+
+    Parameters
+    ----------
+    rng: random.Random | None
+        The source of randomness, the random module if None
+
+    fleet: Iterable[tuple[str, int]]
+        The name and length of every ship
+
+    boardType: type[Board] | None
+        The board engine to use, picked by makeBoard if None
+
+    size: int
+        The number of rows and cols on the board
+
+    Returns
+    -------
+    Board: The board with the fleet placed
+    '''
+    board = makeBoard(size) if boardType is None else boardType(size)
+
+    for ship in randomFleet(rng, fleet, size):
+        board.addShip(ship)
+
+    return board
+
+
+def randomFleets(count: int, fleet=STANDARD_FLEET, seed: int | None = None,
+                 batch: int = 65536, size: int = 10) -> np.ndarray:
+    '''
+    Generates many random legal fleets at once
+
+    Parameters
+    ----------
+    count: int
+        The number of fleets to generate
+
+    fleet: Iterable[tuple[str, int]]
+        The name and length of every ship
+
+    seed: int | None
+        The seed for the fleets
+
+    batch: int
+        The number of fleets tried at a time
+
+    size: int
+        The number of rows and cols on the board, up to TABLE_SIZE
+
+    Returns
+    -------
+    np.ndarray: A (count, ships) uint16 array of the placementAt index of
+    each ship of each fleet
+
+    Raises
+    ------
+    ValueError: The board is larger than TABLE_SIZE or the fleet is empty
+    '''
+    if size > TABLE_SIZE:
+        raise ValueError(f'boards larger than {TABLE_SIZE} can not be tabulated')
+
+    fleet = list(fleet)
+    if not fleet:
+        raise ValueError('the fleet has no ships')
+
+    rng = np.random.default_rng(seed)
+    words = [placementWords(length, size) for name, length in fleet]
+    fleets = np.empty((count, len(fleet)), np.uint16)
+    found = 0
+
+    while found < count:
+        indices = np.empty((batch, len(fleet)), np.uint16)
+        occupied = np.zeros((len(words[0]), batch), np.uint64)
+        legal = np.ones(batch, bool)
+
+        for i, shipWords in enumerate(words):
+            index = rng.integers(0, shipWords.shape[1], batch)
+            indices[:, i] = index
+            for word, occupiedWord in zip(shipWords, occupied):
+                masks = word[index]
+                legal &= (occupiedWord & masks) == 0
+                occupiedWord |= masks
+
+        accepted = indices[legal][:count - found]
+        fleets[found:found + len(accepted)] = accepted
+        found += len(accepted)
+
+    return fleets
@@ -0,0 +1,472 @@
+'''
+File: protocol.py
+Auth: Blake Wingard - bats23456789@gmail.com
+Date: 10/18/2026
+Desc: The compact binary wire protocol for shots and results.
+
+Every frame starts with its length (not counting the length byte), the
+protocol version and the message type, followed by a fixed size payload.
+
+SHOT      [3][version][SHOT][cell]
+RESULT    [4][version][RESULT][result][ship]
+OPPONENT  [5][version][OPPONENT][cell][result][ship]
+STATUS    [3][version][STATUS][status]
+
+A cell is y * 10 + x. A ship is 0 when nothing was sunk, otherwise the
+index of the sunk ship on the board plus one.
+
+The encoders write into a caller supplied buffer and the decoders read
+from one, so a single bytearray or memoryview can be reused for every
+message. The text functions convert frames to and from the B4 notation
+used by the line protocol in server.py. textToBytes packs a frame with a
+precompiled struct.Struct, for messages handed to a transport that may
+keep the bytes it is given.
+
+A cell fits in one byte, so the binary protocol is for the standard
+10x10 board only.
+'''
+import struct
+from battleship import pointToStr, strToPoint
+
+VERSION = 1
+
+SHOT = 1
+RESULT = 2
+OPPONENT = 3
+STATUS = 4
+
+SHOT_SIZE = 4
+RESULT_SIZE = 5
+OPPONENT_SIZE = 6
+STATUS_SIZE = 4
+
+FRAME_SIZES = {SHOT: SHOT_SIZE, RESULT: RESULT_SIZE, OPPONENT: OPPONENT_SIZE, STATUS: STATUS_SIZE}
+
+# Every byte of each frame, length byte included
+SHOT_FRAME = struct.Struct(f'{SHOT_SIZE}B')
+RESULT_FRAME = struct.Struct(f'{RESULT_SIZE}B')
+OPPONENT_FRAME = struct.Struct(f'{OPPONENT_SIZE}B')
+STATUS_FRAME = struct.Struct(f'{STATUS_SIZE}B')
+
+RESULTS = ('MISS', 'HIT', 'SUNK', 'SAME')
+RESULT_CODES = {result: code for code, result in enumerate(RESULTS)}
+
+STATUSES = ('OK', 'TURN', 'WAIT', 'WIN', 'LOSE', 'LEFT', 'ERROR')
+STATUS_CODES = {status: code for code, status in enumerate(STATUSES)}
+
+
+class FrameError(Exception):
+    'Raised when a frame is malformed or uses another version'
+    pass
+
+
+def posToCell(pos: tuple[int, int]) -> int:
+    '''
+    Converts a position into a cell index
+
+    Parameters
+    ----------
+    pos: tuple[int, int]
+        The position in (x, y)
+
+    Returns
+    -------
+    int: The cell index
+    '''
+    return pos[1] * 10 + pos[0]
+
+
+def cellToPos(cell: int) -> tuple[int, int]:
+    '''
+    Converts a cell index into a position
+
+    Parameters
+    ----------
+    cell: int
+        The cell index
+
+    Returns
+    -------
+    tuple[int, int]: The position in (x, y)
+    '''
+    return (cell % 10, cell // 10)
+
+
+def cellToText(cell: int) -> str:
+    '''
+    Converts a cell index into the letter-number notation (e.g. B4)
+
+    Parameters
+    ----------
+    cell: int
+        The cell index
+
+    Returns
+    -------
+    str: The cell as text
+    '''
+    return pointToStr(cellToPos(cell))
+
+
+def textToCell(text: str) -> int:
+    '''
+    Converts the letter-number notation (e.g. B4) into a cell index
+
+    Parameters
+    ----------
+    text: str
+        The cell as text
+
+    Returns
+    -------
+    int: The cell index
+
+    Raises
+    ------
+    ValueError: The text is not a cell on the board
+    '''
+    col, row = strToPoint(text)
+
+    if not 0 <= row < 10 or not 0 <= col < 10:
+        raise ValueError(f'{text} is not on the board')
+
+    return row * 10 + col
+
+
+def encodeShot(buf: memoryview, offset: int, cell: int) -> int:
+    '''
+    Writes a SHOT frame
+
+    Parameters
+    ----------
+    buf: memoryview
+        The buffer to write into
+
+    offset: int
+        The position in buf to write at
+
+    cell: int
+        The cell being shot
+
+    Returns
+    -------
+    int: The offset after the frame
+    '''
+    buf[offset] = SHOT_SIZE - 1
+    buf[offset + 1] = VERSION
+    buf[offset + 2] = SHOT
+    buf[offset + 3] = cell
+    return offset + SHOT_SIZE
+
+
+def encodeResult(buf: memoryview, offset: int, result: int, ship: int) -> int:
+    '''
+    Writes a RESULT frame
+
+    Parameters
+    ----------
+    buf: memoryview
+        The buffer to write into
+
+    offset: int
+        The position in buf to write at
+
+    result: int
+        The result code of the shot
+
+    ship: int
+        The sunk ship, or 0
+
+    Returns
+    -------
+    int: The offset after the frame
+    '''
+    buf[offset] = RESULT_SIZE - 1
+    buf[offset + 1] = VERSION
+    buf[offset + 2] = RESULT
+    buf[offset + 3] = result
+    buf[offset + 4] = ship
+    return offset + RESULT_SIZE
+
+
+def encodeOpponent(buf: memoryview, offset: int, cell: int, result: int, ship: int) -> int:
+    '''
+    Writes an OPPONENT frame
+
+    Parameters
+    ----------
+    buf: memoryview
+        The buffer to write into
+
+    offset: int
+        The position in buf to write at
+
+    cell: int
+        The cell the opponent shot
+
+    result: int
+        The result code of the shot
+
+    ship: int
+        The sunk ship, or 0
+
+    Returns
+    -------
+    int: The offset after the frame
+    '''
+    buf[offset] = OPPONENT_SIZE - 1
+    buf[offset + 1] = VERSION
+    buf[offset + 2] = OPPONENT
+    buf[offset + 3] = cell
+    buf[offset + 4] = result
+    buf[offset + 5] = ship
+    return offset + OPPONENT_SIZE
+
+
+def encodeStatus(buf: memoryview, offset: int, status: int) -> int:
+    '''
+    Writes a STATUS frame
+
+    Parameters
+    ----------
+    buf: memoryview
+        The buffer to write into
+
+    offset: int
+        The position in buf to write at
+
+    status: int
+        The status code
+
+    Returns
+    -------
+    int: The offset after the frame
+    '''
+    buf[offset] = STATUS_SIZE - 1
+    buf[offset + 1] = VERSION
+    buf[offset + 2] = STATUS
+    buf[offset + 3] = status
+    return offset + STATUS_SIZE
+
+
+def frameType(buf: memoryview, offset: int) -> int:
+    '''
+    Checks the frame at offset and gets its message type
+
+    Parameters
+    ----------
+    buf: memoryview
+        The buffer to read from
+
+    offset: int
+        The position of the frame in buf
+
+    Returns
+    -------
+    int: The message type
+
+    Raises
+    ------
+    FrameError: The frame is malformed or uses another version
+    '''
+    if len(buf) - offset < 3:
+        raise FrameError('Truncated frame')
+
+    if buf[offset + 1] != VERSION:
+        raise FrameError(f'Unsupported version {buf[offset + 1]}')
+
+    msgType = buf[offset + 2]
+    size = FRAME_SIZES.get(msgType)
+
+    if size is None:
+        raise FrameError(f'Unknown message type {msgType}')
+
+    if buf[offset] != size - 1 or len(buf) - offset < size:
+        raise FrameError('Bad frame length')
+
+    return msgType
+
+
+def decodeShot(buf: memoryview, offset: int) -> int:
+    '''
+    Reads the cell of a SHOT frame
+
+    Parameters
+    ----------
+    buf: memoryview
+        The buffer to read from
+
+    offset: int
+        The position of the frame in buf
+
+    Returns
+    -------
+    int: The cell being shot
+    '''
+    return buf[offset + 3]
+
+
+def decodeResult(buf: memoryview, offset: int) -> tuple[int, int]:
+    '''
+    Reads a RESULT frame
+
+    Parameters
+    ----------
+    buf: memoryview
+        The buffer to read from
+
+    offset: int
+        The position of the frame in buf
+
+    Returns
+    -------
+    tuple[int, int]: The result code and the sunk ship
+    '''
+    return buf[offset + 3], buf[offset + 4]
+
+
+def decodeOpponent(buf: memoryview, offset: int) -> tuple[int, int, int]:
+    '''
+    Reads an OPPONENT frame
+
+    Parameters
+    ----------
+    buf: memoryview
+        The buffer to read from
+
+    offset: int
+        The position of the frame in buf
+
+    Returns
+    -------
+    tuple[int, int, int]: The cell, the result code and the sunk ship
+    '''
+    return buf[offset + 3], buf[offset + 4], buf[offset + 5]
+
+
+def decodeStatus(buf: memoryview, offset: int) -> int:
+    '''
+    Reads a STATUS frame
+
+    Parameters
+    ----------
+    buf: memoryview
+        The buffer to read from
+
+    offset: int
+        The position of the frame in buf
+
+    Returns
+    -------
+    int: The status code
+    '''
+    return buf[offset + 3]
+
+
+def frameToText(buf: memoryview, offset: int) -> str:
+    '''
+    Converts a frame into readable text (e.g. SHOT B4 or SUNK 2)
+
+    Parameters
+    ----------
+    buf: memoryview
+        The buffer to read from
+
+    offset: int
+        The position of the frame in buf
+
+    Returns
+    -------
+    str: The frame as text
+
+    Raises
+    ------
+    FrameError: The frame is malformed or uses another version
+    '''
+    msgType = frameType(buf, offset)
+
+    if msgType == SHOT:
+        return f'SHOT {cellToText(decodeShot(buf, offset))}'
+
+    if msgType == RESULT:
+        result, ship = decodeResult(buf, offset)
+        return f'SUNK {ship}' if ship else RESULTS[result]
+
+    if msgType == OPPONENT:
+        cell, result, ship = decodeOpponent(buf, offset)
+        text = f'SUNK {ship}' if ship else RESULTS[result]
+        return f'OPPONENT {cellToText(cell)} {text}'
+
+    return STATUSES[decodeStatus(buf, offset)]
+
+
+def textToFrame(line: str, buf: memoryview, offset: int) -> int:
+    '''
+    Converts readable text (e.g. SHOT B4 or SUNK 2) into a frame
+
+    Parameters
+    ----------
+    line: str
+        The text to convert
+
+    buf: memoryview
+        The buffer to write into
+
+    offset: int
+        The position in buf to write at
+
+    Returns
+    -------
+    int: The offset after the frame
+
+    Raises
+    ------
+    ValueError: The text is not a known message
+    '''
+    frame = textToBytes(line)
+    buf[offset:offset + len(frame)] = frame
+    return offset + len(frame)
+
+
+def textToBytes(line: str) -> bytes:
+    '''
+    Converts readable text (e.g. SHOT B4 or SUNK 2) into the bytes of a frame
+
+    Parameters
+    ----------
+    line: str
+        The text to convert
+
+    Returns
+    -------
+    bytes: The frame
+
+    Raises
+    ------
+    ValueError: The text is not a known message
+    '''
+    words = line.split()
+
+    try:
+        match(words):
+            case ['SHOT', cell]:
+                return SHOT_FRAME.pack(SHOT_SIZE - 1, VERSION, SHOT, textToCell(cell))
+            case ['SUNK', ship]:
+                return RESULT_FRAME.pack(RESULT_SIZE - 1, VERSION, RESULT,
+                                         RESULT_CODES['SUNK'], int(ship))
+            case [result] if result in RESULT_CODES:
+                return RESULT_FRAME.pack(RESULT_SIZE - 1, VERSION, RESULT,
+                                         RESULT_CODES[result], 0)
+            case ['OPPONENT', cell, 'SUNK', ship]:
+                return OPPONENT_FRAME.pack(OPPONENT_SIZE - 1, VERSION, OPPONENT, textToCell(cell),
+                                           RESULT_CODES['SUNK'], int(ship))
+            case ['OPPONENT', cell, result] if result in RESULT_CODES:
+                return OPPONENT_FRAME.pack(OPPONENT_SIZE - 1, VERSION, OPPONENT, textToCell(cell),
+                                           RESULT_CODES[result], 0)
+            case [status] if status in STATUS_CODES:
+                return STATUS_FRAME.pack(STATUS_SIZE - 1, VERSION, STATUS, STATUS_CODES[status])
+    except struct.error as e:
+        # A number that does not fit in its byte
+        raise ValueError(f'Unknown message {line!r}') from e
+
+    raise ValueError(f'Unknown message {line!r}')
@@ -0,0 +1,940 @@
+'''
+File: server.py
+Auth: Blake Wingard - bats23456789@gmail.com
+Date: 10/18/2026
+Desc: An asyncio server hosting many battleship matches at once.
+
+The communication standard is line based ASCII. Every command and every
+message from the server is a single line. A command can be answered by
+more than one line (e.g. the shot that wins is answered by the result
+followed by WIN).
+
+Client -> Server
+----------------
+JOIN <match> [SALVO]         Join (or create) the match with the given id
+WATCH <match>                Watch the match instead (see spectator.py)
+SHIP <start> <stop> <name>   Place a ship (e.g. SHIP A1 A5 Carrier)
+READY                        Finish placing ships
+SHOT <pos>                   Shoot the opponent (e.g. SHOT B4)
+SALVO <pos> <pos> ...        Shoot one salvo in a SALVO match
+BINARY                       Switch the connection to the binary protocol
+QUIT                         Leave the match
+
+Server -> Client
+----------------
+JOINED <player>              Joined as player 1 or 2
+WATCHING <match>             Watching the match, followed by a snapshot
+OK                           The command succeeded
+WAIT                         The opponent is taking their turn
+TURN                         It is your turn to shoot
+MISS | HIT | SAME            The result of your shot
+SUNK <name>                  Your shot sank the named ship
+SALVO <result> <result> ...  The result of each shot of your salvo, followed
+                             by SUNK <name> for every ship it sank
+OPPONENT <pos> <result>      The opponent shot your board
+WIN | LOSE                   The match is over
+LEFT                         The opponent left the match
+ERROR <reason>               The command was rejected
+
+A match created with JOIN <match> SALVO is played in salvo mode: each
+turn is a single SALVO with up to one shot per ship the shooter has afloat.
+
+After BINARY is answered with OK, the client only sends SHOT frames and
+the server only sends RESULT, OPPONENT and STATUS frames (see
+protocol.py). A sunk ship is then given by its number instead of its name.
+'''
+import argparse
+import asyncio
+import battleship
+import metrics
+import protocol
+from battleship import STANDARD_FLEET, Board, Ship
+from gameLog import GameLog, RecorderGroup
+from matchStore import MatchStore
+from spectator import Broadcast
+
+# The length of each ship of the standard fleet, ships with other names are not checked
+FLEET_LENGTHS = dict(STANDARD_FLEET)
+
+
+class ProtocolError(Exception):
+    'Raised when a client sends a command that can not be processed'
+    pass
+
+
+class Match:
+    '''
+    A class to represent a match between two players.
+
+    Attributes
+    ----------
+    matchId: str
+        The id of the match
+
+    boards: list[Board]
+        The board of each player
+
+    writers: list[asyncio.StreamWriter | None]
+        The connection of each player
+
+    ready: list[bool]
+        True once a player has finished placing ships
+
+    turn: int
+        The player whose turn it is
+
+    isOver: bool
+        True once the match has a winner
+
+    winner: int | None
+        The player that won, None until then or if a player left
+
+    binary: list[bool]
+        True for players using the binary protocol
+
+    salvo: bool
+        True if every turn is a salvo
+
+    spectators: Broadcast
+        The spectators watching the match
+
+    Methods
+    -------
+    join(writer): int
+        Adds a player to the match
+
+    leave(player)
+        Removes a player from the match
+
+    placeShip(player, start, stop, name)
+        Places a ship on the board of the player
+
+    setReady(player): str
+        Marks the player as ready
+
+    shoot(player, pos): str
+        Shoots the opponent of the player
+
+    shootSalvo(player, positions): str
+        Shoots a salvo at the opponent of the player
+    '''
+
+    def __init__(self, matchId: str, boardType: type[Board] = Board, salvo: bool = False):
+        '''
+        Constructs all the necesarry attributes for the Match object
+
+        Parameters
+        ----------
+        matchId: str
+            The id of the match
+
+        boardType: type[Board]
+            The board engine used for both players
+
+        salvo: bool
+            True if every turn is a salvo
+        '''
+        self.matchId = matchId
+        self.boards = [boardType(), boardType()]
+        self.writers = [None, None]
+        self.ready = [False, False]
+        self.turn = 0
+        self.isOver = False
+        self.winner = None
+        self.binary = [False, False]
+        self.salvo = salvo
+        self.spectators = Broadcast(self.boards)
+
+    def __getstate__(self):
+        # Connections cannot be pickled, a moved match gets them back one by one
+        state = self.__dict__.copy()
+        state['writers'] = [None, None]
+        return state
+
+    def isStarted(self) -> bool:
+        '''
+        Checks if both players are ready
+
+        Returns
+        -------
+        bool: True if the match has started
+        '''
+        return all(self.ready)
+
+    def encode(self, player: int, line: str) -> bytes:
+        '''
+        Encodes a line for the protocol used by a player
+
+        Parameters
+        ----------
+        player: int
+            The player to encode for
+
+        line: str
+            The line to encode
+
+        Returns
+        -------
+        bytes: The line, or the frame for binary players
+        '''
+        if not self.binary[player]:
+            return line.encode() + b'\n'
+
+        if line.startswith('ERROR'):
+            line = 'ERROR'
+
+        return protocol.textToBytes(line)
+
+    def send(self, player: int, line: str):
+        '''
+        Sends a line to a player if they are connected
+
+        Parameters
+        ----------
+        player: int
+            The player to send to
+
+        line: str
+            The line to send
+        '''
+        writer = self.writers[player]
+        if writer is not None and not writer.is_closing():
+            writer.write(self.encode(player, line))
+
+    def sunkText(self, player: int, board: Board, pos: tuple[int, int]) -> str:
+        '''
+        Describes a sunk ship for the protocol used by a player
+
+        Parameters
+        ----------
+        player: int
+            The player being told
+
+        board: Board
+            The board with the sunk ship
+
+        pos: tuple[int, int]
+            A position on the sunk ship
+
+        Returns
+        -------
+        str: SUNK followed by the name or number of the ship
+        '''
+        ship = board.getShipAtPos(pos)
+        if self.binary[player]:
+            return f'SUNK {board.ships.index(ship) + 1}'
+        return f'SUNK {ship.name}'
+
+    def join(self, writer: asyncio.StreamWriter) -> int:
+        '''
+        Adds a player to the match
+
+        Parameters
+        ----------
+        writer: asyncio.StreamWriter
+            The connection of the player
+
+        Returns
+        -------
+        int: The player number given to the connection
+
+        Raises
+        ------
+        ProtocolError: The match is full
+        '''
+        for player, other in enumerate(self.writers):
+            if other is None:
+                self.writers[player] = writer
+                return player
+
+        raise ProtocolError('FULL')
+
+    def leave(self, player: int):
+        '''
+        Removes a player from the match
+
+        Parameters
+        ----------
+        player: int
+            The player leaving
+        '''
+        self.writers[player] = None
+        if not self.isOver:
+            self.isOver = True
+            self.send(1 - player, 'LEFT')
+            self.spectators.over(None)
+
+    def placeShip(self, player: int, start: str, stop: str, name: str):
+        '''
+        Places a ship on the board of the player
+
+        A ship must run from start to stop down or right, and a ship of the
+        standard fleet must have its length.
+
+        Parameters
+        ----------
+        player: int
+            The player placing the ship
+
+        start: str
+            The start of the ship (e.g. A1)
+
+        stop: str
+            The stop of the ship (e.g. A5)
+
+        name: str
+            The name of the ship
+
+        Raises
+        ------
+        ProtocolError: The ship could not be placed
+        '''
+        if self.ready[player]:
+            raise ProtocolError('READY')
+
+        board = self.boards[player]
+
+        try:
+            ship = Ship(name, board.strToPoint(start), board.strToPoint(stop))
+
+            # A reversed ship covers no cells, and would be sunk before a shot
+            if ship.start[0] > ship.stop[0] or ship.start[1] > ship.stop[1]:
+                raise battleship.InvalidPlacementException
+
+            if FLEET_LENGTHS.get(name, ship.length) != ship.length:
+                raise battleship.InvalidPlacementException
+
+            board.addShip(ship)
+        except battleship.InvalidPlacementException:
+            raise ProtocolError('PLACEMENT')
+        except battleship.OutOfBoundsException:
+            raise ProtocolError('BOUNDS')
+        except battleship.OverlapException:
+            raise ProtocolError('OVERLAP')
+
+    def setReady(self, player: int) -> str:
+        '''
+        Marks the player as ready, starting the match once both are
+
+        Parameters
+        ----------
+        player: int
+            The player that is ready
+
+        Returns
+        -------
+        str: The reply sent to the player
+
+        Raises
+        ------
+        ProtocolError: The player has no ships
+        '''
+        if not self.boards[player].ships:
+            raise ProtocolError('EMPTY')
+
+        self.ready[player] = True
+
+        if not self.isStarted():
+            return 'OK'
+
+        self.spectators.start(self.turn)
+
+        if self.turn == player:
+            self.send(1 - player, 'WAIT')
+            return 'OK\nTURN'
+
+        self.send(self.turn, 'TURN')
+        return 'OK\nWAIT'
+
+    def shoot(self, player: int, pos: tuple[int, int]) -> str:
+        '''
+        Shoots the opponent of the player
+
+        Parameters
+        ----------
+        player: int
+            The player shooting
+
+        pos: tuple[int, int]
+            The position of the shot in (x, y)
+
+        Returns
+        -------
+        str: The result sent to the shooter
+
+        Raises
+        ------
+        ProtocolError: The shot is not allowed
+        '''
+        self.checkTurn(player)
+
+        if self.salvo:
+            raise ProtocolError('SALVO')
+
+        opponent = 1 - player
+        board = self.boards[opponent]
+
+        try:
+            result = board.shoot(pos)
+        except battleship.OutOfBoundsException:
+            raise ProtocolError('BOUNDS')
+
+        if result == 'SAME':
+            return result
+
+        self.spectators.shot(opponent, pos, result)
+
+        text = protocol.cellToText(protocol.posToCell(pos))
+        if result == 'SUNK':
+            self.send(opponent, f'OPPONENT {text} {self.sunkText(opponent, board, pos)}')
+            result = self.sunkText(player, board, pos)
+        else:
+            self.send(opponent, f'OPPONENT {text} {result}')
+
+        if board.isGameOver():
+            self.isOver = True
+            self.winner = player
+            self.send(opponent, 'LOSE')
+            self.spectators.over(player)
+            return f'{result}\nWIN'
+
+        self.turn = opponent
+        self.send(opponent, 'TURN')
+        self.spectators.nextTurn(opponent)
+
+        return result
+
+    def checkTurn(self, player: int):
+        '''
+        Checks that the player may shoot
+
+        Parameters
+        ----------
+        player: int
+            The player shooting
+
+        Raises
+        ------
+        ProtocolError: It is not the turn of the player
+        '''
+        if self.isOver:
+            raise ProtocolError('OVER')
+
+        if not self.isStarted():
+            raise ProtocolError('NOT_STARTED')
+
+        if self.turn != player:
+            raise ProtocolError('TURN')
+
+    def shootSalvo(self, player: int, positions: list[tuple[int, int]]) -> str:
+        '''
+        Shoots a salvo at the opponent of the player
+
+        Parameters
+        ----------
+        player: int
+            The player shooting
+
+        positions: list[tuple[int, int]]
+            The positions of the shots in (x, y)
+
+        Returns
+        -------
+        str: The results sent to the shooter
+
+        Raises
+        ------
+        ProtocolError: The salvo is not allowed
+        '''
+        self.checkTurn(player)
+
+        if not self.salvo:
+            raise ProtocolError('MODE')
+
+        afloat = sum(1 for ship in self.boards[player].ships if not ship.isSunk())
+        if not 0 < len(positions) <= afloat:
+            raise ProtocolError('COUNT')
+
+        opponent = 1 - player
+        board = self.boards[opponent]
+
+        try:
+            results, sunk = board.shootMany(positions)
+        except battleship.OutOfBoundsException:
+            raise ProtocolError('BOUNDS')
+
+        lines = ['SALVO ' + ' '.join(results)]
+        lines += [f'SUNK {ship.name}' for ship in sunk]
+
+        for pos, result in zip(positions, results):
+            if result == 'SAME':
+                continue
+            self.spectators.shot(opponent, pos, result)
+            if result == 'SUNK':
+                result = self.sunkText(opponent, board, pos)
+            self.send(opponent, f'OPPONENT {protocol.cellToText(protocol.posToCell(pos))} {result}')
+
+        if board.isGameOver():
+            self.isOver = True
+            self.winner = player
+            self.send(opponent, 'LOSE')
+            self.spectators.over(player)
+            lines.append('WIN')
+        else:
+            self.turn = opponent
+            self.send(opponent, 'TURN')
+            self.spectators.nextTurn(opponent)
+
+        return '\n'.join(lines)
+
+
+class GameServer:
+    '''
+    A class to represent a server hosting many matches.
+
+    Attributes
+    ----------
+    matches: dict[str, Match]
+        The matches hosted by the server, keyed by id
+
+    boardType: type[Board]
+        The board engine used for new matches
+
+    log: GameLog | None
+        The log every match is recorded to
+
+    store: MatchStore | None
+        The store every match is saved to
+
+    storeIds: dict[str, int]
+        The id in the store of every match being played
+
+    games: int
+        The id in the log of the next match created, after any games
+        already in the log
+
+    detached: set[asyncio.StreamWriter]
+        Connections handed over to another process, which are left open
+        and whose players stay in their match when their handler stops
+
+    server: asyncio.Server | None
+        The listening server once started
+
+    Methods
+    -------
+    start(host, port)
+        Starts listening for connections
+
+    close()
+        Stops the server
+
+    handleClient(reader, writer, game, player)
+        Serves a single connection
+
+    record(game)
+        Sets the recorders of a new match to the log and the store
+
+    removeMatch(game)
+        Removes a match once both players have left
+    '''
+
+    def __init__(self, boardType: type[Board] = Board, log: GameLog | None = None,
+                 store: MatchStore | None = None):
+        '''
+        Constructs all the necesarry attributes for the GameServer object
+
+        Parameters
+        ----------
+        boardType: type[Board]
+            The board engine used for new matches
+
+        log: GameLog | None
+            The log every match is recorded to, if any
+
+        store: MatchStore | None
+            The store every match is saved to, if any
+        '''
+        self.matches = {}
+        self.boardType = boardType
+        self.log = log
+        self.store = store
+        self.storeIds = {}
+        self.games = 0 if log is None else log.nextGame
+        self.detached = set()
+        self.server = None
+
+    async def start(self, host: str = '127.0.0.1', port: int = 0) -> int:
+        '''
+        Starts listening for connections
+
+        Parameters
+        ----------
+        host: str
+            The address to listen on
+
+        port: int
+            The port to listen on, 0 picks a free port
+
+        Returns
+        -------
+        int: The port the server is listening on
+        '''
+        self.server = await asyncio.start_server(self.handleClient, host, port)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        '''
+        Stops the server
+        '''
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+
+    def execute(self, game: Match, player: int, command: str, args: list[str]) -> str:
+        '''
+        Executes a command for a player in a match
+
+        Parameters
+        ----------
+        game: Match
+            The match of the player
+
+        player: int
+            The player sending the command
+
+        command: str
+            The command to run
+
+        args: list[str]
+            The arguments of the command
+
+        Returns
+        -------
+        str: The reply to the player
+
+        Raises
+        ------
+        ProtocolError: The command was rejected
+        '''
+        match(command, len(args)):
+            case ('SHOT', 1):
+                try:
+                    pos = game.boards[player].strToPoint(args[0])
+                except (ValueError, IndexError):
+                    raise ProtocolError('FORMAT')
+                return game.shoot(player, pos)
+            case ('SHIP', n) if n >= 3:
+                try:
+                    game.placeShip(player, args[0], args[1], ' '.join(args[2:]))
+                except (ValueError, IndexError):
+                    raise ProtocolError('FORMAT')
+                return 'OK'
+            case ('READY', 0):
+                return game.setReady(player)
+            case ('SALVO', n) if n >= 1:
+                try:
+                    positions = [game.boards[player].strToPoint(arg) for arg in args]
+                except (ValueError, IndexError):
+                    raise ProtocolError('FORMAT')
+                return game.shootSalvo(player, positions)
+
+        raise ProtocolError('COMMAND')
+
+    async def handleClient(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                           game: Match | None = None, player: int = -1):
+        '''
+        Serves a single connection until it quits or disconnects
+
+        Parameters
+        ----------
+        reader: asyncio.StreamReader
+            The incoming side of the connection
+
+        writer: asyncio.StreamWriter
+            The outgoing side of the connection
+
+        game: Match | None
+            The match the connection already joined, if it is resumed
+
+        player: int
+            The player on the connection, if it is resumed
+        '''
+        try:
+            if game is not None and game.binary[player]:
+                await self.handleBinary(game, player, reader, writer)
+                return
+
+            while line := await reader.readline():
+                command, *args = line.decode(errors='replace').split() or ['']
+
+                if command == 'QUIT':
+                    break
+
+                if command == 'BINARY' and game is not None:
+                    writer.write(b'OK\n')
+                    game.binary[player] = True
+                    await self.handleBinary(game, player, reader, writer)
+                    break
+
+                if command == 'WATCH' and game is None and len(args) == 1:
+                    await self.handleSpectator(args[0], reader, writer)
+                    break
+
+                try:
+                    if game is None:
+                        if command != 'JOIN' or not args or args[1:] not in ([], ['SALVO']):
+                            raise ProtocolError('JOIN')
+
+                        joining = self.matches.get(args[0])
+                        if joining is None:
+                            joining = Match(args[0], self.boardType, args[1:] == ['SALVO'])
+                            self.matches[args[0]] = joining
+                            self.record(joining)
+
+                        # Only a connection that got a seat is bound to the match
+                        player = joining.join(writer)
+                        game = joining
+                        reply = f'JOINED {player + 1}'
+                    else:
+                        reply = self.execute(game, player, command, args)
+                except ProtocolError as e:
+                    reply = f'ERROR {e}'
+
+                writer.write(reply.encode() + b'\n')
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            # A detached connection was handed over open, see detached
+            if writer not in self.detached:
+                if game is not None:
+                    game.leave(player)
+                    if not any(game.writers):
+                        self.removeMatch(game)
+                writer.close()
+
+    def removeMatch(self, game: Match):
+        '''
+        Removes a match once both players have left
+
+        Parameters
+        ----------
+        game: Match
+            The match removed
+        '''
+        self.matches.pop(game.matchId, None)
+        game.spectators.close()
+        if game.matchId in self.storeIds:
+            self.store.endMatch(self.storeIds.pop(game.matchId), game.winner)
+
+    def record(self, game: Match):
+        '''
+        Sets the recorders of a new match to the log and the store
+
+        Parameters
+        ----------
+        game: Match
+            The match created
+        '''
+        recorders = [[], []]
+
+        if self.log is not None:
+            for i in range(2):
+                recorders[i].append(self.log.recorder(self.games, i, game.boards[i].size))
+
+        if self.store is not None:
+            storeId = self.store.newMatch(game.matchId, game.boards[0].size, game.salvo)
+            self.storeIds[game.matchId] = storeId
+            for i in range(2):
+                recorders[i].append(self.store.recorder(storeId, i))
+
+        for board, boardRecorders in zip(game.boards, recorders):
+            if len(boardRecorders) == 1:
+                board.recorder = boardRecorders[0]
+            elif boardRecorders:
+                board.recorder = RecorderGroup(*boardRecorders)
+
+        self.games += 1
+
+    async def handleSpectator(self, matchId: str, reader: asyncio.StreamReader,
+                              writer: asyncio.StreamWriter):
+        '''
+        Serves a connection watching a match until it disconnects
+
+        Parameters
+        ----------
+        matchId: str
+            The id of the match to watch
+
+        reader: asyncio.StreamReader
+            The incoming side of the connection
+
+        writer: asyncio.StreamWriter
+            The outgoing side of the connection
+        '''
+        game = self.matches.get(matchId)
+        if game is None:
+            writer.write(b'ERROR MATCH\n')
+            return
+
+        writer.write(f'WATCHING {matchId}\n'.encode())
+        game.spectators.subscribe(writer)
+        await self.watch(game, reader, writer)
+
+    async def watch(self, game: Match, reader: asyncio.StreamReader,
+                    writer: asyncio.StreamWriter):
+        '''
+        Keeps a subscribed spectator until it disconnects
+
+        Parameters
+        ----------
+        game: Match
+            The match watched
+
+        reader: asyncio.StreamReader
+            The incoming side of the connection
+
+        writer: asyncio.StreamWriter
+            The outgoing side of the connection
+        '''
+        try:
+            # Spectators only listen, anything they send is ignored
+            while await reader.read(1024):
+                pass
+        except ConnectionError:
+            pass
+        finally:
+            game.spectators.unsubscribe(writer)
+
+    async def handleBinary(self, game: Match, player: int, reader: asyncio.StreamReader,
+                           writer: asyncio.StreamWriter):
+        '''
+        Serves a connection that switched to the binary protocol
+
+        Parameters
+        ----------
+        game: Match
+            The match of the player
+
+        player: int
+            The player on the connection
+
+        reader: asyncio.StreamReader
+            The incoming side of the connection
+
+        writer: asyncio.StreamWriter
+            The outgoing side of the connection
+        '''
+        frame = bytearray(protocol.OPPONENT_SIZE)
+        view = memoryview(frame)
+
+        while True:
+            try:
+                view[0] = (await reader.readexactly(1))[0]
+                if view[0] >= len(frame):
+                    break
+                view[1:view[0] + 1] = await reader.readexactly(view[0])
+            except asyncio.IncompleteReadError:
+                break
+
+            try:
+                if protocol.frameType(view, 0) != protocol.SHOT:
+                    raise ProtocolError('COMMAND')
+                reply = game.shoot(player, protocol.cellToPos(protocol.decodeShot(view, 0)))
+            except protocol.FrameError:
+                break
+            except ProtocolError:
+                reply = 'ERROR'
+
+            for line in reply.split('\n'):
+                writer.write(game.encode(player, line))
+            await writer.drain()
+
+
+async def writeMetrics(path: str, interval: float):
+    '''
+    Writes a snapshot of the metrics every interval seconds
+
+    Parameters
+    ----------
+    path: str
+        The file written, see metrics.writeSnapshot
+
+    interval: float
+        The seconds between snapshots
+    '''
+    while True:
+        await asyncio.sleep(interval)
+        metrics.writeSnapshot(path)
+
+
+async def serve(host: str, port: int, log: GameLog | None = None,
+                metricsPath: str | None = None, metricsInterval: float = 10.0,
+                store: MatchStore | None = None):
+    '''
+    Runs a GameServer forever
+
+    Parameters
+    ----------
+    host: str
+        The address to listen on
+
+    port: int
+        The port to listen on
+
+    log: GameLog | None
+        The log every match is recorded to, if any
+
+    metricsPath: str | None
+        The file metrics are written to, if any
+
+    metricsInterval: float
+        The seconds between metrics snapshots
+
+    store: MatchStore | None
+        The store every match is saved to, if any
+    '''
+    server = GameServer(log=log, store=store)
+    port = await server.start(host, port)
+    print(f'Listening on {host}:{port}')
+
+    if metricsPath is not None:
+        metrics.enable()
+        writer = asyncio.create_task(writeMetrics(metricsPath, metricsInterval))
+
+    try:
+        await server.server.serve_forever()
+    finally:
+        if metricsPath is not None:
+            writer.cancel()
+            metrics.writeSnapshot(metricsPath)
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description='Host battleship matches.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=5000)
+    parser.add_argument('--log', help='append every match to this game log')
+    parser.add_argument('--metrics', help='write metrics to this file (.json or Prometheus text)')
+    parser.add_argument('--metrics-interval', type=float, default=10.0)
+    parser.add_argument('--store', help='save every match to this SQLite database')
+    args = parser.parse_args(argv)
+
+    log = GameLog(args.log) if args.log else None
+    store = MatchStore(args.store) if args.store else None
+
+    try:
+        asyncio.run(serve(args.host, args.port, log, args.metrics, args.metrics_interval, store))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if log is not None:
+            log.close()
+        if store is not None:
+            store.close()
+
+    return 0
+
+
+if __name__ == '__main__':
+    main()
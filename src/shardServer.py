@@ -0,0 +1,945 @@
+'''
+File: shardServer.py
+Auth: Blake Wingard - bats23456789@gmail.com
+Date: 10/18/2026
+Desc: A match server spread over one worker process per core.
+
+Move resolution is CPU bound Python, so a single server process is held
+back by the GIL. Here a front-end process only accepts connections and
+reads up to the first JOIN or WATCH to learn the match id. It then hands
+the socket itself, with the bytes already read, to the worker hosting the
+match, which serves it with a regular GameServer. Once a connection is
+handed over, nothing about the match goes through the front-end.
+
+A new match goes to the worker hosting the fewest matches. When the
+busiest worker has MOVE_GAP more matches than the idlest, one of its
+matches is moved: the worker stops the connections of the match between
+commands, pickles the Match and hands its sockets, with any bytes not yet
+read, to the idlest worker. Players only notice the pause. Matches with a
+binary connection, or with more connections than fit in one message, are
+not moved.
+
+The front-end and each worker talk over a Unix SOCK_SEQPACKET socket pair,
+so this needs Linux. A message is a pickled tuple, sent with any sockets
+attached by socket.send_fds.
+
+Front-end -> Worker
+-------------------
+('CLIENT', match, data) + socket                Serve a new connection
+('MOVE', match)                                 Hand the match back
+('ADOPT', match, game, roles, left) + sockets   Serve a moved match
+
+Worker -> Front-end
+-------------------
+('CLOSED', match)                               A connection closed
+('MOVED', match, game, roles, left) + sockets   The match handed back,
+                                                game is None if it stays
+
+roles has a (role, data) pair for every socket: the player on it, WATCHER
+for a spectator or None for a connection that has not joined yet, and the
+bytes read from it but not yet handled. left has the players whose
+connection was lost during the move.
+'''
+import argparse
+import asyncio
+import multiprocessing
+import os
+import pickle
+import random
+import socket
+from battleship import Board
+from server import GameServer, Match
+
+CLIENT = 'CLIENT'
+MOVE = 'MOVE'
+ADOPT = 'ADOPT'
+CLOSED = 'CLOSED'
+MOVED = 'MOVED'
+
+WATCHER = 'WATCH'
+
+# The most sockets sent in one message, Linux allows 253
+MAX_FDS = 250
+MAX_MESSAGE = 1 << 20
+# The longest first line read by the front-end
+MAX_LINE = 1024
+# How many more matches the busiest worker has before one is moved
+MOVE_GAP = 2
+# The most seconds a moving connection may take to send what it has queued
+MOVE_TIMEOUT = 1.0
+
+
+class Channel:
+    '''
+    A class to represent one end of the socket pair between the front-end
+    and a worker.
+
+    Messages are queued and sent in order by a single task, so the order
+    they are sent in is the order send was called in.
+
+    Attributes
+    ----------
+    sock: socket.socket
+        The SOCK_SEQPACKET socket
+
+    outbox: asyncio.Queue
+        The pickled messages waiting to be sent, with their sockets
+
+    sender: asyncio.Task
+        The task sending the queued messages
+
+    Methods
+    -------
+    send(message, socks)
+        Queues a message
+
+    receive(): tuple[tuple | None, list[socket.socket]]
+        Waits for the next message
+
+    close()
+        Closes the channel
+    '''
+
+    def __init__(self, sock: socket.socket):
+        '''
+        Constructs all the necesarry attributes for the Channel object
+
+        Must be called with the event loop running.
+
+        Parameters
+        ----------
+        sock: socket.socket
+            The SOCK_SEQPACKET socket
+        '''
+        sock.setblocking(False)
+        self.sock = sock
+        self.outbox = asyncio.Queue()
+        self.sender = asyncio.create_task(self.sendAll())
+
+    async def ready(self, write: bool = False):
+        '''
+        Waits until the socket can be read or written
+
+        Parameters
+        ----------
+        write: bool
+            True to wait until it can be written
+        '''
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        fd = self.sock.fileno()
+
+        def wake():
+            if not future.done():
+                future.set_result(None)
+
+        if write:
+            loop.add_writer(fd, wake)
+        else:
+            loop.add_reader(fd, wake)
+
+        try:
+            await future
+        finally:
+            if write:
+                loop.remove_writer(fd)
+            else:
+                loop.remove_reader(fd)
+
+    def send(self, message: tuple, socks: list[socket.socket] = ()):
+        '''
+        Queues a message
+
+        The message is pickled right away. The sockets are closed once
+        they are sent, the other process gets its own copy of them.
+
+        Parameters
+        ----------
+        message: tuple
+            The message
+
+        socks: list[socket.socket]
+            The sockets sent with the message
+        '''
+        self.outbox.put_nowait((pickle.dumps(message), socks))
+
+    async def sendAll(self):
+        '''
+        Sends the queued messages until the channel is closed
+        '''
+        while True:
+            data, socks = await self.outbox.get()
+            fds = [sock.fileno() for sock in socks]
+
+            while True:
+                try:
+                    socket.send_fds(self.sock, [data], fds)
+                    break
+                except BlockingIOError:
+                    await self.ready(write=True)
+                except OSError:
+                    # The other process is gone, so are the connections
+                    break
+
+            for sock in socks:
+                sock.close()
+
+    async def receive(self) -> tuple[tuple | None, list[socket.socket]]:
+        '''
+        Waits for the next message
+
+        Returns
+        -------
+        tuple[tuple | None, list[socket.socket]]: The message, None once
+        the other process is gone, and the sockets sent with it
+        '''
+        while True:
+            try:
+                data, fds, flags, address = socket.recv_fds(self.sock, MAX_MESSAGE, MAX_FDS)
+                break
+            except BlockingIOError:
+                await self.ready()
+            except ConnectionError:
+                return None, []
+
+        socks = [socket.socket(fileno=fd) for fd in fds]
+        if not data:
+            return None, socks
+
+        return pickle.loads(data), socks
+
+    def close(self):
+        '''
+        Closes the channel
+        '''
+        self.sender.cancel()
+        self.sock.close()
+
+
+class ShardWorker(GameServer):
+    '''
+    A class to represent the GameServer of a worker process.
+
+    Attributes
+    ----------
+    control: socket.socket
+        The socket to the front-end
+
+    channel: Channel | None
+        The channel to the front-end, once running
+
+    connections: dict[str, list[tuple[asyncio.Task, asyncio.StreamReader, asyncio.StreamWriter]]]
+        The handler task and streams of every connection, keyed by the
+        match it was routed for
+
+    Methods
+    -------
+    run()
+        Serves what the front-end sends until it is gone
+
+    connect(sock, data): tuple[asyncio.StreamReader, asyncio.StreamWriter]
+        Opens streams on a connection handed over by the front-end
+
+    serve(matchId, reader, writer, role, game)
+        Starts serving a connection
+
+    moveMatch(matchId)
+        Hands a match back to the front-end
+
+    adopt(matchId, game, roles, left, socks)
+        Serves a match moved from another worker
+    '''
+
+    def __init__(self, control: socket.socket, boardType: type[Board] = Board):
+        '''
+        Constructs all the necesarry attributes for the ShardWorker object
+
+        Parameters
+        ----------
+        control: socket.socket
+            The socket to the front-end
+
+        boardType: type[Board]
+            The board engine used for new matches
+        '''
+        super().__init__(boardType)
+        self.control = control
+        self.channel = None
+        self.connections = {}
+
+    async def run(self):
+        '''
+        Serves what the front-end sends until it is gone
+        '''
+        self.channel = Channel(self.control)
+
+        while True:
+            message, socks = await self.channel.receive()
+            if message is None:
+                break
+
+            kind, matchId, *args = message
+
+            # Messages are handled one at a time, in the order they were sent
+            if kind == CLIENT:
+                self.serve(matchId, *await self.connect(socks[0], args[0]))
+            elif kind == MOVE:
+                await self.moveMatch(matchId)
+            elif kind == ADOPT:
+                await self.adopt(matchId, *args, socks)
+
+        self.channel.close()
+
+    async def connect(self, sock: socket.socket,
+                      data: bytes) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        '''
+        Opens streams on a connection handed over by the front-end
+
+        Parameters
+        ----------
+        sock: socket.socket
+            The connection
+
+        data: bytes
+            The bytes already read from the connection
+
+        Returns
+        -------
+        tuple[asyncio.StreamReader, asyncio.StreamWriter]: The streams, with
+        the bytes already read waiting in the reader
+        '''
+        loop = asyncio.get_running_loop()
+        reader = asyncio.StreamReader()
+        reader.feed_data(data)
+        transport, protocol = await loop.connect_accepted_socket(
+            lambda: asyncio.StreamReaderProtocol(reader), sock)
+
+        return reader, asyncio.StreamWriter(transport, protocol, reader, loop)
+
+    def serve(self, matchId: str, reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+              role: int | str | None = None, game: Match | None = None):
+        '''
+        Starts serving a connection
+
+        Parameters
+        ----------
+        matchId: str
+            The match the connection was routed for
+
+        reader: asyncio.StreamReader
+            The incoming side of the connection
+
+        writer: asyncio.StreamWriter
+            The outgoing side of the connection
+
+        role: int | str | None
+            The player on the connection, WATCHER for a spectator or None
+            for a connection that has not joined yet
+
+        game: Match | None
+            The match, for a connection that already joined it
+        '''
+        if role is None:
+            handler = self.handleClient(reader, writer)
+        elif role == WATCHER:
+            # Subscribed now, not once the task runs, so a match moved again
+            # right away still knows its spectators
+            game.spectators.subscribe(writer)
+            handler = self.spectate(game, reader, writer)
+        else:
+            game.writers[role] = writer
+            handler = self.handleClient(reader, writer, game, role)
+
+        connection = (asyncio.create_task(handler), reader, writer)
+        self.connections.setdefault(matchId, []).append(connection)
+        connection[0].add_done_callback(lambda task: self.closed(matchId, connection))
+
+    def closed(self, matchId: str, connection: tuple):
+        '''
+        Tells the front-end that a connection closed
+
+        Parameters
+        ----------
+        matchId: str
+            The match the connection was routed for
+
+        connection: tuple
+            The handler task and streams of the connection
+        '''
+        connections = self.connections.get(matchId, [])
+
+        # Connections of a moved match were removed before they stopped
+        if connection in connections:
+            connections.remove(connection)
+            if not connections:
+                del self.connections[matchId]
+            self.channel.send((CLOSED, matchId))
+
+    async def spectate(self, game: Match, reader: asyncio.StreamReader,
+                       writer: asyncio.StreamWriter):
+        '''
+        Serves a spectator of a moved match until it disconnects
+
+        Parameters
+        ----------
+        game: Match
+            The match watched
+
+        reader: asyncio.StreamReader
+            The incoming side of the connection
+
+        writer: asyncio.StreamWriter
+            The outgoing side of the connection
+        '''
+        try:
+            await self.watch(game, reader, writer)
+        finally:
+            if writer not in self.detached:
+                writer.close()
+
+    async def moveMatch(self, matchId: str):
+        '''
+        Hands a match back to the front-end
+
+        The handler of every connection is stopped while it waits for
+        input, which is between commands, and the replies already written
+        are sent before the sockets are handed back.
+
+        Parameters
+        ----------
+        matchId: str
+            The match to move
+        '''
+        game = self.matches.get(matchId)
+        connections = self.connections.get(matchId, [])
+
+        if (game is None or any(game.binary) or len(connections) > MAX_FDS
+                or any(writer.transport.get_write_buffer_size() > game.spectators.limit
+                       for task, reader, writer in connections)):
+            self.channel.send((MOVED, matchId, None, [], []))
+            return
+
+        del self.connections[matchId]
+        del self.matches[matchId]
+
+        # Connections that already stopped are not moved
+        for connection in [connection for connection in connections if connection[0].done()]:
+            connections.remove(connection)
+            self.channel.send((CLOSED, matchId))
+
+        roles = []
+        for task, reader, writer in connections:
+            if writer in game.writers:
+                roles.append(game.writers.index(writer))
+            elif writer in game.spectators.writers:
+                roles.append(WATCHER)
+            else:
+                roles.append(None)
+
+            self.detached.add(writer)
+            writer.transport.pause_reading()
+            task.cancel()
+
+        await asyncio.gather(*(task for task, reader, writer in connections),
+                             return_exceptions=True)
+
+        moved = []
+        socks = []
+        left = []
+
+        for role, (task, reader, writer) in zip(roles, connections):
+            self.detached.discard(writer)
+            writer.transport.set_write_buffer_limits(0)
+
+            try:
+                await asyncio.wait_for(writer.drain(), MOVE_TIMEOUT)
+            except (asyncio.TimeoutError, ConnectionError):
+                writer.transport.abort()
+                self.channel.send((CLOSED, matchId))
+                if isinstance(role, int):
+                    left.append(role)
+                continue
+
+            reader.feed_eof()
+            moved.append((role, await reader.read()))
+            socks.append(writer.get_extra_info('socket').dup())
+            writer.transport.abort()
+
+        self.channel.send((MOVED, matchId, game, moved, left), socks)
+
+    async def adopt(self, matchId: str, game: Match, roles: list[tuple], left: list[int],
+                    socks: list[socket.socket]):
+        '''
+        Serves a match moved from another worker
+
+        Parameters
+        ----------
+        matchId: str
+            The id of the match
+
+        game: Match
+            The match, without its connections
+
+        roles: list[tuple]
+            The role and unread bytes of every socket
+
+        left: list[int]
+            The players whose connection was lost during the move
+
+        socks: list[socket.socket]
+            The connections of the match
+        '''
+        streams = [await self.connect(sock, data) for (role, data), sock in zip(roles, socks)]
+
+        # Every connection is back before any of them is served, so nothing
+        # is sent to a player whose connection is still missing
+        self.matches[matchId] = game
+        for (role, data), (reader, writer) in zip(roles, streams):
+            self.serve(matchId, reader, writer, role, game)
+
+        for player in left:
+            game.leave(player)
+
+        if not any(game.writers):
+            self.removeMatch(game)
+
+
+def runWorker(control: socket.socket, boardType: type[Board] = Board):
+    '''
+    Runs a ShardWorker until the front-end is gone
+
+    Parameters
+    ----------
+    control: socket.socket
+        The socket to the front-end
+
+    boardType: type[Board]
+        The board engine used for new matches
+    '''
+    try:
+        asyncio.run(ShardWorker(control, boardType).run())
+    except KeyboardInterrupt:
+        pass
+
+
+class ShardServer:
+    '''
+    A class to represent the front-end routing connections to workers.
+
+    Attributes
+    ----------
+    workers: int
+        The number of worker processes
+
+    boardType: type[Board]
+        The board engine used for new matches
+
+    rebalanceInterval: float
+        The seconds between checks for uneven load, 0 to never move matches
+
+    processes: list[multiprocessing.Process]
+        The worker processes
+
+    channels: list[Channel | None]
+        The channel to each worker, None once the worker is gone
+
+    routes: dict[str, list[int]]
+        The worker hosting every match and its number of open connections
+
+    moving: dict[str, tuple[int, list]]
+        The worker every moving match goes to, and the connections for it
+        held until it gets there
+
+    listener: socket.socket | None
+        The listening socket once started
+
+    tasks: set[asyncio.Task]
+        The tasks of the front-end, kept until they are done
+
+    Methods
+    -------
+    start(host, port): int
+        Starts the workers and listens for connections
+
+    close()
+        Stops the server and its workers
+
+    moveMatch(matchId, target)
+        Starts moving a match to another worker
+
+    loads(): list[int]
+        Gets the number of matches on each worker
+    '''
+
+    def __init__(self, workers: int | None = None, boardType: type[Board] = Board,
+                 rebalanceInterval: float = 1.0):
+        '''
+        Constructs all the necesarry attributes for the ShardServer object
+
+        Parameters
+        ----------
+        workers: int | None
+            The number of worker processes, one per core if None
+
+        boardType: type[Board]
+            The board engine used for new matches
+
+        rebalanceInterval: float
+            The seconds between checks for uneven load, 0 to never move
+            matches
+        '''
+        self.workers = workers or os.cpu_count() or 1
+        self.boardType = boardType
+        self.rebalanceInterval = rebalanceInterval
+        self.processes = []
+        self.channels = []
+        self.routes = {}
+        self.moving = {}
+        self.listener = None
+        self.tasks = set()
+
+    def spawn(self, coroutine):
+        '''
+        Runs a coroutine as a task of the front-end
+
+        Parameters
+        ----------
+        coroutine: Coroutine
+            The coroutine to run
+        '''
+        task = asyncio.create_task(coroutine)
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+    async def start(self, host: str = '127.0.0.1', port: int = 0) -> int:
+        '''
+        Starts the workers and listens for connections
+
+        Parameters
+        ----------
+        host: str
+            The address to listen on
+
+        port: int
+            The port to listen on, 0 picks a free port
+
+        Returns
+        -------
+        int: The port the server is listening on
+        '''
+        # Spawned, not forked, since the event loop is already running
+        context = multiprocessing.get_context('spawn')
+
+        for shard in range(self.workers):
+            control, child = socket.socketpair(socket.AF_UNIX, socket.SOCK_SEQPACKET)
+            process = context.Process(target=runWorker, args=(child, self.boardType), daemon=True)
+            process.start()
+            child.close()
+
+            self.processes.append(process)
+            self.channels.append(Channel(control))
+            self.spawn(self.listen(shard))
+
+        self.listener = socket.create_server((host, port))
+        self.listener.setblocking(False)
+        self.spawn(self.acceptClients())
+
+        if self.rebalanceInterval > 0:
+            self.spawn(self.rebalance())
+
+        return self.listener.getsockname()[1]
+
+    async def close(self):
+        '''
+        Stops the server and its workers
+        '''
+        for task in list(self.tasks):
+            task.cancel()
+
+        if self.listener is not None:
+            self.listener.close()
+
+        for channel in self.channels:
+            if channel is not None:
+                channel.close()
+
+        # Workers stop once their channel is closed
+        for process in self.processes:
+            await asyncio.to_thread(process.join, 5)
+            if process.is_alive():
+                process.terminate()
+
+    async def acceptClients(self):
+        '''
+        Accepts connections until the server is closed
+        '''
+        loop = asyncio.get_running_loop()
+
+        while True:
+            sock, address = await loop.sock_accept(self.listener)
+            self.spawn(self.route(sock))
+
+    async def route(self, sock: socket.socket):
+        '''
+        Reads a connection up to its JOIN or WATCH and hands it to a worker
+
+        Other commands are answered like GameServer would, before a match
+        is joined.
+
+        Parameters
+        ----------
+        sock: socket.socket
+            The connection
+        '''
+        loop = asyncio.get_running_loop()
+        data = b''
+
+        try:
+            while True:
+                while b'\n' not in data:
+                    chunk = await loop.sock_recv(sock, 4096)
+                    if not chunk or len(data) > MAX_LINE:
+                        sock.close()
+                        return
+                    data += chunk
+
+                line, rest = data.split(b'\n', 1)
+                command, *args = line.decode(errors='replace').split() or ['']
+
+                if command == 'QUIT':
+                    sock.close()
+                    return
+
+                if command == 'WATCH' and len(args) == 1:
+                    if args[0] in self.routes:
+                        break
+                    await loop.sock_sendall(sock, b'ERROR MATCH\n')
+                    sock.close()
+                    return
+
+                if command == 'JOIN' and args and args[1:] in ([], ['SALVO']):
+                    break
+
+                await loop.sock_sendall(sock, b'ERROR JOIN\n')
+                data = rest
+        except ConnectionError:
+            sock.close()
+            return
+
+        self.dispatch(args[0], sock, data)
+
+    def dispatch(self, matchId: str, sock: socket.socket, data: bytes):
+        '''
+        Hands a connection to the worker hosting its match
+
+        Parameters
+        ----------
+        matchId: str
+            The match joined or watched
+
+        sock: socket.socket
+            The connection
+
+        data: bytes
+            The bytes already read from the connection
+        '''
+        if matchId in self.moving:
+            self.moving[matchId][1].append((sock, data))
+            return
+
+        route = self.routes.get(matchId)
+        if route is None:
+            loads = self.loads()
+            shard = min((shard for shard, channel in enumerate(self.channels) if channel is not None),
+                        key=lambda shard: loads[shard])
+            route = self.routes[matchId] = [shard, 0]
+
+        route[1] += 1
+        self.channels[route[0]].send((CLIENT, matchId, data), [sock])
+
+    async def listen(self, shard: int):
+        '''
+        Handles the messages of a worker until it is gone
+
+        Parameters
+        ----------
+        shard: int
+            The worker
+        '''
+        channel = self.channels[shard]
+
+        while True:
+            message, socks = await channel.receive()
+            if message is None:
+                break
+
+            kind, matchId, *args = message
+
+            if kind == CLOSED:
+                self.closed(matchId)
+            elif kind == MOVED:
+                self.moved(matchId, *args, socks)
+
+        # The worker is gone and so are its matches
+        self.channels[shard] = None
+        channel.close()
+        for matchId in [matchId for matchId, route in self.routes.items() if route[0] == shard]:
+            del self.routes[matchId]
+
+    def closed(self, matchId: str):
+        '''
+        Forgets a match once its last connection is closed
+
+        Parameters
+        ----------
+        matchId: str
+            The match of the closed connection
+        '''
+        route = self.routes.get(matchId)
+        if route is None:
+            return
+
+        route[1] -= 1
+        if route[1] == 0 and matchId not in self.moving:
+            del self.routes[matchId]
+
+    def moved(self, matchId: str, game: Match | None, roles: list[tuple], left: list[int],
+              socks: list[socket.socket]):
+        '''
+        Passes a match handed back by a worker on to its new worker
+
+        Parameters
+        ----------
+        matchId: str
+            The id of the match
+
+        game: Match | None
+            The match, None if it stays where it is
+
+        roles: list[tuple]
+            The role and unread bytes of every socket
+
+        left: list[int]
+            The players whose connection was lost during the move
+
+        socks: list[socket.socket]
+            The connections of the match
+        '''
+        target, held = self.moving.pop(matchId)
+        route = self.routes.get(matchId)
+
+        if route is None:
+            route = self.routes[matchId] = [target, 0]
+
+        if game is not None and self.channels[target] is not None:
+            route[0] = target
+            self.channels[target].send((ADOPT, matchId, game, roles, left), socks)
+
+        for sock, data in held:
+            route[1] += 1
+            self.channels[route[0]].send((CLIENT, matchId, data), [sock])
+
+        if route[1] == 0:
+            del self.routes[matchId]
+
+    def loads(self) -> list[int]:
+        '''
+        Gets the number of matches on each worker
+
+        Returns
+        -------
+        list[int]: The number of matches routed to each worker
+        '''
+        loads = [0] * len(self.channels)
+        for shard, connections in self.routes.values():
+            loads[shard] += 1
+
+        return loads
+
+    def moveMatch(self, matchId: str, target: int):
+        '''
+        Starts moving a match to another worker
+
+        Connections for the match are held until the move is done.
+
+        Parameters
+        ----------
+        matchId: str
+            The match to move
+
+        target: int
+            The worker to move it to
+        '''
+        self.moving[matchId] = (target, [])
+        self.channels[self.routes[matchId][0]].send((MOVE, matchId))
+
+    async def rebalance(self):
+        '''
+        Moves a match from the busiest to the idlest worker every interval,
+        when the difference is at least MOVE_GAP
+        '''
+        while True:
+            await asyncio.sleep(self.rebalanceInterval)
+
+            live = [shard for shard, channel in enumerate(self.channels) if channel is not None]
+            if self.moving or len(live) < 2:
+                continue
+
+            loads = self.loads()
+            busiest = max(live, key=lambda shard: loads[shard])
+            idlest = min(live, key=lambda shard: loads[shard])
+
+            if loads[busiest] - loads[idlest] >= MOVE_GAP:
+                matchId = random.choice([matchId for matchId, route in self.routes.items()
+                                         if route[0] == busiest])
+                self.moveMatch(matchId, idlest)
+
+
+async def serve(host: str, port: int, workers: int | None = None,
+                rebalanceInterval: float = 1.0):
+    '''
+    Runs a ShardServer forever
+
+    Parameters
+    ----------
+    host: str
+        The address to listen on
+
+    port: int
+        The port to listen on
+
+    workers: int | None
+        The number of worker processes, one per core if None
+
+    rebalanceInterval: float
+        The seconds between checks for uneven load, 0 to never move matches
+    '''
+    server = ShardServer(workers, rebalanceInterval=rebalanceInterval)
+    port = await server.start(host, port)
+    print(f'Listening on {host}:{port} with {server.workers} workers')
+
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.close()
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description='Host battleship matches on every core.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=5000)
+    parser.add_argument('--workers', type=int, help='worker processes, one per core by default')
+    parser.add_argument('--rebalance-interval', type=float, default=1.0,
+                        help='seconds between moving matches off busy workers, 0 to never move')
+    args = parser.parse_args(argv)
+
+    try:
+        asyncio.run(serve(args.host, args.port, args.workers, args.rebalance_interval))
+    except KeyboardInterrupt:
+        pass
+
+    return 0
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+'''
+File: shipBench.py
+Auth: Blake Wingard - bats23456789@gmail.com
+Date: 10/18/2026
+Desc: Compares the memory and speed of Ship with the list backed Ship it replaced.
+'''
+import timeit
+import tracemalloc
+from battleship import Ship, InvalidPlacementException
+
+
+class LegacyShip:
+    '''
+    The original Ship, storing its hits as a list of bools in a __dict__.
+    '''
+
+    def __init__(self, name: str, start: tuple[int, int], stop: tuple[int, int]):
+        if start[0] != stop[0] and start[1] != stop[1]:
+            raise InvalidPlacementException
+
+        self.name = name
+        self.start = start
+        self.stop = stop
+
+        if start[0] == stop[0]:
+            self.hits = [False for i in range(start[1], stop[1] + 1)]
+        else:
+            self.hits = [False for i in range(start[0], stop[0] + 1)]
+
+    def __len__(self):
+        return len(self.hits)
+
+    def shoot(self, shot: tuple[int, int]) -> bool:
+        if self.posOnShip(shot):
+            key = shot[0] - self.start[0] + shot[1] - self.start[1]
+            self.hits[key] = True
+            return True
+        else:
+            return False
+
+    def isSunk(self) -> bool:
+        return all(self.hits)
+
+    def posOnShip(self, pos: tuple[int, int]) -> bool:
+        return self.start[0] <= pos[0] <= self.stop[0]\
+            and self.start[1] <= pos[1] <= self.stop[1]
+
+
+def measureMemory(shipType: type, count: int) -> float:
+    '''
+    Measures the memory used by ships
+
+    Parameters
+    ----------
+    shipType: type
+        The ship class to create
+
+    count: int
+        The number of ships to create
+
+    Returns
+    -------
+    float: The bytes used per ship
+    '''
+    tracemalloc.start()
+    ships = [shipType('Carrier', (0, i % 10), (4, i % 10)) for i in range(count)]
+    used = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    del ships
+    return used / count
+
+
+def measureSpeed(shipType: type, number: int) -> float:
+    '''
+    Measures sinking a ship one shot at a time, checking isSunk after each
+
+    Parameters
+    ----------
+    shipType: type
+        The ship class to create
+
+    number: int
+        The number of ships to sink
+
+    Returns
+    -------
+    float: The seconds per ship
+    '''
+    shots = [(x, 0) for x in range(5)]
+
+    def sink():
+        ship = shipType('Carrier', (0, 0), (4, 0))
+        for shot in shots:
+            ship.shoot(shot)
+            ship.isSunk()
+
+    return min(timeit.repeat(sink, number=number, repeat=3)) / number
+
+
+def main():
+    count = 100000
+
+    for shipType in (LegacyShip, Ship):
+        memory = measureMemory(shipType, count)
+        speed = measureSpeed(shipType, count)
+        print(f'{shipType.__name__:>10}: {memory:.0f} bytes/ship, '
+              f'{speed * 1e6:.2f}us to sink a ship')
+
+    return 0
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,206 @@
+'''
+File: simulator.py
+Auth: Blake Wingard - bats23456789@gmail.com
+Date: 10/18/2026
+Desc: A headless simulator playing many games between strategies.
+
+Games are split into chunks that run on a process pool. Every game is
+seeded from the simulation seed and its own number, so the results do not
+depend on the number of workers or the size of the chunks.
+'''
+import argparse
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from bitBoard import BitBoard
+from placement import randomBoard
+from strategies import Strategy, STRATEGIES
+
+
+def gameSeed(seed: int, game: int) -> str:
+    '''
+    Gets the seed of a single game
+
+    Parameters
+    ----------
+    seed: int
+        The seed of the simulation
+
+    game: int
+        The number of the game
+
+    Returns
+    -------
+    str: The seed of the game
+    '''
+    return f'{seed}:{game}'
+
+
+def playGame(strategy1, strategy2, seed: str) -> tuple[int, int]:
+    '''
+    Plays a single game between two strategies
+
+    Player 1 shoots first. Each player gets a random fleet and their own
+    source of randomness.
+
+    Parameters
+    ----------
+    strategy1: Callable[[random.Random], Strategy]
+        The strategy of player 1
+
+    strategy2: Callable[[random.Random], Strategy]
+        The strategy of player 2
+
+    seed: str
+        The seed of the game
+
+    Returns
+    -------
+    tuple[int, int]: The winner (0 or 1) and the number of shots they took
+    '''
+    rng = random.Random(seed)
+    boards = [randomBoard(rng, boardType=BitBoard), randomBoard(rng, boardType=BitBoard)]
+    players: list[Strategy] = [
+        strategy1(random.Random(rng.getrandbits(64))),
+        strategy2(random.Random(rng.getrandbits(64))),
+    ]
+    shots = [next(players[0]), next(players[1])]
+    counts = [0, 0]
+    turn = 0
+
+    while True:
+        # A player shoots the board of the other player
+        board = boards[1 - turn]
+        result = board.shoot(shots[turn])
+        counts[turn] += 1
+
+        if result == 'SUNK' and board.isGameOver():
+            return turn, counts[turn]
+
+        shots[turn] = players[turn].send(result)
+        turn = 1 - turn
+
+
+def playChunk(strategy1, strategy2, seed: int, start: int, stop: int) -> list[int]:
+    '''
+    Plays a range of games and totals the results
+
+    Parameters
+    ----------
+    strategy1: Callable[[random.Random], Strategy]
+        The strategy of player 1
+
+    strategy2: Callable[[random.Random], Strategy]
+        The strategy of player 2
+
+    seed: int
+        The seed of the simulation
+
+    start: int
+        The number of the first game
+
+    stop: int
+        The number after the last game
+
+    Returns
+    -------
+    list[int]: The wins of each player followed by the shots each player took to win
+    '''
+    totals = [0, 0, 0, 0]
+
+    for game in range(start, stop):
+        winner, shots = playGame(strategy1, strategy2, gameSeed(seed, game))
+        totals[winner] += 1
+        totals[2 + winner] += shots
+
+    return totals
+
+
+def simulate(strategy1, strategy2, games: int, seed: int = 0, workers: int | None = None,
+             chunkSize: int = 1000) -> dict[str, float]:
+    '''
+    Plays many games between two strategies
+
+    Parameters
+    ----------
+    strategy1: Callable[[random.Random], Strategy]
+        The strategy of player 1
+
+    strategy2: Callable[[random.Random], Strategy]
+        The strategy of player 2
+
+    games: int
+        The number of games to play
+
+    seed: int
+        The seed of the simulation
+
+    workers: int | None
+        The number of worker processes, None for one per core and 1 to
+        play every game in this process
+
+    chunkSize: int
+        The number of games given to a worker at a time
+
+    Returns
+    -------
+    dict[str, float]: The win rate and the average shots to win of each
+    player, the average shots to win overall and the games per second
+    '''
+    chunks = [(start, min(start + chunkSize, games)) for start in range(0, games, chunkSize)]
+    totals = [0, 0, 0, 0]
+
+    begin = time.perf_counter()
+
+    if workers == 1:
+        results = [playChunk(strategy1, strategy2, seed, *chunk) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(workers) as pool:
+            results = list(pool.map(playChunk, [strategy1] * len(chunks),
+                                    [strategy2] * len(chunks), [seed] * len(chunks),
+                                    *zip(*chunks)))
+
+    elapsed = time.perf_counter() - begin
+
+    for result in results:
+        totals = [total + value for total, value in zip(totals, result)]
+
+    wins = totals[:2]
+    shots = totals[2:]
+
+    return {
+        'games': games,
+        'winRate1': wins[0] / games if games else 0,
+        'winRate2': wins[1] / games if games else 0,
+        'shotsToWin1': shots[0] / wins[0] if wins[0] else 0,
+        'shotsToWin2': shots[1] / wins[1] if wins[1] else 0,
+        'shotsToWin': sum(shots) / games if games else 0,
+        'gamesPerSecond': games / elapsed if elapsed else 0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Play many headless games between strategies.')
+    parser.add_argument('strategy1', choices=STRATEGIES)
+    parser.add_argument('strategy2', choices=STRATEGIES)
+    parser.add_argument('--games', type=int, default=10000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--chunk', type=int, default=1000)
+    args = parser.parse_args()
+
+    stats = simulate(STRATEGIES[args.strategy1], STRATEGIES[args.strategy2], args.games,
+                     args.seed, args.workers, args.chunk)
+
+    print(f'{stats["games"]} games at {stats["gamesPerSecond"]:.0f} games/s')
+    print(f'{args.strategy1}: {stats["winRate1"]:.1%} wins, '
+          f'{stats["shotsToWin1"]:.2f} shots to win')
+    print(f'{args.strategy2}: {stats["winRate2"]:.1%} wins, '
+          f'{stats["shotsToWin2"]:.2f} shots to win')
+    print(f'Average shots to win: {stats["shotsToWin"]:.2f}')
+
+    return 0
+
+
+if __name__ == '__main__':
+    main()
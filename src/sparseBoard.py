@@ -0,0 +1,389 @@
+'''
+File: sparseBoard.py
+Auth: Blake Wingard - bats23456789@gmail.com
+Date: 10/18/2026
+Desc: A sparse board engine for very large battleship boards.
+'''
+from battleship import Board, Ship
+from battleship import OutOfBoundsException, OverlapException
+from zobrist import cellKeys, shipKey
+
+# Boards with more rows and cols than this are created as SparseBoards
+SPARSE_SIZE = 64
+
+
+class SparseBoard(Board):
+    '''
+    A class to represent a Battleship Board that only stores what is on it.
+
+    Occupied and shot cells are kept in a dict and a set, so memory grows
+    with the number of ships and shots instead of the area of the board.
+    The public API matches Board, except there is no grid.
+
+    Attributes
+    ----------
+    size: int
+        The number of rows and cols on the board
+
+    ships: list[Ship]
+        Stores the ships on the board
+
+    shipIndex: dict[tuple[int, int], Ship]
+        The ship covering each occupied cell
+
+    shots: set[tuple[int, int]]
+        Every cell that has been shot
+
+    fleetHealth: int
+        The number of unhit cells left on all ships
+
+    recorder: BoardRecorder | None
+        Told about every change to the board, see gameLog
+
+    hash: int
+        The Zobrist hash of the shots, hits and sunk ships, see zobrist
+
+    history: list[tuple[tuple[int, int], str]]
+        Every shot that changed the board and its result, oldest first,
+        except those at ships removed since
+    '''
+
+    def __init__(self, size: int = 10):
+        '''
+        Constructs all the necesarry attributes for the SparseBoard object
+
+        Parameters
+        ----------
+        size: int
+            The number of rows and cols on the board
+        '''
+        self.size = size
+        self.ships = []
+        self.shipIndex = {}
+        self.shots = set()
+        self.fleetHealth = 0
+        self.recorder = None
+        self.hash = 0
+        self.missKeys, self.hitKeys = cellKeys()
+        self.history = []
+
+    def __repr__(self) -> str:
+        '''
+        Displays a string representation of the SparseBoard Object
+        '''
+        return f'{self.size}x{self.size} board, {len(self.shots)} shots\n'\
+            + '\n'.join(str(ship) for ship in self.ships)
+
+    def shipOverlap(self, ship: Ship) -> bool:
+        '''
+        Checks if the ship will overlap any ships or shots on the board
+
+        A shot cell is taken, as in Board, since a ship under it could
+        never be sunk.
+
+        Parameters
+        ----------
+        ship: Ship
+            The ship to check
+
+        Returns
+        -------
+        bool: True if the ship overlaps
+        '''
+        return any(pos in self.shipIndex or pos in self.shots for pos in ship.positions())
+
+    def addShip(self, ship: Ship):
+        '''
+        Attempts to add a ship to the board
+
+        Parameters
+        ----------
+        ship: Ship
+            The ship to add
+
+        Raises
+        ------
+        OutOfBoundsException: The ship is out of bounds of the board
+        OverlapException: The ship overlaps another ship or a shot
+        '''
+        if self.isOutOfBounds(ship.start) or self.isOutOfBounds(ship.stop):
+            raise OutOfBoundsException
+
+        if self.shipOverlap(ship):
+            raise OverlapException
+
+        self.ships.append(ship)
+        self.fleetHealth += ship.remaining
+
+        for pos in ship.positions():
+            self.shipIndex[pos] = ship
+
+        if self.recorder is not None:
+            self.recorder.place(self, ship)
+
+    def removeShip(self, name: str) -> bool:
+        '''
+        Attempts to remove ship from the board
+
+        If a duplicate exists, the first occurance will be removed
+
+        Parameters
+        ----------
+        name: str
+            The name of the ship to remove
+
+        Returns
+        -------
+        bool: True if the ship was removed
+        '''
+        for i, ship in enumerate(self.ships):
+            if name == ship.name:
+                # Board forgets the shots at a removed ship
+                for pos in ship.positions():
+                    del self.shipIndex[pos]
+                    self.shots.discard(pos)
+                self.fleetHealth -= ship.remaining
+                self.hash ^= self.shipHash(ship)
+                del self.ships[i]
+                # Shots at the ship cannot be undone once it is gone
+                self.history = [entry for entry in self.history if not ship.posOnShip(entry[0])]
+                if self.recorder is not None:
+                    self.recorder.remove(self, i)
+                return True
+
+        return False
+
+    def shoot(self, shot: tuple[int, int] | str) -> str:
+        '''
+        Shoots the specified location and reports miss, same, hit, or sunk
+
+        Parameters
+        ----------
+        shot: tuple[int, int]
+            The position of the shot in (x, y)
+        shot: str
+            The position of the shot as a string (e.g. B4)
+
+        Returns
+        -------
+        str: "MISS" if the shot did not hit a ship
+             "SAME" if the shot hit a previously shot position
+             "HIT" if the shot hit a ship
+             "SUNK" if the shot sank the ship
+
+        Raises
+        ------
+        OutOfBoundsException: The shot is out of bounds of the board
+        '''
+        if isinstance(shot, str):
+            shot = self.strToPoint(shot)
+
+        if self.isOutOfBounds(shot):
+            raise OutOfBoundsException
+
+        shot = tuple(shot)
+
+        ship = self.shipIndex.get(shot)
+
+        if shot in self.shots:
+            result = 'SAME'
+        elif ship is None:
+            self.shots.add(shot)
+            self.hash ^= self.missKeys[shot[1] * self.size + shot[0]]
+            result = 'MISS'
+            self.history.append((shot, result))
+        else:
+            self.shots.add(shot)
+            ship.shoot(shot)
+            self.fleetHealth -= 1
+            self.hash ^= self.hitKeys[shot[1] * self.size + shot[0]]
+            if ship.remaining == 0:
+                result = 'SUNK'
+                self.hash ^= shipKey(ship.name)
+            else:
+                result = 'HIT'
+            self.history.append((shot, result))
+
+        if self.recorder is not None:
+            self.recorder.shot(self, shot, result)
+
+        return result
+
+    def shootMany(self, shots: list[tuple[int, int] | str]) -> tuple[list[str], list[Ship]]:
+        '''
+        Shoots a salvo of locations at once
+
+        Every shot is checked before any is fired, so a salvo with a shot
+        out of bounds changes nothing. A location repeated in the salvo is
+        SAME after its first shot.
+
+        Parameters
+        ----------
+        shots: list[tuple[int, int] | str]
+            The positions of the shots in (x, y) or as strings (e.g. B4)
+
+        Returns
+        -------
+        list[str]: The result of each shot, as returned by shoot
+        list[Ship]: The ships sunk by the salvo
+
+        Raises
+        ------
+        OutOfBoundsException: A shot is out of bounds of the board
+        '''
+        points = [self.strToPoint(shot) if isinstance(shot, str) else shot for shot in shots]
+
+        if any(self.isOutOfBounds(point) for point in points):
+            raise OutOfBoundsException
+
+        size = self.size
+        results = []
+        sunk = []
+
+        for point in map(tuple, points):
+            if point in self.shots:
+                results.append('SAME')
+                continue
+
+            self.shots.add(point)
+            ship = self.shipIndex.get(point)
+            cell = point[1] * size + point[0]
+
+            if ship is None:
+                results.append('MISS')
+                self.hash ^= self.missKeys[cell]
+                continue
+
+            ship.shoot(point)
+            self.fleetHealth -= 1
+            self.hash ^= self.hitKeys[cell]
+            if ship.remaining == 0:
+                results.append('SUNK')
+                sunk.append(ship)
+                self.hash ^= shipKey(ship.name)
+            else:
+                results.append('HIT')
+
+        self.history.extend((point, result) for point, result in zip(map(tuple, points), results)
+                            if result != 'SAME')
+
+        if self.recorder is not None:
+            for point, result in zip(points, results):
+                self.recorder.shot(self, point, result)
+
+        return results, sunk
+
+    def undo(self) -> tuple[tuple[int, int], str] | None:
+        '''
+        Takes back the last shot that changed the board
+
+        SAME shots change nothing, so they are not taken back. Shots that
+        were recorded cannot be undone, nor can hits on a ship that was
+        removed since, which removeShip drops from the history.
+
+        Returns
+        -------
+        tuple[tuple[int, int], str] | None: The position and result of the
+        shot taken back, None if no shot is left
+
+        Raises
+        ------
+        RuntimeError: The board has a recorder
+        '''
+        if self.recorder is not None:
+            raise RuntimeError('shots told to a recorder cannot be undone')
+
+        if not self.history:
+            return None
+
+        shot, result = self.history.pop()
+        cell = shot[1] * self.size + shot[0]
+        self.shots.discard(shot)
+
+        if result == 'MISS':
+            self.hash ^= self.missKeys[cell]
+        else:
+            ship = self.shipIndex[shot]
+            ship.repair(shot)
+            self.fleetHealth += 1
+            self.hash ^= self.hitKeys[cell]
+            if result == 'SUNK':
+                self.hash ^= shipKey(ship.name)
+
+        return shot, result
+
+    def getShipAtPos(self, pos: tuple[int, int] | str) -> Ship | None:
+        '''
+        Gets a ship at position (pos) if it exists
+
+        Parameters
+        ----------
+        pos: tuple[int, int]
+            The position of the ship to find in (x, y)
+
+        pos: str
+            The position of the ship to find as a string (e.g. B4)
+
+        Returns
+        -------
+        Ship: The ship found
+
+        None: The ship was not found
+
+        Exception
+        ----------
+        OutOfBoundsException: The shot is out of bounds of the board
+        '''
+        if isinstance(pos, str):
+            pos = self.strToPoint(pos)
+
+        if self.isOutOfBounds(pos):
+            raise OutOfBoundsException
+
+        return self.shipIndex.get(tuple(pos))
+
+    def isShot(self, pos: tuple[int, int] | str) -> bool:
+        '''
+        Checks if cell has been shot
+
+        Parameters
+        ----------
+        pos: tuple[int, int]
+            The position of the cell to check in (x, y)
+
+        pos: str
+            The position of the cell to check as a string (e.g. B4)
+
+        Returns
+        -------
+        bool: True if the cell was shot
+
+        Exception
+        ----------
+        OutOfBoundsException: The shot is out of bounds of the board
+        '''
+        if isinstance(pos, str):
+            pos = self.strToPoint(pos)
+
+        if self.isOutOfBounds(pos):
+            raise OutOfBoundsException
+
+        return tuple(pos) in self.shots
+
+
+def makeBoard(size: int = 10) -> Board:
+    '''
+    Creates a board of any size, using a SparseBoard for large sizes
+
+    Parameters
+    ----------
+    size: int
+        The number of rows and cols on the board
+
+    Returns
+    -------
+    Board: A Board up to SPARSE_SIZE, otherwise a SparseBoard
+    '''
+    if size > SPARSE_SIZE:
+        return SparseBoard(size)
+    return Board(size)
@@ -0,0 +1,294 @@
+'''
+File: spectator.py
+Auth: Blake Wingard - bats23456789@gmail.com
+Date: 10/18/2026
+Desc: Broadcasting a live match to spectators.
+
+A spectator first gets a snapshot of both boards, then a delta for every
+event. Boards are numbered by the player that owns them (1 or 2), and
+masks use bit y * size + x, as in BitBoard.
+
+    SNAPSHOT <size> <turn> <state>   state is WAITING, PLAYING or OVER
+    BOARD <board> <shots> <hits>     The shot and hit cells as hex masks
+    SUNK <board> <name>              A ship sunk on the board
+    END                              The end of the snapshot
+
+    SHOT <board> <pos> <result>      A shot at the board (MISS, HIT or SUNK)
+    SUNK <board> <name>              The shot sank the named ship
+    TURN <player>                    The player to shoot next
+    OVER <winner>                    The match is over, 0 if a player left
+
+Every event is encoded once and the same bytes are written to every
+spectator. A spectator whose connection has more than the limit waiting
+to be sent is skipped instead of buffered. Once it has caught up it is
+sent a new snapshot, which covers everything it missed, followed by the
+event. Applying an event already in the snapshot changes nothing.
+'''
+import asyncio
+from battleship import Board, pointToStr
+
+WAITING = 'WAITING'
+PLAYING = 'PLAYING'
+OVER = 'OVER'
+
+
+class Broadcast:
+    '''
+    A class to represent the spectators of a single match.
+
+    Attributes
+    ----------
+    boards: list[Board]
+        The boards of the match
+
+    writers: list[asyncio.StreamWriter]
+        The connection of every spectator
+
+    stale: set[asyncio.StreamWriter]
+        The spectators that missed an event and need a new snapshot
+
+    limit: int
+        The most bytes waiting to be sent to a spectator before events
+        are skipped for it
+
+    turn: int
+        The player to shoot next
+
+    state: str
+        WAITING, PLAYING or OVER
+
+    cache: bytes | None
+        The snapshot, until the next event
+
+    Methods
+    -------
+    subscribe(writer)
+        Adds a spectator and sends it a snapshot
+
+    unsubscribe(writer)
+        Removes a spectator
+
+    snapshot(): bytes
+        Encodes the current state of the match
+
+    publish(data)
+        Sends an encoded event to every spectator
+
+    start(turn)
+        Broadcasts the start of the match
+
+    shot(board, pos, result)
+        Broadcasts a shot at a board
+
+    nextTurn(turn)
+        Broadcasts the player to shoot next
+
+    over(winner)
+        Broadcasts the end of the match
+
+    close()
+        Disconnects every spectator
+    '''
+
+    def __init__(self, boards: list[Board], limit: int = 65536):
+        '''
+        Constructs all the necesarry attributes for the Broadcast object
+
+        Parameters
+        ----------
+        boards: list[Board]
+            The boards of the match
+
+        limit: int
+            The most bytes waiting to be sent to a spectator before events
+            are skipped for it
+        '''
+        self.boards = boards
+        self.writers = []
+        self.stale = set()
+        self.limit = limit
+        self.turn = 0
+        self.state = WAITING
+        self.cache = None
+
+    def __getstate__(self):
+        # Spectators are connections, which cannot be pickled
+        state = self.__dict__.copy()
+        state['writers'] = []
+        state['stale'] = set()
+        state['cache'] = None
+        return state
+
+    def __len__(self):
+        return len(self.writers)
+
+    def subscribe(self, writer: asyncio.StreamWriter):
+        '''
+        Adds a spectator and sends it a snapshot
+
+        Parameters
+        ----------
+        writer: asyncio.StreamWriter
+            The connection of the spectator
+        '''
+        self.writers.append(writer)
+        writer.write(self.snapshot())
+
+    def unsubscribe(self, writer: asyncio.StreamWriter):
+        '''
+        Removes a spectator
+
+        Parameters
+        ----------
+        writer: asyncio.StreamWriter
+            The connection of the spectator
+        '''
+        if writer in self.writers:
+            self.writers.remove(writer)
+        self.stale.discard(writer)
+
+    def snapshot(self) -> bytes:
+        '''
+        Encodes the current state of the match
+
+        The snapshot is kept until the next event, so spectators joining
+        or catching up together share it.
+
+        Returns
+        -------
+        bytes: The snapshot lines
+        '''
+        if self.cache is not None:
+            return self.cache
+
+        size = self.boards[0].size
+        lines = [f'SNAPSHOT {size} {self.turn + 1} {self.state}']
+        sunk = []
+
+        for number, board in enumerate(self.boards, 1):
+            shots = hits = 0
+            for y in range(size):
+                for x in range(size):
+                    if board.isShot((x, y)):
+                        bit = 1 << (y * size + x)
+                        shots |= bit
+                        if board.getShipAtPos((x, y)) is not None:
+                            hits |= bit
+
+            lines.append(f'BOARD {number} {shots:x} {hits:x}')
+            sunk += [f'SUNK {number} {ship.name}' for ship in board.ships if ship.isSunk()]
+
+        lines += sunk
+        lines.append('END')
+
+        self.cache = ('\n'.join(lines) + '\n').encode()
+        return self.cache
+
+    def publish(self, data: bytes, force: bool = False):
+        '''
+        Sends an encoded event to every spectator
+
+        Spectators that are behind by more than the limit skip the event.
+        Spectators that skipped an event are sent a snapshot before the
+        event, once they have caught up.
+
+        Parameters
+        ----------
+        data: bytes
+            The encoded event
+
+        force: bool
+            True to send the event to spectators that are behind as well
+        '''
+        self.cache = None
+        limit = self.limit
+        closed = []
+
+        for writer in self.writers:
+            transport = writer.transport
+            if transport.is_closing():
+                closed.append(writer)
+            elif transport.get_write_buffer_size() > limit and not force:
+                self.stale.add(writer)
+            elif writer in self.stale:
+                self.stale.discard(writer)
+                writer.write(self.snapshot() + data)
+            else:
+                writer.write(data)
+
+        for writer in closed:
+            self.unsubscribe(writer)
+
+    def start(self, turn: int):
+        '''
+        Broadcasts the start of the match
+
+        Parameters
+        ----------
+        turn: int
+            The player to shoot first
+        '''
+        self.state = PLAYING
+        self.nextTurn(turn)
+
+    def shot(self, board: int, pos: tuple[int, int], result: str):
+        '''
+        Broadcasts a shot at a board
+
+        Parameters
+        ----------
+        board: int
+            The player owning the board shot
+
+        pos: tuple[int, int]
+            The position of the shot in (x, y)
+
+        result: str
+            The result of the shot, SAME is not broadcast
+        '''
+        if result == 'SAME':
+            return
+
+        line = f'SHOT {board + 1} {pointToStr(pos)} {result}\n'
+
+        if result == 'SUNK':
+            ship = self.boards[board].getShipAtPos(pos)
+            line += f'SUNK {board + 1} {ship.name}\n'
+
+        self.publish(line.encode())
+
+    def nextTurn(self, turn: int):
+        '''
+        Broadcasts the player to shoot next
+
+        Parameters
+        ----------
+        turn: int
+            The player to shoot next
+        '''
+        self.turn = turn
+        self.publish(f'TURN {turn + 1}\n'.encode())
+
+    def over(self, winner: int | None):
+        '''
+        Broadcasts the end of the match
+
+        Every spectator is sent the end, even ones that are behind.
+
+        Parameters
+        ----------
+        winner: int | None
+            The player that won, None if a player left
+        '''
+        self.state = OVER
+        self.publish(f'OVER {0 if winner is None else winner + 1}\n'.encode(), force=True)
+
+    def close(self):
+        '''
+        Disconnects every spectator
+        '''
+        for writer in self.writers:
+            writer.close()
+
+        self.writers.clear()
+        self.stale.clear()
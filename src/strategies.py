@@ -0,0 +1,90 @@
+'''
+File: strategies.py
+Auth: Blake Wingard - bats23456789@gmail.com
+Date: 10/18/2026
+Desc: Simple automated shooting strategies.
+
+A strategy is a generator function taking a random.Random. Each value it
+yields is the next shot in (x, y), and the result of that shot (as
+returned by Board.shoot) is sent back in:
+
+    def strategy(rng):
+        result = yield (0, 0)
+        ...
+
+Strategies must be defined at module level so they can be sent to the
+worker processes of the simulator.
+'''
+import random
+from collections.abc import Generator
+from densityAI import densityStrategy
+from monteCarloAI import monteCarloStrategy
+
+Strategy = Generator[tuple[int, int], str, None]
+
+
+def randomStrategy(rng: random.Random) -> Strategy:
+    '''
+    Shoots every cell once in a random order
+
+    Parameters
+    ----------
+    rng: random.Random
+        The source of randomness
+
+    Yields
+    ------
+    tuple[int, int]: The next shot in (x, y)
+    '''
+    cells = [(x, y) for y in range(10) for x in range(10)]
+    rng.shuffle(cells)
+
+    for cell in cells:
+        yield cell
+
+
+def huntStrategy(rng: random.Random) -> Strategy:
+    '''
+    Hunts on a checkerboard and targets the neighbours of every hit
+
+    Parameters
+    ----------
+    rng: random.Random
+        The source of randomness
+
+    Yields
+    ------
+    tuple[int, int]: The next shot in (x, y)
+    '''
+    parity = rng.randrange(2)
+    hunt = [(x, y) for y in range(10) for x in range(10) if (x + y) % 2 == parity]
+    rng.shuffle(hunt)
+    rest = [(x, y) for y in range(10) for x in range(10) if (x + y) % 2 != parity]
+    rng.shuffle(rest)
+    hunt = rest + hunt
+
+    shot = set()
+    targets = []
+
+    while hunt or targets:
+        cell = targets.pop() if targets else hunt.pop()
+        if cell in shot:
+            continue
+
+        shot.add(cell)
+        result = yield cell
+
+        if result in ('HIT', 'SUNK'):
+            x, y = cell
+            for neighbour in ((x - 1, y), (x + 1, y), (x, y - 1), (x, y + 1)):
+                if 0 <= neighbour[0] < 10 and 0 <= neighbour[1] < 10 \
+                        and neighbour not in shot:
+                    targets.append(neighbour)
+
+
+STRATEGIES = {
+    'random': randomStrategy,
+    'hunt': huntStrategy,
+    'density': densityStrategy,
+    'montecarlo': monteCarloStrategy,
+}
@@ -1,13 +1,27 @@
-from PyQt6.QtGui import QColor
-
-
 def linearInterpolate(val1, val2, t):
     return val1 * (1.0 - t) + val2 * t
 
 
-def linearInterpolateColor(color1: QColor, color2: QColor, t: float):
-    red = linearInterpolate(color1.red(), color2.red(), t)
-    green = linearInterpolate(color1.green(), color2.green(), t)
-    blue = linearInterpolate(color1.blue(), color2.blue(), t)
+def colorToTuple(color) -> tuple[int, int, int]:
+    if isinstance(color, tuple):
+        return color
+
+    return (color.red(), color.green(), color.blue())
+
+
+def linearInterpolateColor(color1, color2, t: float):
+    '''
+    Interpolates two colors given as (red, green, blue) tuples or QColors
+
+    Tuples give a tuple, so this works without Qt. QColor is only imported
+    when a QColor is given.
+    '''
+    red, green, blue = (int(linearInterpolate(val1, val2, t))
+                        for val1, val2 in zip(colorToTuple(color1), colorToTuple(color2)))
+
+    if isinstance(color1, tuple) and isinstance(color2, tuple):
+        return (red, green, blue)
+
+    from PyQt6.QtGui import QColor
 
-    return QColor(int(red), int(green), int(blue))
+    return QColor(red, green, blue)
@@ -0,0 +1,299 @@
+'''
+File: zobrist.py
+Auth: Blake Wingard - bats23456789@gmail.com
+Date: 10/18/2026
+Desc: Zobrist hashing of what has been seen of a board.
+
+An observation state is the cells that were shot, which of them were
+hits, and which ships were sunk. Every cell has one random 64 bit key for
+a miss and one for a hit, and every ship name has its own key. The hash
+of a state is the XOR of the keys of everything in it, so a shot updates
+it with a single XOR and the order of the shots does not matter.
+
+Keys come from a SplitMix64 sequence with a fixed seed, so hashes are the
+same in every process and can be saved. TranspositionCache stores anything
+computed for a state, keyed by its hash.
+'''
+from collections import OrderedDict
+from functools import lru_cache
+
+ZOBRIST_SEED = 0x5EED
+MASK = (1 << 64) - 1
+GOLDEN = 0x9E3779B97F4A7C15
+
+
+def splitMix(value: int) -> int:
+    '''
+    Scrambles a 64 bit value, the output step of SplitMix64
+
+    Parameters
+    ----------
+    value: int
+        The value to scramble
+
+    Returns
+    -------
+    int: The scrambled 64 bit value
+    '''
+    value = (value ^ (value >> 30)) * 0xBF58476D1CE4E5B9 & MASK
+    value = (value ^ (value >> 27)) * 0x94D049BB133111EB & MASK
+    return value ^ (value >> 31)
+
+
+class CellKeys(dict):
+    '''
+    A class to represent the keys of every cell for one kind of shot.
+
+    Keys are worked out the first time a cell is looked up and kept, so
+    only the cells ever shot are stored, whatever the size of the board.
+
+    Attributes
+    ----------
+    step: int
+        Cell i takes step 2i + step of the sequence, 1 for misses and 2
+        for hits
+    '''
+
+    def __init__(self, step: int):
+        '''
+        Constructs all the necesarry attributes for the CellKeys object
+
+        Parameters
+        ----------
+        step: int
+            1 for the miss keys, 2 for the hit keys
+        '''
+        super().__init__()
+        self.step = step
+
+    def __missing__(self, cell: int) -> int:
+        # Cells may be numpy integers, which would overflow
+        key = splitMix(ZOBRIST_SEED + (2 * int(cell) + self.step) * GOLDEN & MASK)
+        self[cell] = key
+        return key
+
+
+# Shared by every board, the keys of cell y * size + x are the same for any size
+MISS_KEYS = CellKeys(1)
+HIT_KEYS = CellKeys(2)
+
+
+def cellKeys() -> tuple[CellKeys, CellKeys]:
+    '''
+    Gets the miss and hit keys of the cells
+
+    The keys are shared, so they must not be changed.
+
+    Returns
+    -------
+    CellKeys: The miss key of each cell, by index
+    CellKeys: The hit key of each cell, by index
+    '''
+    return MISS_KEYS, HIT_KEYS
+
+
+@lru_cache
+def shipKey(name: str) -> int:
+    '''
+    Gets the key of a sunk ship
+
+    Parameters
+    ----------
+    name: str
+        The name of the ship
+
+    Returns
+    -------
+    int: The 64 bit key
+    '''
+    # FNV-1a folds the name into a seed for its own SplitMix64 step
+    value = 0xCBF29CE484222325
+    for byte in name.encode():
+        value = (value ^ byte) * 0x100000001B3 & MASK
+
+    return splitMix(value ^ ZOBRIST_SEED)
+
+
+def hashObservations(misses, hits, sunk=(), size: int = 10) -> int:
+    '''
+    Hashes an observation state from scratch
+
+    Parameters
+    ----------
+    misses: Iterable[tuple[int, int]]
+        The cells shot that were misses in (x, y)
+
+    hits: Iterable[tuple[int, int]]
+        The cells shot that were hits in (x, y), sunk ships included
+
+    sunk: Iterable[str]
+        The names of the sunk ships
+
+    size: int
+        The number of rows and cols on the board
+
+    Returns
+    -------
+    int: The hash, as kept in Board.hash
+    '''
+    missKeys, hitKeys = cellKeys()
+    value = 0
+
+    for x, y in misses:
+        value ^= missKeys[y * size + x]
+
+    for x, y in hits:
+        value ^= hitKeys[y * size + x]
+
+    for name in sunk:
+        value ^= shipKey(name)
+
+    return value
+
+
+class TranspositionCache:
+    '''
+    A class to represent a bounded cache of values computed for a state.
+
+    When full, the least recently used entry is evicted.
+
+    Attributes
+    ----------
+    capacity: int
+        The most entries kept
+
+    entries: OrderedDict[int, Any]
+        The cached values by hash, least recently used first
+
+    hits: int
+        The number of lookups that found a value
+
+    misses: int
+        The number of lookups that found nothing
+
+    evictions: int
+        The number of entries evicted to make room
+
+    Methods
+    -------
+    get(key, default): Any
+        Looks up the value of a state
+
+    put(key, value)
+        Stores the value of a state
+
+    clear()
+        Removes every entry and resets the statistics
+
+    hitRate(): float
+        Gets the fraction of lookups that found a value
+
+    stats(): dict[str, int | float]
+        Gets every statistic of the cache
+    '''
+
+    def __init__(self, capacity: int = 4096):
+        '''
+        Constructs all the necesarry attributes for the TranspositionCache object
+
+        Parameters
+        ----------
+        capacity: int
+            The most entries kept
+        '''
+        if capacity < 1:
+            raise ValueError('capacity must be at least 1')
+
+        self.capacity = capacity
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, key: int):
+        return key in self.entries
+
+    def get(self, key: int, default=None):
+        '''
+        Looks up the value of a state
+
+        Parameters
+        ----------
+        key: int
+            The hash of the state
+
+        default: Any
+            Returned when the state is not cached
+
+        Returns
+        -------
+        Any: The cached value, or default
+        '''
+        entries = self.entries
+
+        if key in entries:
+            entries.move_to_end(key)
+            self.hits += 1
+            return entries[key]
+
+        self.misses += 1
+        return default
+
+    def put(self, key: int, value):
+        '''
+        Stores the value of a state
+
+        Parameters
+        ----------
+        key: int
+            The hash of the state
+
+        value: Any
+            The value to store
+        '''
+        entries = self.entries
+        entries[key] = value
+        entries.move_to_end(key)
+
+        if len(entries) > self.capacity:
+            entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        '''
+        Removes every entry and resets the statistics
+        '''
+        self.entries.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    def hitRate(self) -> float:
+        '''
+        Gets the fraction of lookups that found a value
+
+        Returns
+        -------
+        float: The hit rate, 0 before any lookup
+        '''
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self) -> dict[str, int | float]:
+        '''
+        Gets every statistic of the cache
+
+        Returns
+        -------
+        dict[str, int | float]: The size, capacity, hits, misses,
+        evictions and hit rate
+        '''
+        return {
+            'size': len(self.entries),
+            'capacity': self.capacity,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hitRate': self.hitRate(),
+        }